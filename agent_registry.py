@@ -1,10 +1,20 @@
 import importlib
 import json
-from typing import List
+import os
+import threading
+import time
+from typing import TYPE_CHECKING, Dict, Iterable, List, NamedTuple
 
-from protocol.base_agent import BaseAgent
+from agents.balancer import POWER_OF_TWO, Replica, ReplicaSet
+from agents.query_parser import QueryParser
+from agents.skill_index import SkillIndex, SkillMatch
+from card_index import DEFAULT_INDEX_NAME, CardIndex
+from protocol.transport import RemoteAgent, is_remote_url
 
-# Map agent identifiers to fully qualified class paths
+if TYPE_CHECKING:
+    from protocol.base_agent import BaseAgent
+
+# Class paths of agents whose cards do not declare an `agentClass`, by agent identifier
 AGENT_CLASS_REGISTRY = {
     "web-research-agent": "agents.web_research_agent.agent.WebResearchAgent",
     "crm-research-agent": "agents.crm_research_agent.agent.CRMResearchAgent",
@@ -20,46 +30,439 @@ def load_class_from_path(dotted_path: str):
     return getattr(module, class_name)
 
 
+def agent_class_path(card: dict) -> str | None:
+    """
+    Returns the dotted class path of a local agent: the card's `agentClass`, or the
+    AGENT_CLASS_REGISTRY entry for its name.
+    """
+    return card.get("agentClass") or AGENT_CLASS_REGISTRY.get(_agent_name(card))
+
+
+class _Snapshot:
+    """
+    One consistent generation of the registry's lookup tables. Reloads build a new
+    snapshot and swap it in with a single assignment; agents created lazily are added
+    to the snapshot that was current when they were looked up.
+    """
+
+    __slots__ = (
+        "skill_map",
+        "card_map",
+        "route_map",
+        "instances",
+        "query_parser",
+        "skill_index",
+        "generation",
+    )
+
+    def __init__(
+        self, card_map, route_map, instances, query_parser, skill_index, generation
+    ):
+        # method_name → agent_instance, or a ReplicaSet when several instances serve
+        # the skill; filled as skills are first looked up.
+        self.skill_map = {}
+        self.card_map = card_map  # method_name → AgentCard dict (last card loaded)
+        self.route_map = route_map  # method_name → every AgentCard serving it
+        self.instances = instances  # id(card) → (card, [agent_instance per replica])
+        self.query_parser = query_parser
+        self.skill_index = skill_index
+        self.generation = generation
+
+    def serves(self, card: dict) -> bool:
+        return any(
+            c is card
+            for skill in card.get("skills", [])
+            for c in self.route_map.get(skill["id"], ())
+        )
+
+
+class RetiredAgent(NamedTuple):
+    name: str
+    version: str | None  # `version` of the card the agent was created from
+    agent: object
+    retired_at: float
+
+
 class AgentRegistry:
     """
     Loads agent cards and maps skill IDs to agent instances, simulating agent discovery as described in the A2A (Agent-to-Agent) specification.
     For local development, this enables deterministic resolution of agent skills without requiring distributed infrastructure.
+
+    Cards with a `local://` URL are instantiated in-process, from the class named by the
+    card's `agentClass` (or registered in AGENT_CLASS_REGISTRY). Cards with an `http://` or `unix://` URL are
+    reached through a RemoteAgent over pooled keep-alive connections.
+
+    Loading only builds the skill → card index. Agent classes are imported and
+    instantiated on the first `find_agent_for_method` for one of their skills, or up
+    front with `prewarm`. Loading also builds a SkillIndex, so `find_skills` can look
+    skills up by tag, input/output mode and keyword.
+
+    `reload` rebuilds the tables from a new set of cards and swaps them in atomically,
+    keeping the instances of agents whose cards did not change. Instances of changed or
+    removed cards are retired with their card `version` and shut down by `drain` once
+    in-flight calls have had time to finish.
+
+    A skill is replicated when several cards declare it or a card sets `replicas`.
+    `find_agent_for_method` then returns the replica chosen by the card's
+    `loadBalancing` strategy (`power-of-two` or `least-outstanding`) from live
+    in-flight counts and latency EWMAs.
+
+    With a `result_store` (see protocol/result_store.py), the result caches of local
+    agents write behind to it, so a restarted process serves cached results from disk.
     """
 
-    def __init__(self):
-        self.skill_map = {}  # method_name → agent_instance
+    def __init__(self, result_store=None):
+        self.result_store = result_store  # shared by the result caches of all agents
+        self._snapshot = _Snapshot({}, {}, {}, None, SkillIndex(), 0)
+        self._lock = threading.Lock()  # serializes swaps with lazy agent creation
+        self._reload_lock = threading.Lock()  # one load or reload at a time
+        self._replicas: Dict[int, Replica] = {}  # id(agent) → its load-tracking Replica
+        self.retired: List[RetiredAgent] = []
+
+    @property
+    def skill_map(self) -> dict:
+        return self._snapshot.skill_map
+
+    @property
+    def card_map(self) -> dict:
+        return self._snapshot.card_map
+
+    @property
+    def query_parser(self) -> QueryParser | None:
+        return self._snapshot.query_parser
+
+    @property
+    def skill_index(self) -> SkillIndex:
+        return self._snapshot.skill_index
+
+    @property
+    def generation(self) -> int:
+        """
+        Incremented by every load or reload, so callers can drop derived state.
+        """
+        return self._snapshot.generation
 
     @classmethod
-    def from_card_paths(cls, paths: List[str]) -> "AgentRegistry":
-        registry = cls()
-        registry.skill_map = {}
-        registry.load_agents(paths)
+    def from_card_paths(
+        cls,
+        paths: List[str],
+        prewarm: bool = False,
+        index_path: str | None = None,
+        result_store=None,
+    ) -> "AgentRegistry":
+        registry = cls(result_store)
+        registry.load_agents(paths, index_path=index_path)
+        if prewarm:
+            registry.prewarm()
         return registry
 
-    def load_agents(self, paths: list[str]):
+    @classmethod
+    def from_card_dir(
+        cls,
+        directory: str,
+        prewarm: bool = False,
+        index_path: str | None = None,
+        result_store=None,
+    ) -> "AgentRegistry":
+        """
+        Loads every `*.json` AgentCard in `directory`, keeping a parsed-card index in
+        `directory` (or at `index_path`) so unchanged cards are not re-parsed next time.
+        """
+        index_path = index_path or os.path.join(directory, DEFAULT_INDEX_NAME)
+        return cls.from_card_paths(
+            card_paths(directory),
+            prewarm=prewarm,
+            index_path=index_path,
+            result_store=result_store,
+        )
+
+    def load_agents(self, paths: list[str], index_path: str | None = None):
+        """
+        Loads AgentCards and indexes their skill IDs. Agents are created lazily.
+
+        With `index_path`, cards are read through a CardIndex stored at that path.
+        """
+        self._swap(_read_cards(paths, index_path), replace_all=False)
+
+    def reload(self, paths: List[str], index_path: str | None = None) -> Dict:
         """
-        Loads AgentCards and binds skill IDs to in-memory agent instances.
+        Replaces the loaded cards with the cards at `paths` and swaps the new lookup
+        tables in atomically.
+
+        Returns the agent names that were added, updated and removed. Agents whose card
+        is unchanged keep their instance (and warm caches); the others are retired.
         """
-        for path in paths:
-            with open(path, "r") as f:
-                card = json.load(f)
+        return self._swap(_read_cards(paths, index_path), replace_all=True)
+
+    def _swap(self, cards: List[dict], replace_all: bool) -> Dict:
+        # Lookups wait on `_lock` only while the new snapshot is put in place, not while
+        # its query parser and skill index are built.
+        with self._reload_lock:
+            old = self._snapshot
+            old_cards = {}  # agent name → card, in load order
+            for method_cards in old.route_map.values():
+                for card in method_cards:
+                    old_cards[_agent_name(card)] = card
+
+            loaded = {} if replace_all else dict(old_cards)
+            report: Dict[str, List[str]] = {"added": [], "updated": [], "removed": []}
+            for card in cards:
+                agent_name = _agent_name(card)
+                if not _is_remote(card) and agent_class_path(card) is None:
+                    print(f"No class registered for agent: {agent_name}")
+                    continue
+                previous = old_cards.get(agent_name)
+                if previous is None:
+                    report["added"].append(card.get("name", agent_name))
+                elif previous == card:
+                    card = previous
+                else:
+                    report["updated"].append(card.get("name", agent_name))
+                loaded.pop(agent_name, None)
+                loaded[agent_name] = card
+
+            card_map: Dict[str, dict] = {}
+            route_map: Dict[str, List[dict]] = {}
+            for card in loaded.values():
+                for skill in card.get("skills", []):
+                    card_map[skill["id"]] = card
+                    route_map.setdefault(skill["id"], []).append(card)
+
+            report["removed"] = [
+                card.get("name", name)
+                for name, card in old_cards.items()
+                if name not in loaded
+            ]
+            query_parser = _compile_query_parser(card_map)
+            skill_index = SkillIndex(loaded.values())
+            live = {id(card) for card in loaded.values()}
 
-            agent_name = card.get("name", "").lower().replace(" ", "-")
+            with self._lock:
+                # Agents may have been created lazily while the tables were built.
+                instances = {}
+                now = time.monotonic()
+                for card_id, (card, agents) in old.instances.items():
+                    if card_id in live:
+                        instances[card_id] = (card, agents)
+                    else:
+                        self._retire(card, agents, now)
 
-            class_path = AGENT_CLASS_REGISTRY.get(agent_name)
-            if not class_path:
-                print(f"No class registered for agent: {agent_name}")
-                continue
+                self._snapshot = _Snapshot(
+                    card_map,
+                    route_map,
+                    instances,
+                    query_parser,
+                    skill_index,
+                    old.generation + 1,
+                )
+        return report
 
-            AgentClass = load_class_from_path(class_path)
-            agent_instance = AgentClass()
+    def _retire(self, card: dict, agents: List, retired_at: float) -> None:
+        for agent in agents:
+            self._replicas.pop(id(agent), None)
+            self.retired.append(
+                RetiredAgent(card.get("name"), card.get("version"), agent, retired_at)
+            )
 
-            for skill in card.get("skills", []):
-                skill_id = skill["id"]
-                self.skill_map[skill_id] = agent_instance
+    def drain(self, grace_period: float = 0.0) -> List[RetiredAgent]:
+        """
+        Shuts down agents retired at least `grace_period` seconds ago and returns them.
+        Calls already running on a retired agent finish; it just receives no new ones.
+        """
+        cutoff = time.monotonic() - grace_period
+        drained = [r for r in self.retired if r.retired_at <= cutoff]
+        self.retired = [r for r in self.retired if r.retired_at > cutoff]
+        for retired in drained:
+            shutdown = getattr(retired.agent, "shutdown", None)
+            if shutdown is not None:
+                shutdown(wait=False)
+        return drained
+
+    def card_versions(self) -> Dict[str, str | None]:
+        """
+        Returns the `version` of every loaded AgentCard, keyed by agent name.
+        """
+        return {
+            card.get("name"): card.get("version")
+            for cards in self._snapshot.route_map.values()
+            for card in cards
+        }
 
-    def find_agent_for_method(self, method: str) -> BaseAgent | None:
+    def prewarm(self, methods: Iterable[str] | None = None) -> None:
         """
-        Given a skill ID, return the agent that supports it.
+        Creates the agents serving `methods` (default: every skill) ahead of first use.
         """
-        return self.skill_map.get(method)
+        for method in list(self.card_map) if methods is None else methods:
+            self.find_agent_for_method(method)
+
+    def _create_agents(self, snapshot: _Snapshot, card: dict) -> List:
+        """
+        Imports and instantiates the agent for `card`, once per `replicas` (default 1).
+        """
+        agents = []
+        for _ in range(card.get("replicas", 1)):
+            if _is_remote(card):
+                agent_instance = RemoteAgent(card["url"])
+            else:
+                agent_instance = load_class_from_path(agent_class_path(card))()
+                agent_instance.result_store = self.result_store
+            agent_instance.apply_card(card)
+            agents.append(agent_instance)
+
+        with self._lock:
+            winner = snapshot.instances.setdefault(id(card), (card, agents))[1]
+            if winner is not agents:
+                # Another thread created this card's agents first; use its instances.
+                self._retire(card, agents, 0.0)
+                return winner
+            current = self._snapshot
+            if current is not snapshot:
+                # A reload happened while the agents were being created.
+                if current.serves(card):
+                    current.instances.setdefault(id(card), (card, agents))
+                else:
+                    self._retire(card, agents, 0.0)
+        return agents
+
+    def _resolve(self, method: str):
+        """
+        Builds the skill_map entry for `method`: its only agent, or a ReplicaSet over the
+        agents of every card and replica serving it.
+        """
+        snapshot = self._snapshot
+        cards = snapshot.route_map.get(method)
+        if not cards:
+            return None
+        agents = []
+        for card in cards:
+            entry = snapshot.instances.get(id(card))
+            agents += entry[1] if entry else self._create_agents(snapshot, card)
+
+        if len(agents) == 1:
+            target = agents[0]
+        else:
+            with self._lock:
+                replicas = [self._replicas.setdefault(id(a), Replica(a)) for a in agents]
+            strategy = snapshot.card_map[method].get("loadBalancing", POWER_OF_TWO)
+            target = ReplicaSet(replicas, strategy)
+        return snapshot.skill_map.setdefault(method, target)
+
+    def find_agent_for_method(self, method: str) -> "BaseAgent | None":
+        """
+        Given a skill ID, return the agent that supports it, creating it on first use.
+        For replicated skills this is the replica the load balancer picks for this call.
+        """
+        target = self._snapshot.skill_map.get(method)
+        if target is None:
+            target = self._resolve(method)
+        if isinstance(target, ReplicaSet):
+            return target.choose()
+        return target
+
+    def find_card_for_method(self, method: str) -> dict | None:
+        """
+        Given a skill ID, return the AgentCard that declares it.
+        """
+        return self.card_map.get(method)
+
+    def find_skill_for_method(self, method: str) -> dict | None:
+        """
+        Given a skill ID, return its skill entry from the AgentCard.
+        """
+        card = self.card_map.get(method)
+        if card is None:
+            return None
+        return next((s for s in card.get("skills", []) if s["id"] == method), None)
+
+    def find_skills(
+        self,
+        keywords: str = "",
+        tags: Iterable[str] = (),
+        input_modes: Iterable[str] = (),
+        output_modes: Iterable[str] = (),
+        limit: int | None = 10,
+    ) -> List[SkillMatch]:
+        """
+        Returns the loaded skills that have every tag in `tags` and support every mode in
+        `input_modes` and `output_modes`, ranked by relevance to `keywords` when given
+        (see agents/skill_index.py). Agents are not created.
+        """
+        return self._snapshot.skill_index.search(
+            keywords, tags, input_modes, output_modes, limit
+        )
+
+    def agents(self) -> List:
+        """
+        Returns every agent instance created so far, one per replica.
+        """
+        return [
+            agent
+            for _, agents in self._snapshot.instances.values()
+            for agent in agents
+        ]
+
+    def cache_stats(self) -> dict:
+        """
+        Returns result-cache counters for every agent with caching enabled, keyed by agent name.
+        Counters of replicas of one card are summed.
+        """
+        stats = {}
+        for card, agents in self._snapshot.instances.values():
+            for agent in agents:
+                cache = getattr(agent, "cache", None)
+                if cache is None:
+                    continue
+                totals = stats.setdefault(card["name"], {})
+                for key, value in cache.stats().items():
+                    totals[key] = totals.get(key, 0) + value
+        return stats
+
+    def replica_stats(self) -> Dict[str, List[dict]]:
+        """
+        Returns in-flight counts and latency EWMAs for the replicas of every replicated
+        skill that has been looked up, keyed by skill ID.
+        """
+        return {
+            method: [replica.stats() for replica in target.replicas]
+            for method, target in self._snapshot.skill_map.items()
+            if isinstance(target, ReplicaSet)
+        }
+
+
+def _agent_name(card: dict) -> str:
+    return card.get("name", "").lower().replace(" ", "-")
+
+
+def _is_remote(card: dict) -> bool:
+    return is_remote_url(card.get("url", ""))
+
+
+def card_paths(directory: str) -> List[str]:
+    """
+    Returns the `*.json` AgentCard paths in `directory`, sorted.
+    """
+    return sorted(
+        os.path.join(directory, name)
+        for name in os.listdir(directory)
+        if name.endswith(".json")
+    )
+
+
+def _read_cards(paths: List[str], index_path: str | None) -> List[dict]:
+    if index_path is not None:
+        return CardIndex(index_path).load_cards(paths)
+    cards = []
+    for path in paths:
+        with open(path, "r") as f:
+            cards.append(json.load(f))
+    return cards
+
+
+def _compile_query_parser(card_map: dict) -> QueryParser | None:
+    """
+    Compiles the `queryPatterns` of every loaded skill into one QueryParser, or returns
+    None when no card declares any.
+    """
+    cards = list({id(card): card for card in card_map.values()}.values())
+    parser = QueryParser.from_cards(cards)
+    return parser if parser.rules else None
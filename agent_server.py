@@ -0,0 +1,100 @@
+import argparse
+import asyncio
+import json
+
+from agent_registry import agent_class_path, load_class_from_path
+from protocol.base_agent import BaseAgent
+from protocol.http import HTTPRequest, connection_handler, write_response
+from protocol.messages import Response
+from protocol.serialization import DEFAULT_SERIALIZER, Serializer
+
+
+class AgentServer:
+    """
+    Serves one in-process agent over HTTP/JSON-RPC 2.0 so it can run in its own process
+    or on another node. Pair it with an AgentCard whose `url` points at this server
+    (`http://host:port/` or `unix:///path/to.sock`); the registry then reaches it
+    through a pooled RemoteAgent transport.
+    """
+
+    def __init__(self, agent: BaseAgent, serializer: Serializer | None = None) -> None:
+        self.agent = agent
+        self.serializer = serializer or DEFAULT_SERIALIZER
+        self._server: asyncio.AbstractServer | None = None
+
+    async def start(self, host: str = "127.0.0.1", port: int = 9000):
+        self._server = await asyncio.start_server(
+            connection_handler(self.handle_http), host, port
+        )
+        return self._server
+
+    async def start_unix(self, path: str):
+        self._server = await asyncio.start_unix_server(
+            connection_handler(self.handle_http), path
+        )
+        return self._server
+
+    @property
+    def port(self) -> int:
+        return self._server.sockets[0].getsockname()[1]
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def handle_http(self, request: HTTPRequest, writer: asyncio.StreamWriter):
+        if request.method != "POST":
+            await write_response(writer, 405, keep_alive=request.keep_alive)
+            return
+        try:
+            payload = self.serializer.loads(request.body)
+        except ValueError:
+            payload = None
+        if not isinstance(payload, (dict, list)):
+            error = Response.failure(None, -32700, "Parse error")
+            body = self.serializer.dumps(error)
+            await write_response(writer, 200, body, keep_alive=request.keep_alive)
+            return
+
+        response = await self.agent.handle_rpc(payload)
+        if response is None:
+            await write_response(writer, 204, keep_alive=request.keep_alive)
+        else:
+            body = self.serializer.dumps(response)
+            await write_response(writer, 200, body, keep_alive=request.keep_alive)
+
+
+def agent_from_card(path: str) -> BaseAgent:
+    """
+    Instantiates the in-process agent class named by an AgentCard.
+    """
+    with open(path, "r") as f:
+        card = json.load(f)
+    AgentClass = load_class_from_path(agent_class_path(card))
+    agent = AgentClass()
+    agent.apply_card(card)
+    return agent
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Serve one agent over HTTP.")
+    parser.add_argument("--card", required=True, help="path to the agent's AgentCard")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--unix", help="listen on this unix socket instead of TCP")
+    args = parser.parse_args()
+
+    server = AgentServer(agent_from_card(args.card))
+    if args.unix:
+        await server.start_unix(args.unix)
+        print(f"Agent listening on unix://{args.unix}")
+    else:
+        await server.start(args.host, args.port)
+        print(f"Agent listening on http://{args.host}:{server.port}/")
+    await asyncio.Event().wait()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
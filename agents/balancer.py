@@ -0,0 +1,102 @@
+import random
+import time
+from typing import AsyncIterator, Callable, List
+
+LEAST_OUTSTANDING = "least-outstanding"
+POWER_OF_TWO = "power-of-two"
+STRATEGIES = (LEAST_OUTSTANDING, POWER_OF_TWO)
+
+
+class Replica:
+    """
+    Wraps one agent instance that serves a replicated skill and tracks its load: the
+    number of in-flight calls and an exponentially weighted moving average of their
+    latency. Every other attribute is forwarded to the agent.
+    """
+
+    def __init__(self, agent, alpha: float = 0.3) -> None:
+        self.agent = agent
+        self.alpha = alpha
+        self.in_flight = 0
+        self.latency_ewma = 0.0
+        self.requests = 0
+
+    def __getattr__(self, name: str):
+        return getattr(self.agent, name)
+
+    @property
+    def cost(self) -> float:
+        """
+        Expected wait for a new call: in-flight calls plus this one, times the average
+        latency. Replicas without samples cost nothing, so they are tried first.
+        """
+        return (self.in_flight + 1) * self.latency_ewma
+
+    async def handle_rpc(self, request):
+        self.in_flight += 1
+        start = time.perf_counter()
+        try:
+            return await self.agent.handle_rpc(request)
+        finally:
+            self.in_flight -= 1
+            self._observe(time.perf_counter() - start)
+
+    async def handle_rpc_stream(self, request) -> AsyncIterator[dict]:
+        self.in_flight += 1
+        start = time.perf_counter()
+        try:
+            async for message in self.agent.handle_rpc_stream(request):
+                yield message
+        finally:
+            self.in_flight -= 1
+            self._observe(time.perf_counter() - start)
+
+    def _observe(self, latency: float) -> None:
+        self.requests += 1
+        if self.requests == 1:
+            self.latency_ewma = latency
+        else:
+            self.latency_ewma += self.alpha * (latency - self.latency_ewma)
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": self.in_flight,
+            "latency_ewma": self.latency_ewma,
+            "requests": self.requests,
+        }
+
+
+class ReplicaSet:
+    """
+    The replicas serving one skill and the strategy that picks one per call.
+
+    - `least-outstanding`: the replica with the fewest in-flight calls, ties broken by
+      latency EWMA.
+    - `power-of-two` (default): the cheaper of two random replicas by `Replica.cost`,
+      which avoids every caller herding onto the same momentarily idle replica.
+    """
+
+    def __init__(
+        self,
+        replicas: List[Replica],
+        strategy: str = POWER_OF_TWO,
+        rng: Callable[[int, int], List[int]] | None = None,
+    ) -> None:
+        if strategy not in STRATEGIES:
+            raise ValueError(
+                f"Unknown load balancing strategy {strategy!r}; "
+                f"expected one of {', '.join(STRATEGIES)}"
+            )
+        self.replicas = replicas
+        self.strategy = strategy
+        self._sample = rng or (lambda n, k: random.sample(range(n), k))
+
+    def choose(self) -> Replica:
+        replicas = self.replicas
+        if len(replicas) == 1:
+            return replicas[0]
+        if self.strategy == LEAST_OUTSTANDING:
+            return min(replicas, key=lambda r: (r.in_flight, r.latency_ewma))
+        first, second = self._sample(len(replicas), 2)
+        a, b = replicas[first], replicas[second]
+        return a if (a.cost, a.in_flight) <= (b.cost, b.in_flight) else b
@@ -0,0 +1,156 @@
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+)
+
+
+class QueryResult(NamedTuple):
+    index: int  # position of the query in the input
+    query: str
+    responses: List[Dict]
+
+
+@dataclass
+class BulkStats:
+    """
+    Counters for one `SupervisorAgent.handle_queries` run.
+    """
+
+    queries: int = 0
+    tasks: int = 0  # tasks parsed from all queries
+    dispatched: int = 0  # tasks actually sent to agents after deduplication
+    started: float = field(default_factory=time.perf_counter)
+    finished: float | None = None
+
+    @property
+    def deduplicated(self) -> int:
+        return self.tasks - self.dispatched
+
+    @property
+    def elapsed(self) -> float:
+        return (self.finished or time.perf_counter()) - self.started
+
+    @property
+    def throughput(self) -> float:
+        return self.queries / self.elapsed if self.elapsed else 0.0
+
+    def summary(self) -> str:
+        return (
+            f"{self.queries} queries, {self.tasks} tasks "
+            f"({self.dispatched} dispatched, {self.deduplicated} deduplicated) "
+            f"in {self.elapsed:.2f}s: {self.throughput:,.1f} queries/s"
+        )
+
+
+class MicroBatcher:
+    """
+    Collects tasks submitted during one event-loop iteration (or up to `max_batch`
+    tasks) and sends them together through `flush`, so tasks from many concurrent
+    queries share agent batches.
+    """
+
+    def __init__(
+        self,
+        flush: Callable[[List[Dict]], Awaitable[List[Dict]]],
+        max_batch: int = 128,
+    ) -> None:
+        self._flush = flush
+        self.max_batch = max_batch
+        self._pending: List[tuple] = []  # (task, future)
+        self._scheduled = False
+        self._running: set = set()
+
+    def submit(self, task: Dict) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((task, future))
+        if len(self._pending) >= self.max_batch:
+            self._send()
+        elif not self._scheduled:
+            self._scheduled = True
+            loop.call_soon(self._send)
+        return future
+
+    def _send(self) -> None:
+        self._scheduled = False
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, []
+        runner = asyncio.ensure_future(self._run(batch))
+        self._running.add(runner)
+        runner.add_done_callback(self._running.discard)
+
+    async def _run(self, batch: List[tuple]) -> None:
+        try:
+            responses = await self._flush([task for task, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), response in zip(batch, responses):
+            if not future.done():
+                future.set_result(response)
+
+
+async def run_bounded(
+    items: Iterable | AsyncIterable,
+    run: Callable[[int, Any], Awaitable],
+    ordered: bool = True,
+    max_in_flight: int = 256,
+) -> AsyncIterator:
+    """
+    Runs `run(index, item)` for every item of a sync or async iterable and yields the
+    results in input order, or in completion order when `ordered` is False.
+
+    Items are read lazily and at most `max_in_flight` runs are outstanding or waiting to
+    be yielded, so memory stays flat however long the input is. Closing the generator
+    cancels the runs still outstanding.
+    """
+    source = aiter(items) if hasattr(items, "__aiter__") else None
+    source_iter = iter(items) if source is None else None
+    running: Dict[asyncio.Future, int] = {}  # future → item index
+    finished: Dict[int, Any] = {}  # index → result held for input order
+    admitted = yielded = 0
+    exhausted = False
+    try:
+        while True:
+            while not exhausted and admitted - yielded < max_in_flight:
+                try:
+                    if source is not None:
+                        item = await anext(source)
+                    else:
+                        item = next(source_iter)
+                except (StopIteration, StopAsyncIteration):
+                    exhausted = True
+                    break
+                running[asyncio.ensure_future(run(admitted, item))] = admitted
+                admitted += 1
+            if not running:
+                break
+
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                index = running.pop(future)
+                if ordered:
+                    finished[index] = future.result()
+                else:
+                    yielded += 1
+                    yield future.result()
+            while yielded in finished:
+                yielded += 1
+                yield finished.pop(yielded - 1)
+    finally:
+        for future in running:
+            future.cancel()
+        await asyncio.gather(*running, return_exceptions=True)
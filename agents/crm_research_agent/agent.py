@@ -1,5 +1,12 @@
+from typing import Callable
+
 from protocol.base_agent import BaseAgent
-from .tools import fetch_mock_crm_history
+from protocol.pagination import Page, read_page
+from .tools import (
+    fetch_mock_contact_company,
+    fetch_mock_crm_history_batch,
+    fetch_mock_crm_interactions,
+)
 
 
 class CRMResearchAgent(BaseAgent):
@@ -7,26 +14,101 @@ class CRMResearchAgent(BaseAgent):
     Specialized agent for handling CRM-related tasks.
 
     This agent supports the 'get_crm_history' method, which retrieves simulated CRM interaction history
-    for a given contact.
+    for a given contact, one page at a time. Batched 'get_crm_history' requests are served with one
+    CRM round-trip. 'get_contact_company' looks up the company a contact works for.
     """
 
-    def __init__(self):
-        super().__init__(tool_layer=fetch_mock_crm_history)
+    def __init__(
+        self,
+        tool_layer: Callable = fetch_mock_crm_interactions,
+        batch_tool_layer: Callable = fetch_mock_crm_history_batch,
+        company_tool_layer: Callable = fetch_mock_contact_company,
+    ):
+        super().__init__(tool_layer=tool_layer)
+        self.batch_tool_layer = batch_tool_layer
+        self.company_tool_layer = company_tool_layer
 
     def get_supported_methods(self):
-        return {"get_crm_history": self.get_crm_history}
+        return {
+            "get_crm_history": self.get_crm_history,
+            "get_contact_company": self.get_contact_company,
+        }
+
+    def get_batch_methods(self):
+        # A card-declared tool server pages one contact per call, so batched requests
+        # are served one by one from it.
+        if self.tool_server is not None:
+            return {}
+        return {"get_crm_history": self.get_crm_history_batch}
 
-    def get_crm_history(self, params: dict) -> dict:
+    async def get_crm_history(self, params: dict) -> dict:
         """
         Handles the 'get_crm_history' method.
 
-        Expects a 'contact_name' parameter in the input dictionary.
-        Returns mock CRM interaction data for the specified contact by calling the injected tool layer.
+        Expects a 'contact_name' parameter in the input dictionary, plus the optional
+        'limit', 'cursor' and 'since' pagination parameters. Returns one page of the
+        contact's interactions, newest first, read lazily from the injected tool layer.
+
+        Raises:
+            ValueError: If 'contact_name' is not provided or a pagination parameter is invalid.
+        """
+        contact_name = params.get("contact_name")
+        if not contact_name:
+            raise ValueError("Missing 'contact_name' parameter.")
+        page = Page.from_params(params, self.pagination.get("get_crm_history"))
+        interactions, next_cursor = await read_page(
+            self.tool_layer(contact_name, since=page.since, offset=page.offset), page
+        )
+        return {
+            "contact": contact_name,
+            "interactions": interactions,
+            "next_cursor": next_cursor,
+        }
+
+    def get_contact_company(self, params: dict) -> dict:
+        """
+        Handles the 'get_contact_company' method.
+
+        Expects a 'contact_name' parameter in the input dictionary. Returns the contact
+        and the company the CRM has on record for them.
 
         Raises:
-            ValueError: If 'contact_name' is not provided in params.
+            ValueError: If 'contact_name' is not provided.
         """
         contact_name = params.get("contact_name")
         if not contact_name:
             raise ValueError("Missing 'contact_name' parameter.")
-        return self.tool_layer(contact_name)
+        return {"contact": contact_name, "company": self.company_tool_layer(contact_name)}
+
+    def get_crm_history_batch(self, params_list: list[dict]) -> list:
+        """
+        Handles a batch of 'get_crm_history' requests with a single call to the batch tool layer,
+        which fetches the requested page for every contact.
+
+        Invalid requests get a ValueError in their slot; the rest are fetched together.
+        """
+        results: list = [None] * len(params_list)
+        pending = []  # (index, contact_name, page)
+        config = self.pagination.get("get_crm_history")
+        for index, params in enumerate(params_list):
+            contact_name = params.get("contact_name")
+            if not contact_name:
+                results[index] = ValueError("Missing 'contact_name' parameter.")
+                continue
+            try:
+                pending.append((index, contact_name, Page.from_params(params, config)))
+            except ValueError as e:
+                results[index] = e
+
+        if pending:
+            fetched = self.batch_tool_layer(
+                [name for _, name, _ in pending], [page for _, _, page in pending]
+            )
+            for (index, contact_name, page), interactions in zip(pending, fetched):
+                interactions, next_cursor = page.cut(interactions)
+                results[index] = {
+                    "contact": contact_name,
+                    "interactions": interactions,
+                    "next_cursor": next_cursor,
+                }
+        return results
@@ -1,15 +1,66 @@
-def fetch_mock_crm_history(contact_name: str) -> dict:
-    """
-    Simulates CRM history retrieval. Returns a JSON-RPC 2.0 response object.
-    """
-    return {
-        "jsonrpc": "2.0",
-        "result": {
-            "contact_name": contact_name,
-            "interactions": [
-                {"date": "2025-05-20", "type": "email", "note": "Initial outreach"},
-                {"date": "2025-05-25", "type": "call", "note": "Follow-up on proposal"},
-            ],
-        },
-        "id": "mock-id",
-    }
+from protocol.pagination import Page
+
+# Mock CRM data, newest interaction first.
+_MOCK_INTERACTIONS = [
+    {"date": "2025-05-25", "type": "call", "note": "Follow-up on proposal"},
+    {"date": "2025-05-20", "type": "email", "note": "Initial outreach"},
+]
+
+MOCK_PAGE_SIZE = 50
+
+# Mock CRM contact records: contact → company.
+_MOCK_COMPANIES = {
+    "Jane Smith": "Acme Inc",
+    "John Doe": "BoltAI",
+}
+
+
+def fetch_mock_crm_page(
+    contact_name: str, offset: int, size: int | None, since: str | None = None
+) -> list[dict]:
+    """
+    Simulates one page request to the CRM API. Returns up to `size` interactions,
+    newest first, starting `offset` interactions into those dated on or after `since`.
+    """
+    interactions = [
+        dict(interaction)
+        for interaction in _MOCK_INTERACTIONS
+        if since is None or interaction["date"] >= since
+    ]
+    return interactions[offset:][:size]
+
+
+async def fetch_mock_crm_interactions(
+    contact_name: str, since: str | None = None, offset: int = 0
+):
+    """
+    Simulates incremental CRM history retrieval. Yields the contact's interactions
+    newest first, requesting the next backend page only when the caller gets there.
+    """
+    while True:
+        page = fetch_mock_crm_page(contact_name, offset, MOCK_PAGE_SIZE, since)
+        for interaction in page:
+            yield interaction
+        if len(page) < MOCK_PAGE_SIZE:
+            return
+        offset += len(page)
+
+
+def fetch_mock_crm_history_batch(
+    contact_names: list[str], pages: list[Page]
+) -> list[list[dict]]:
+    """
+    Simulates a single CRM round-trip that retrieves one page of history for many
+    contacts. Returns up to `page.fetch_limit` interactions per contact, in input order.
+    """
+    return [
+        fetch_mock_crm_page(contact_name, page.offset, page.fetch_limit, page.since)
+        for contact_name, page in zip(contact_names, pages)
+    ]
+
+
+def fetch_mock_contact_company(contact_name: str) -> str:
+    """
+    Simulates a CRM contact lookup. Returns the company the contact works for.
+    """
+    return _MOCK_COMPANIES.get(contact_name, f"{contact_name.split()[-1]} Inc")
@@ -0,0 +1,157 @@
+import re
+from typing import Dict, Iterable, List, Tuple
+
+from agents.task_graph import Ref
+
+_PUNCTUATION = re.compile(r"[^\w\s]")
+_PLACEHOLDER = re.compile(r"^\{(\w+)\}$")
+
+# Patterns for the bundled agents, used when the registry's cards declare none.
+DEFAULT_QUERY_PATTERNS = {
+    "get_company_news": ["news about {company_name}"],
+    "get_crm_history": ["crm history for {contact_name}"],
+}
+
+
+class _Rule:
+    __slots__ = ("method", "trigger", "param", "max_words", "order", "source")
+
+    def __init__(
+        self,
+        method: str,
+        trigger: Tuple[str, ...],
+        param: str,
+        max_words: int,
+        source: Tuple[str, str, str] | None = None,
+    ):
+        self.method = method
+        self.trigger = trigger
+        self.param = param
+        self.max_words = max_words
+        self.order = 0
+        # (param of `method`, skill that gets the entity, field of its result)
+        self.source = source
+
+    def params(self, entity: str) -> Dict:
+        if self.source is None:
+            return {self.param: entity}
+        target, skill, field = self.source
+        return {target: Ref(skill, {self.param: entity}, field)}
+
+
+class QueryParser:
+    """
+    Rule-driven intent parser compiled once from AgentCard skills.
+
+    Each skill may declare `queryPatterns` such as "news about {company_name}": trigger
+    words followed by one placeholder naming the param that receives the next
+    `queryEntityWords` (default 2) words, title-cased. `parse` normalizes the query
+    once, tokenizes it once and matches rules only at tokens that start a trigger,
+    returning at most one task per skill in skill declaration order. Where triggers
+    overlap, the longest one that matches wins.
+
+    A pattern can also chain two skills:
+
+        {"pattern": "news about the company of {contact_name}",
+         "param": "company_name",
+         "from": {"skill": "get_contact_company", "field": "company"}}
+
+    Here the entity is the `contact_name` of a `get_contact_company` step, and field
+    `company` of that step's result becomes this skill's `company_name`; the param is
+    returned as a `Ref` (see agents/task_graph.py).
+    """
+
+    def __init__(self, rules: Iterable[_Rule] = ()) -> None:
+        self.rules: List[_Rule] = list(rules)
+        for order, rule in enumerate(self.rules):
+            rule.order = order
+        # First trigger word → rules starting with it, so each token is a dict lookup.
+        self._by_first_word: Dict[str, List[_Rule]] = {}
+        for rule in sorted(self.rules, key=lambda r: -len(r.trigger)):
+            self._by_first_word.setdefault(rule.trigger[0], []).append(rule)
+
+    @classmethod
+    def from_patterns(
+        cls, patterns: Dict[str, List[str]], max_words: int = 2
+    ) -> "QueryParser":
+        rules = [
+            _compile(method, pattern, max_words)
+            for method, method_patterns in patterns.items()
+            for pattern in method_patterns
+        ]
+        return cls(rules)
+
+    @classmethod
+    def from_cards(cls, cards: Iterable[dict]) -> "QueryParser":
+        rules = []
+        for card in cards:
+            for skill in card.get("skills", []):
+                max_words = skill.get("queryEntityWords", 2)
+                for pattern in skill.get("queryPatterns", []):
+                    rules.append(_compile(skill["id"], pattern, max_words))
+        return cls(rules)
+
+    def parse(self, query: str) -> List[Tuple[str, Dict]]:
+        """
+        Returns (method, params) pairs for every skill whose pattern matches the query.
+        Params of chained patterns hold a `Ref` to the step they are read from.
+        """
+        words = _PUNCTUATION.sub("", query).lower().split()
+        present = self._by_first_word.keys() & words
+        if not present:
+            return []
+        # Positions of words that start a trigger, found without a Python-level loop
+        # over every word.
+        starts = []
+        for word in present:
+            index = -1
+            for _ in range(words.count(word)):
+                index = words.index(word, index + 1)
+                starts.append((index, word))
+        starts.sort()
+
+        matches: Dict[str, Tuple] = {}  # method → (rule order, (method, params))
+        for index, word in starts:
+            for rule in self._by_first_word[word]:
+                if rule.method in matches:
+                    continue
+                end = index + len(rule.trigger)
+                if tuple(words[index:end]) != rule.trigger:
+                    continue
+                entity = words[end : end + rule.max_words]
+                if entity:
+                    matches[rule.method] = (
+                        rule.order,
+                        (rule.method, rule.params(" ".join(entity).title())),
+                    )
+
+        return [task for _, task in sorted(matches.values(), key=lambda m: m[0])]
+
+
+def _compile(method: str, pattern, max_words: int) -> _Rule:
+    source = None
+    if isinstance(pattern, dict):
+        try:
+            source = (
+                pattern["param"],
+                pattern["from"]["skill"],
+                pattern["from"]["field"],
+            )
+            pattern = pattern["pattern"]
+        except (KeyError, TypeError):
+            raise ValueError(
+                f"Chained query pattern for '{method}' needs 'pattern', 'param' and "
+                f"'from' with 'skill' and 'field': {pattern!r}"
+            ) from None
+    *trigger, placeholder = pattern.split()
+    param = _PLACEHOLDER.match(placeholder)
+    trigger = [word.lower() for word in trigger]
+    if not trigger or param is None or any(_PLACEHOLDER.match(w) for w in trigger):
+        raise ValueError(
+            f"Query pattern for '{method}' must be trigger words followed by one "
+            f"{{param}} placeholder: {pattern!r}"
+        )
+    return _Rule(method, tuple(trigger), param.group(1), max_words, source)
+
+
+DEFAULT_QUERY_PARSER = QueryParser.from_patterns(DEFAULT_QUERY_PATTERNS)
@@ -0,0 +1,251 @@
+"""
+Retries, hedging and circuit breaking for the SupervisorAgent's agent calls.
+
+Each skill's `retryPolicy` in its AgentCard becomes a RetryPolicy (the supervisor's
+default otherwise). `call_with_retry` retries failed attempts with jittered exponential
+backoff, can fire a hedged duplicate of a slow attempt, and runs behind a per-agent
+CircuitBreaker, which answers -32004 while the agent is unhealthy. Attempts and backoff
+never outlast the query's deadline.
+"""
+
+import asyncio
+import random
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, FrozenSet, Set
+
+from protocol.deadline import Deadline
+
+# Server-side error codes that count against an agent's health. Client errors such as
+# -32601 (method not found) or -32602 (invalid params) do not trip the circuit breaker.
+UNHEALTHY_CODES = frozenset({-32000, -32001})
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    Retry settings for one skill, built from the `retryPolicy` objects in an AgentCard.
+
+    The defaults reproduce the original behaviour: two attempts of 3 seconds each,
+    retried immediately and only on timeout (-32001).
+    """
+
+    max_attempts: int = 2
+    attempt_timeout: float = 3.0
+    deadline: float | None = None  # total budget across all attempts and backoff
+    backoff_base: float = 0.0
+    backoff_multiplier: float = 2.0
+    backoff_max: float = 2.0
+    jitter: float = 0.0  # fraction of each backoff delay that is randomized
+    retry_on: FrozenSet[int] = field(default_factory=lambda: frozenset({-32001}))
+    hedge_percentile: float | None = None  # fire a duplicate after this latency pct
+    hedge_delay: float | None = None  # fixed hedge delay until enough samples exist
+
+    @classmethod
+    def from_config(
+        cls, config: dict, base: "RetryPolicy | None" = None
+    ) -> "RetryPolicy":
+        """
+        Builds a policy from an AgentCard `retryPolicy` object, falling back to `base`
+        (or the defaults) for keys it does not set.
+        """
+        base = base or cls()
+        return cls(
+            max_attempts=config.get("maxAttempts", base.max_attempts),
+            attempt_timeout=config.get("attemptTimeout", base.attempt_timeout),
+            deadline=config.get("deadline", base.deadline),
+            backoff_base=config.get("backoffBase", base.backoff_base),
+            backoff_multiplier=config.get(
+                "backoffMultiplier", base.backoff_multiplier
+            ),
+            backoff_max=config.get("backoffMax", base.backoff_max),
+            jitter=config.get("jitter", base.jitter),
+            retry_on=frozenset(config.get("retryOn", base.retry_on)),
+            hedge_percentile=config.get("hedgePercentile", base.hedge_percentile),
+            hedge_delay=config.get("hedgeDelay", base.hedge_delay),
+        )
+
+    def backoff(self, attempt: int, rng: Callable[[], float] = random.random) -> float:
+        """
+        Returns the delay before retry number `attempt` (0-based): exponential backoff,
+        capped at `backoff_max`, with `jitter` of it randomized.
+        """
+        delay = self.backoff_base * self.backoff_multiplier**attempt
+        delay = min(delay, self.backoff_max)
+        return delay * (1 - self.jitter + self.jitter * rng())
+
+    def hedge_after(self, latencies: "LatencyWindow | None") -> float | None:
+        """
+        Returns how long to wait before firing a hedged duplicate, or None to not hedge.
+        """
+        if self.hedge_percentile is not None and latencies is not None:
+            observed = latencies.percentile(self.hedge_percentile)
+            if observed is not None:
+                return observed
+        return self.hedge_delay
+
+
+class LatencyWindow:
+    """
+    Sliding window of recent successful call latencies, used to derive hedge delays.
+    """
+
+    def __init__(self, size: int = 256, min_samples: int = 20):
+        self.samples: deque = deque(maxlen=size)
+        self.min_samples = min_samples
+
+    def record(self, seconds: float) -> None:
+        self.samples.append(seconds)
+
+    def percentile(self, pct: float) -> float | None:
+        if len(self.samples) < self.min_samples:
+            return None
+        ordered = sorted(self.samples)
+        index = min(len(ordered) - 1, int(len(ordered) * pct / 100))
+        return ordered[index]
+
+
+class CircuitBreaker:
+    """
+    Per-agent circuit breaker.
+
+    After `failure_threshold` consecutive unhealthy results the circuit opens and calls
+    fail fast. Once `reset_timeout` seconds pass, one trial call is let through
+    (half-open); its outcome closes the circuit or opens it again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+
+    @classmethod
+    def from_config(cls, config: dict) -> "CircuitBreaker":
+        return cls(
+            failure_threshold=config.get("failureThreshold", 5),
+            reset_timeout=config.get("resetTimeout", 30.0),
+        )
+
+    def allow(self) -> bool:
+        if self.state == self.CLOSED:
+            return True
+        # Open or half-open: let one trial call through per reset window.
+        if self._clock() - self.opened_at < self.reset_timeout:
+            return False
+        self.state = self.HALF_OPEN
+        self.opened_at = self._clock()
+        return True
+
+    def record_success(self) -> None:
+        self.state = self.CLOSED
+        self.failures = 0
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            self.state = self.OPEN
+            self.opened_at = self._clock()
+
+
+async def _hedged(attempt: Callable[[], Awaitable], delay: float | None):
+    if delay is None:
+        return await attempt()
+    primary = asyncio.ensure_future(attempt())
+    calls = {primary}
+    try:
+        done, _ = await asyncio.wait(calls, timeout=delay)
+        if not done:
+            calls.add(asyncio.ensure_future(attempt()))
+            done, _ = await asyncio.wait(calls, return_when=asyncio.FIRST_COMPLETED)
+        return done.pop().result()
+    finally:
+        for call in calls:
+            call.cancel()
+
+
+async def call_with_retry(
+    attempt: Callable[[], Awaitable[Any]],
+    policy: RetryPolicy,
+    failure_codes: Callable[[Any], Set[int]],
+    on_timeout: Callable[[float], Any],
+    on_circuit_open: Callable[[], Any],
+    breaker: CircuitBreaker | None = None,
+    latencies: LatencyWindow | None = None,
+    deadline: Deadline | None = None,
+) -> Any:
+    """
+    Runs `attempt()` under `policy` and returns the last result.
+
+    `failure_codes(result)` returns the JSON-RPC error codes in a result; the call is
+    retried while any of them is in `policy.retry_on`. Timeouts are turned into results
+    by `on_timeout(seconds)`, and an open circuit by `on_circuit_open()`.
+
+    A caller's `deadline` caps every attempt at the time it has left, and no attempt
+    or backoff starts once it is spent.
+    """
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    result = None
+
+    for attempt_number in range(policy.max_attempts):
+        if breaker is not None and not breaker.allow():
+            return on_circuit_open()
+
+        timeout = policy.attempt_timeout
+        if policy.deadline is not None:
+            remaining = policy.deadline - (loop.time() - started)
+            if remaining <= 0:
+                break
+            timeout = min(timeout, remaining)
+        if deadline is not None:
+            remaining = deadline.remaining()
+            if remaining <= 0:
+                break
+            timeout = min(timeout, remaining)
+
+        attempt_started = loop.time()
+        try:
+            result = await asyncio.wait_for(
+                _hedged(attempt, policy.hedge_after(latencies)), timeout=timeout
+            )
+            codes = failure_codes(result)
+        except asyncio.TimeoutError:
+            result = on_timeout(timeout)
+            codes = {-32001}
+
+        if breaker is not None:
+            if codes & UNHEALTHY_CODES:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+        if not codes:
+            if latencies is not None:
+                latencies.record(loop.time() - attempt_started)
+            return result
+        if not codes & policy.retry_on or attempt_number == policy.max_attempts - 1:
+            return result
+
+        delay = policy.backoff(attempt_number)
+        if policy.deadline is not None:
+            remaining = policy.deadline - (loop.time() - started)
+            if delay >= remaining:
+                break
+        if deadline is not None and delay >= deadline.remaining():
+            break
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    return result if result is not None else on_timeout(0.0)
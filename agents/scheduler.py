@@ -0,0 +1,175 @@
+"""
+Admission control for the SupervisorAgent's agent calls.
+
+Every send to an agent (a single task or a per-agent batch) is submitted to the
+TaskScheduler with its resources: the agent and each of its skills, limited by
+`limits.maxConcurrency` on the AgentCard and on the skill. Both limits apply to each of
+the card's replicas. A query's trace id is its scheduler query id.
+"""
+
+import asyncio
+from collections import Counter, OrderedDict, deque
+from typing import Awaitable, Callable, Dict, Hashable, Iterable, Tuple
+
+
+class SchedulerOverloaded(Exception):
+    """
+    Raised by TaskScheduler.submit when the wait queue is full and load is being shed.
+    """
+
+
+class _Entry:
+    __slots__ = ("resources", "granted")
+
+    def __init__(self, resources: Tuple, granted: asyncio.Future):
+        self.resources = resources  # ((resource_key, limit), ...)
+        self.granted = granted
+
+
+class TaskScheduler:
+    """
+    Admission control for the SupervisorAgent.
+
+    Every submitted call needs a global slot plus a slot on each of its resources (e.g. the
+    target agent and skill), each with its own concurrency limit. Calls that cannot start
+    wait in a bounded queue; once it is full, `overflow="block"` makes submitters wait for
+    space (backpressure) and `overflow="shed"` raises SchedulerOverloaded.
+
+    Waiting calls are grouped per query and granted round-robin across queries, so one
+    large query cannot starve the others.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 64,
+        max_queue: int = 1024,
+        overflow: str = "block",
+    ) -> None:
+        if overflow not in ("block", "shed"):
+            raise ValueError(f"Unknown overflow policy: {overflow}")
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.overflow = overflow
+        self._queues: OrderedDict = OrderedDict()  # query_id → deque[_Entry]
+        self._queued = 0
+        self._running = 0
+        self._in_use: Counter = Counter()  # resource_key → running calls
+        self._space_waiters: deque = deque()
+        self.shed = 0
+
+    @property
+    def queued(self) -> int:
+        return self._queued
+
+    @property
+    def running(self) -> int:
+        return self._running
+
+    async def submit(
+        self,
+        query_id: Hashable,
+        resources: Iterable[Tuple[Hashable, int]],
+        call: Callable[[], Awaitable],
+    ):
+        """
+        Runs `call()` once a global slot and a slot on every `(resource_key, limit)` pair
+        are free, and returns its result.
+        """
+        loop = asyncio.get_running_loop()
+        while self._queued >= self.max_queue:
+            if self.overflow == "shed":
+                self.shed += 1
+                raise SchedulerOverloaded(
+                    f"Task queue is full ({self.max_queue} waiting)"
+                )
+            waiter = loop.create_future()
+            self._space_waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                # Pass a wake-up we can no longer use on to the next submitter.
+                if waiter.done() and not waiter.cancelled():
+                    self._wake_submitter()
+                raise
+
+        entry = _Entry(tuple(resources), loop.create_future())
+        self._queues.setdefault(query_id, deque()).append(entry)
+        self._queued += 1
+        self._pump()
+
+        try:
+            await entry.granted
+        except asyncio.CancelledError:
+            if entry.granted.done() and not entry.granted.cancelled():
+                self._release(entry)
+            else:
+                self._dequeue(query_id, entry)
+            raise
+
+        try:
+            return await call()
+        finally:
+            self._release(entry)
+
+    def _fits(self, entry: _Entry) -> bool:
+        return all(
+            limit is None or self._in_use[key] < limit for key, limit in entry.resources
+        )
+
+    def _pump(self) -> None:
+        while self._running < self.max_concurrency:
+            for query_id, queue in self._queues.items():
+                if self._fits(queue[0]):
+                    break
+            else:
+                return
+
+            entry = queue.popleft()
+            if queue:
+                self._queues.move_to_end(query_id)
+            else:
+                del self._queues[query_id]
+            self._queued -= 1
+            if entry.granted.done():
+                # The submitter was cancelled while waiting.
+                self._wake_submitter()
+                continue
+            self._running += 1
+            for key, _ in entry.resources:
+                self._in_use[key] += 1
+            entry.granted.set_result(None)
+            self._wake_submitter()
+
+    def _release(self, entry: _Entry) -> None:
+        self._running -= 1
+        for key, _ in entry.resources:
+            self._in_use[key] -= 1
+            if not self._in_use[key]:
+                del self._in_use[key]
+        self._pump()
+
+    def _dequeue(self, query_id: Hashable, entry: _Entry) -> None:
+        queue = self._queues.get(query_id)
+        if queue is None or entry not in queue:
+            return
+        queue.remove(entry)
+        if not queue:
+            del self._queues[query_id]
+        self._queued -= 1
+        self._wake_submitter()
+        self._pump()
+
+    def _wake_submitter(self) -> None:
+        while self._space_waiters:
+            waiter = self._space_waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+
+    def stats(self) -> Dict:
+        return {
+            "running": self._running,
+            "queued": self._queued,
+            "shed": self.shed,
+            "in_use": dict(self._in_use),
+        }
@@ -0,0 +1,150 @@
+import heapq
+import math
+import re
+from typing import Dict, Iterable, List, NamedTuple, Set
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    "a about all an and any are as at be by for from get in is it of on or the this "
+    "to with".split()
+)
+
+# Weight of a keyword match by the skill field it appears in.
+_FIELD_WEIGHTS = (
+    ("id", 3.0),
+    ("name", 3.0),
+    ("tags", 2.0),
+    ("description", 1.0),
+    ("examples", 0.5),
+)
+
+
+class SkillMatch(NamedTuple):
+    skill_id: str
+    card: dict  # the AgentCard declaring the skill
+    skill: dict  # the skill entry of that card
+    score: float  # keyword relevance; 0.0 for a search without keywords
+
+
+class SkillIndex:
+    """
+    Inverted index over the skills of a set of AgentCards, for finding candidate skills
+    without scanning every card.
+
+    Every skill is indexed under its `tags`, its input and output modes (the skill's
+    `inputModes`/`outputModes`, or the card's `defaultInputModes`/`defaultOutputModes`)
+    and the keywords of its id, name, tags, description and examples. `search`
+    intersects the posting sets of the requested tags and modes, smallest first, then
+    ranks the skills matching any keyword by a field-weighted TF-IDF score (id and name
+    matches count most, examples least). Without keywords, matches keep card load
+    order.
+    """
+
+    def __init__(self, cards: Iterable[dict] = ()) -> None:
+        self.entries: List[tuple] = []  # position → (card, skill)
+        self._tags: Dict[str, Set[int]] = {}
+        self._input_modes: Dict[str, Set[int]] = {}
+        self._output_modes: Dict[str, Set[int]] = {}
+        self._terms: Dict[str, Dict[int, float]] = {}  # keyword → position → weight
+        for card in cards:
+            self.add_card(card)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def add_card(self, card: dict) -> None:
+        default_input = card.get("defaultInputModes", ())
+        default_output = card.get("defaultOutputModes", ())
+        for skill in card.get("skills", []):
+            position = len(self.entries)
+            self.entries.append((card, skill))
+            for tag in skill.get("tags", ()):
+                self._tags.setdefault(tag.lower(), set()).add(position)
+            for mode in skill.get("inputModes", default_input):
+                self._input_modes.setdefault(mode, set()).add(position)
+            for mode in skill.get("outputModes", default_output):
+                self._output_modes.setdefault(mode, set()).add(position)
+            for term, weight in _skill_terms(skill).items():
+                self._terms.setdefault(term, {})[position] = weight
+
+    def search(
+        self,
+        keywords: str = "",
+        tags: Iterable[str] = (),
+        input_modes: Iterable[str] = (),
+        output_modes: Iterable[str] = (),
+        limit: int | None = 10,
+    ) -> List[SkillMatch]:
+        """
+        Returns skills that have every tag in `tags`, accept every mode in `input_modes`
+        and produce every mode in `output_modes`. With `keywords`, only skills matching
+        at least one of them are returned, best first. At most `limit` matches (None for
+        all).
+        """
+        postings = [self._tags.get(tag.lower(), set()) for tag in tags]
+        postings += [self._input_modes.get(mode, set()) for mode in input_modes]
+        postings += [self._output_modes.get(mode, set()) for mode in output_modes]
+        allowed = None
+        if postings:
+            postings.sort(key=len)
+            allowed = postings[0].intersection(*postings[1:])
+
+        terms = _tokenize(keywords)
+        if not terms:
+            if allowed is None:
+                positions = range(len(self.entries))[:limit]
+            elif limit is None:
+                positions = sorted(allowed)
+            else:
+                positions = heapq.nsmallest(limit, allowed)
+            return [self._match(position, 0.0) for position in positions]
+
+        scores: Dict[int, float] = {}
+        total = len(self.entries)
+        for term in set(terms):
+            weights = self._terms.get(term)
+            if not weights:
+                continue
+            idf = math.log(1 + total / len(weights))
+            if allowed is not None and len(allowed) < len(weights):
+                matched = ((p, weights[p]) for p in allowed if p in weights)
+            elif allowed is not None:
+                matched = ((p, w) for p, w in weights.items() if p in allowed)
+            else:
+                matched = weights.items()
+            for position, weight in matched:
+                scores[position] = scores.get(position, 0.0) + idf * weight
+
+        def rank(item):
+            position, score = item
+            return -score, position
+
+        if limit is None:
+            ranked = sorted(scores.items(), key=rank)
+        else:
+            ranked = heapq.nsmallest(limit, scores.items(), key=rank)
+        return [self._match(position, score) for position, score in ranked]
+
+    def _match(self, position: int, score: float) -> SkillMatch:
+        card, skill = self.entries[position]
+        return SkillMatch(skill["id"], card, skill, score)
+
+
+def _tokenize(text: str) -> List[str]:
+    return [t for t in _TOKEN.findall(text.lower()) if t not in _STOPWORDS]
+
+
+def _skill_terms(skill: dict) -> Dict[str, float]:
+    """
+    Returns the weight of each keyword of a skill: the sum of the weights of the fields
+    it appears in.
+    """
+    terms: Dict[str, float] = {}
+    for field, weight in _FIELD_WEIGHTS:
+        value = skill.get(field)
+        if not value:
+            continue
+        text = " ".join(value) if isinstance(value, list) else str(value)
+        for term in set(_TOKEN.findall(text.lower())) - _STOPWORDS:
+            terms[term] = terms.get(term, 0.0) + weight
+    return terms
@@ -1,10 +1,23 @@
 import asyncio
-import re
-import uuid
-from typing import List, Dict
+import math
+import time
+from collections import Counter, defaultdict
+from collections.abc import Mapping
+from contextlib import aclosing
+from dataclasses import replace
+from typing import AsyncIterable, AsyncIterator, Iterable, List, Dict
 from agent_registry import AgentRegistry
 
+from agents.bulk import BulkStats, MicroBatcher, QueryResult, run_bounded
+from agents.query_parser import DEFAULT_QUERY_PARSER, QueryParser
+from agents.retry import CircuitBreaker, LatencyWindow, RetryPolicy, call_with_retry
+from agents.scheduler import SchedulerOverloaded, TaskScheduler
+from agents.task_graph import GraphRun, Ref, TaskGraph
 from protocol.base_agent import BaseAgent
+from protocol.cache import ResultCache, canonical_key
+from protocol.deadline import Deadline, deadline_of, latest
+from protocol.messages import Response, Task, with_id
+from protocol.tracing import TRACER, new_trace_id, trace_id_of
 
 
 class SupervisorAgent:
@@ -14,142 +27,689 @@ class SupervisorAgent:
 
     This class supports basic NLP simulation, asynchronous task execution,
     error handling, and retry logic. Designed for PoC demonstration of A2A and MCP protocols.
+
+    Queries are planned as a TaskGraph (agents/task_graph.py) and run under one
+    Deadline each (`query_timeout`, see protocol/deadline.py). Tasks for the same agent
+    are sent as one JSON-RPC batch through the TaskScheduler (agents/scheduler.py),
+    with retries and circuit breaking per agents/retry.py; `page_size` bounds paginated
+    skills (protocol/pagination.py).
     """
 
-    def __init__(self, agent_registry: AgentRegistry) -> None:
+    def __init__(
+        self,
+        agent_registry: AgentRegistry,
+        scheduler: TaskScheduler | None = None,
+        default_retry_policy: RetryPolicy | None = None,
+        query_timeout: float | None = None,
+        page_size: int | None = None,
+    ) -> None:
         self.registry: AgentRegistry = agent_registry
+        self.query_timeout = query_timeout
+        self.page_size = page_size
+        self.scheduler: TaskScheduler = scheduler or TaskScheduler()
+        self.default_retry_policy: RetryPolicy = default_retry_policy or RetryPolicy()
+        self._retry_policies: Dict[str, RetryPolicy] = {}  # method_name → policy
+        self._policy_generation = getattr(agent_registry, "generation", None)
+        self._breakers: Dict[str, CircuitBreaker] = {}  # agent name → breaker
+        self._latencies = defaultdict(LatencyWindow)  # method_name → LatencyWindow
 
-    async def handle_query(self, query: str) -> List[Dict]:
+    async def handle_query(
+        self, query: str, timeout: float | None = None
+    ) -> List[Dict]:
         """
         Parses a natural language query, delegates tasks to appropriate agents asynchronously,
         and returns a list of JSON-RPC 2.0 compliant responses.
+
+        The query's trace id is also its scheduler query id and prefixes every task id.
+        Tasks still running after `timeout` seconds (default `query_timeout`) answer
+        with -32001 errors.
+        """
+        return (await self.handle_query_graph(query, timeout)).responses
+
+    async def handle_query_graph(
+        self, query: str, timeout: float | None = None
+    ) -> GraphRun:
+        """
+        Variant of `handle_query` that also returns the query's critical path: the
+        chain of dependent steps that finished last, with each step's start (seconds
+        after the query's tasks were first sent) and duration.
+
+        Steps without inputs are sent as one JSON-RPC batch per agent; steps that read
+        other steps' results are sent as soon as those results arrive.
         """
-        tasks = self.parse_query(query)
-        coroutines = [self.delegate_task(task) for task in tasks]
-        responses = await asyncio.gather(*coroutines)
-        return responses
+        start = time.perf_counter() if TRACER.enabled else None
+        trace_id = new_trace_id()
+        deadline = self._query_deadline(timeout)
+        graph = self.plan_query(query)
+        if start is not None:
+            TRACER.record("parse_query", start, trace_id=trace_id)
+        try:
+            run = await graph.run(
+                lambda tasks: self.delegate_tasks(tasks, query_id=trace_id),
+                trace_id,
+                deadline,
+                batch_key=lambda task: id(
+                    self.registry.find_agent_for_method(task["method"])
+                ),
+            )
+        except asyncio.CancelledError:
+            deadline.cancel()
+            raise
+        if start is not None:
+            for step in run.critical_path:
+                TRACER.observe(
+                    "critical_path", step["duration"], step["skill"], trace_id=trace_id
+                )
+            TRACER.record("query", start, trace_id=trace_id)
+        return run
+
+    async def delegate_tasks(
+        self,
+        tasks: List[Dict],
+        timeout: float | None = None,
+        query_id: str | None = None,
+    ) -> List[Dict]:
+        """
+        Groups tasks by the agent that resolves their method and sends each agent one
+        JSON-RPC batch. Responses are returned in task order.
+
+        Each send is admitted by the scheduler; `query_id` groups the sends of one query
+        for fair ordering. Load shed by the scheduler returns -32003 errors.
+        """
+        query_id = query_id or new_trace_id()
+        groups: List[tuple] = []  # (agent or None, [task])
+        by_agent: Dict[int, List[Dict]] = {}
+        for task in tasks:
+            agent = self.registry.find_agent_for_method(task["method"])
+            if agent is None:
+                groups.append((None, [task]))
+            elif id(agent) in by_agent:
+                by_agent[id(agent)].append(task)
+            else:
+                by_agent[id(agent)] = [task]
+                groups.append((agent, by_agent[id(agent)]))
+
+        async def call(agent, group: List[Dict]) -> List[Dict]:
+            if len(group) == 1:
+                return [await self.delegate_task(group[0], timeout=timeout)]
+            return await self.delegate_batch(agent, group, timeout=timeout)
 
-    def extract_company_name(self, query: str) -> str:
+        async def send(agent, group: List[Dict]) -> List[Dict]:
+            if agent is None:
+                return [await self.delegate_task(group[0], timeout=timeout)]
+            submitted = time.perf_counter() if TRACER.enabled else None
+            deadline = latest(deadline_of(task) for task in group)
+
+            def admitted():
+                if submitted is not None:
+                    method = group[0]["method"]
+                    TRACER.record(
+                        "queue_wait",
+                        submitted,
+                        skill=method if len(group) == 1 else "",
+                        agent=self._agent_name(method, agent),
+                        trace_id=trace_id_of(group[0]["id"]),
+                    )
+                return call(agent, group)
+
+            submission = self.scheduler.submit(
+                query_id, self._scheduler_resources(group), admitted
+            )
+            try:
+                if deadline is not None and deadline.bounded:
+                    # Waiting for admission counts against the query's deadline too.
+                    submission = asyncio.wait_for(submission, deadline.remaining())
+                return await submission
+            except SchedulerOverloaded as e:
+                message = f"Server overloaded: {e}"
+                return [_error(task["id"], -32003, message) for task in group]
+            except asyncio.TimeoutError:
+                return [_deadline_exceeded(task["id"]) for task in group]
+
+        results = await asyncio.gather(*(send(agent, group) for agent, group in groups))
+        responses = {}
+        for (_, group), group_responses in zip(groups, results):
+            for task, response in zip(group, group_responses):
+                responses[id(task)] = response
+        return [responses[id(task)] for task in tasks]
+
+    async def handle_query_stream(
+        self, query: str, timeout: float | None = None
+    ) -> AsyncIterator[Dict]:
         """
-        Naively extracts company name after 'news about' by taking the next two words.
-        Note: This is a placeholder and should be replaced with proper NLP.
+        Streaming variant of `handle_query` that yields each JSON-RPC response as soon as
+        its task finishes, in completion order.
+
+        Tasks for agents that advertise `capabilities.streaming` also yield partial
+        responses (`"final": false`) before their final response. Tasks are sent
+        individually rather than batched so one slow task never holds back another, and
+        only requested steps are yielded, not the steps that feed them.
+        Closing the generator early cancels outstanding tasks. `timeout` works as in
+        `handle_query`.
         """
-        words = query.lower().split()
-        if "news" in words and "about" in words:
+        query_id = new_trace_id()
+        deadline = self._query_deadline(timeout)
+        graph = self.plan_query(query)
+        requested = {f"{query_id}:{node.index}" for node in graph.requested}
+        queue: asyncio.Queue = asyncio.Queue()
+        done = object()
+
+        async def dispatch(tasks: List[Task]) -> List[Dict]:
+            (task,) = tasks
+            final = None
+
+            async def forward():
+                nonlocal final
+                async for message in self.delegate_task_stream(task):
+                    if message.get("final") is False:
+                        if task["id"] in requested:
+                            queue.put_nowait(message)
+                    else:
+                        final = message
+
+            try:
+                if self.registry.find_agent_for_method(task["method"]) is None:
+                    await forward()
+                else:
+                    resources = self._scheduler_resources([task])
+                    submission = self.scheduler.submit(query_id, resources, forward)
+                    if deadline.bounded:
+                        submission = asyncio.wait_for(submission, deadline.remaining())
+                    await submission
+            except SchedulerOverloaded as e:
+                final = _error(task["id"], -32003, f"Server overloaded: {e}")
+            except asyncio.TimeoutError:
+                final = _deadline_exceeded(task["id"])
+            if final is None:
+                final = _error(task["id"], -32000, "Stream ended without a response")
+            return [final]
+
+        async def run() -> None:
             try:
-                idx = words.index("about")
-                return " ".join(words[idx + 1 : idx + 3]).title()
-            except IndexError:
-                return ""
-        return ""
+                await graph.run(
+                    dispatch,
+                    query_id,
+                    deadline,
+                    on_response=lambda _, response: queue.put_nowait(response),
+                )
+            finally:
+                queue.put_nowait(done)
+
+        worker = asyncio.ensure_future(run())
+        finished = False
+        try:
+            while (message := await queue.get()) is not done:
+                yield message
+            finished = True
+            await worker  # surfaces errors from the run
+        finally:
+            if not finished:
+                deadline.cancel()
+            worker.cancel()
+            await asyncio.gather(worker, return_exceptions=True)
 
-    def extract_contact_name(self, query: str) -> str:
+    async def handle_queries(
+        self,
+        queries: Iterable[str] | AsyncIterable[str],
+        ordered: bool = True,
+        max_in_flight: int = 256,
+        dedup_entries: int = 65536,
+        stats: BulkStats | None = None,
+        timeout: float | None = None,
+    ) -> AsyncIterator[QueryResult]:
         """
-        Naively extracts contact name after 'crm history for' by taking the next two words.
-        Note: This is a placeholder and should be replaced with proper NLP.
+        Bulk variant of `handle_query` for large inputs, yielding one QueryResult per
+        query in input order, or in completion order when `ordered` is False.
+
+        `queries` (a sync or async iterable) is read lazily and at most `max_in_flight`
+        queries are outstanding or waiting to be yielded, so memory stays flat however
+        long the input is. Identical (method, params) tasks across queries run once:
+        duplicates join the in-flight call or reuse one of the last `dedup_entries`
+        successful results. Error responses are never reused. Tasks from concurrent
+        queries are micro-batched into one JSON-RPC batch per agent.
+
+        Pass a BulkStats to read the task counts and throughput after the run. Each
+        query gets its own deadline, `timeout` seconds after it is admitted.
         """
-        words = query.lower().split()
-        if "crm" in words and "history" in words and "for" in words:
+        stats = stats if stats is not None else BulkStats()
+        stats.started = time.perf_counter()
+        results = ResultCache(max_entries=dedup_entries)
+        bulk_id = new_trace_id()
+        batcher = MicroBatcher(
+            lambda tasks: self.delegate_tasks(tasks, query_id=bulk_id)
+        )
+
+        async def dispatch(task: Dict) -> Dict:
+            stats.dispatched += 1
+            response = await batcher.submit(task)
+            if "error" in response:
+                raise _ErrorResponse(response)
+            return response
+
+        async def resolve(task: Dict) -> Dict:
+            key = canonical_key(task["method"], task["params"])
             try:
-                idx = words.index("for")
-                return " ".join(words[idx + 1 : idx + 3]).title()
-            except IndexError:
-                return ""
-        return ""
+                response = await results.get_or_call(
+                    key, math.inf, lambda: dispatch(task)
+                )
+            except _ErrorResponse as e:
+                response = e.response
+            return with_id(response, task["id"])
+
+        async def run(index: int, query: str) -> QueryResult:
+            stats.queries += 1
+            graph = self.plan_query(query)
+            stats.tasks += len(graph)
+            graph_run = await graph.run(
+                lambda tasks: asyncio.gather(*(resolve(task) for task in tasks)),
+                new_trace_id(),
+                self._query_deadline(timeout),
+            )
+            return QueryResult(index, query, graph_run.responses)
+
+        try:
+            async with aclosing(
+                run_bounded(queries, run, ordered, max_in_flight)
+            ) as completed:
+                async for result in completed:
+                    yield result
+        finally:
+            stats.finished = time.perf_counter()
+
+    def _query_deadline(self, timeout: float | None) -> Deadline:
+        return Deadline.after(self.query_timeout if timeout is None else timeout)
+
+    def _scheduler_resources(self, tasks: List[Dict]) -> List[tuple]:
+        """
+        Returns the (resource_key, limit) pairs a send to one agent must acquire: the
+        agent itself and each distinct skill, with limits taken from the AgentCard.
+        Card and skill limits apply to each of the card's replicas.
+        """
+        resources = []
+        for method in dict.fromkeys(task["method"] for task in tasks):
+            card = self.registry.find_card_for_method(method)
+            if card is None:
+                continue
+            replicas = card.get("replicas", 1)
+            agent_resource = ("agent", card["name"])
+            if agent_resource not in (key for key, _ in resources):
+                limit = card.get("limits", {}).get("maxConcurrency")
+                resources.append((agent_resource, _per_replica(limit, replicas)))
+            skill = self.registry.find_skill_for_method(method) or {}
+            limit = skill.get("limits", {}).get("maxConcurrency")
+            resources.append((("skill", method), _per_replica(limit, replicas)))
+        return resources
 
     # NOTE:
     # This rule-based parser simulates basic NLP functionality by extracting intents
-    # and simple entities (company, contact) using regex patterns. In a production
-    # environment, this would be replaced with proper NLU tooling (e.g., spaCy, LLMs)
-    # capable of multi-intent detection and Named Entity Recognition.
+    # and simple entities (company, contact) using trigger patterns compiled from the
+    # AgentCards (see agents/query_parser.py). In a production environment, this would
+    # be replaced with proper NLU tooling (e.g., spaCy, LLMs) capable of multi-intent
+    # detection and Named Entity Recognition.
     #
     # TODO:
-    # - Replace regex with spaCy or a lightweight intent + NER model.
-    # - Improve intent mapping with configurable patterns or ML-based classifier.
+    # - Replace trigger patterns with spaCy or a lightweight intent + NER model.
     # - Add fallback and clarification mechanism for ambiguous queries.
-    def parse_query(self, query: str) -> List[Dict]:
+    def parse_query(
+        self,
+        query: str,
+        trace_id: str | None = None,
+        deadline: Deadline | None = None,
+    ) -> List[Task]:
         """
-        Parses a natural language query into one or more JSON-RPC 2.0 task objects.
+        Parses a natural language query into one or more JSON-RPC 2.0 `Task` objects.
         This is a minimal simulation of NLP, suitable for PoC.
+
+        Returns the steps of `plan_query` in dependency order. Task ids are
+        `<trace_id>:<index>`, with a new trace id unless one is given, and every task
+        shares `deadline`. A param read from another step's result is
+        `{"$ref": <task id>, "field": <field>}`.
         """
-        query = re.sub(r"[^\w\s]", "", query)
-        tasks = []
-
-        if "news about" in query.lower():
-            company = self.extract_company_name(query)
-            if company:
-                tasks.append(
-                    {
-                        "jsonrpc": "2.0",
-                        "method": "get_company_news",
-                        "params": {"company_name": company},
-                        "id": str(uuid.uuid4()),
-                    }
-                )
+        steps = self._query_parser().parse(query)
+        if not steps:
+            return []
+        trace_id = trace_id or new_trace_id()
+        if any(type(value) is Ref for _, params in steps for value in params.values()):
+            return self._plan(steps).tasks(trace_id, deadline)
+        # Without chained steps the graph would be the steps in order; skip building it.
+        return [
+            Task(method, self._page_params(method, params), f"{trace_id}:{i}", deadline)
+            for i, (method, params) in enumerate(steps)
+        ]
 
-        if "crm history for" in query.lower():
-            contact = self.extract_contact_name(query)
-            if contact:
-                tasks.append(
-                    {
-                        "jsonrpc": "2.0",
-                        "method": "get_crm_history",
-                        "params": {"contact_name": contact},
-                        "id": str(uuid.uuid4()),
-                    }
-                )
+    def plan_query(self, query: str) -> TaskGraph:
+        """
+        Parses a query into a TaskGraph.
 
-        return tasks
+        Uses the QueryParser the registry compiled from its AgentCards, or the built-in
+        patterns when the cards declare none. Paginated skills get `page_size` as their
+        `"limit"`.
+        """
+        return self._plan(self._query_parser().parse(query))
+
+    def _query_parser(self) -> QueryParser:
+        parser = getattr(self.registry, "query_parser", None)
+        return parser if isinstance(parser, QueryParser) else DEFAULT_QUERY_PARSER
+
+    def _plan(self, steps: List[tuple]) -> TaskGraph:
+        graph = TaskGraph()
+        for method, params in steps:
+            graph.add(method, params)
+        if self.page_size is not None:
+            for node in graph:
+                node.params = self._page_params(node.method, node.params)
+        return graph
 
-    async def delegate_task(self, task: Dict, timeout: float = 3.0) -> Dict:
+    def _page_params(self, method: str, params: Dict) -> Dict:
+        if self.page_size is None or "limit" in params:
+            return params
+        skill = self.registry.find_skill_for_method(method)
+        if not skill or "pagination" not in skill:
+            return params
+        return {**params, "limit": self.page_size}
+
+    async def delegate_task(self, task: Dict, timeout: float | None = None) -> Dict:
         """
         Finds the agent that supports the given method and simulates an async JSON-RPC call.
-        Includes timeout and retry handling.
+        Timeouts, retries, backoff, hedging and circuit breaking follow the skill's retry
+        policy; `timeout` overrides the policy's per-attempt timeout. Attempts never
+        outlast the task's deadline.
         """
-        agent: BaseAgent | None = self.registry.find_agent_for_method(task["method"])
+        method = task["method"]
+        deadline = deadline_of(task)
+        start = time.perf_counter() if TRACER.enabled else None
+        agent: BaseAgent | None = self.registry.find_agent_for_method(method)
+        if start is not None:
+            # Unroutable method names would each add a histogram; pool them.
+            skill = method if agent else "unknown"
+            trace_id = trace_id_of(task["id"])
+            TRACER.record("find_agent", start, skill=skill, trace_id=trace_id)
         if not agent:
-            return {
-                "jsonrpc": "2.0",
-                "error": {
-                    "code": -32601,
-                    "message": f"Method {task['method']} not found",
-                },
-                "id": task["id"],
-            }
+            return _error(task["id"], -32601, f"Method {task['method']} not found")
+
+        agent_name = self._agent_name(method, agent)
+        attempts = 0
 
         async def attempt():
+            nonlocal attempts
+            attempts += 1
+            began = time.perf_counter() if TRACER.enabled else None
+            if began is not None and attempts > 1:
+                TRACER.count("retries_total", method, agent_name)
+            target = self._pick_agent([task], agent)
             try:
-                return await agent.handle_rpc(task)
+                return await target.handle_rpc(task)
             except Exception as e:
-                return {
-                    "jsonrpc": "2.0",
-                    "error": {
-                        "code": -32000,
-                        "message": str(e),
-                    },
-                    "id": task["id"],
-                }
-
-        for attempt_count in range(2):  # Initial + one retry
+                return _error(task["id"], -32000, str(e))
+            finally:
+                if began is not None:
+                    TRACER.record(
+                        "attempt", began, method, agent_name, trace_id_of(task["id"])
+                    )
+
+        def on_timeout(seconds: float) -> Dict:
+            if TRACER.enabled:
+                TRACER.count("timeouts_total", method, agent_name)
+            if deadline is not None and deadline.expired():
+                return _deadline_exceeded(task["id"])
+            return _error(task["id"], -32001, f"Timeout after {seconds} seconds")
+
+        def on_circuit_open() -> Dict:
+            if TRACER.enabled:
+                TRACER.count("circuit_open_total", method, agent_name)
+            return _error(task["id"], -32004, f"Circuit open for agent {agent_name}")
+
+        response = await call_with_retry(
+            attempt,
+            self.retry_policy_for(method, timeout),
+            failure_codes=lambda response: _error_codes([response]),
+            on_timeout=on_timeout,
+            on_circuit_open=on_circuit_open,
+            breaker=self.circuit_breaker_for(method, agent),
+            latencies=self._latencies[method],
+            deadline=deadline,
+        )
+        if start is not None:
+            TRACER.record(
+                "delegate_task", start, method, agent_name, trace_id_of(task["id"])
+            )
+        return response
+
+    async def delegate_batch(
+        self, agent: BaseAgent, tasks: List[Dict], timeout: float | None = None
+    ) -> List[Dict]:
+        """
+        Sends tasks to one agent as a JSON-RPC 2.0 batch array and matches the responses
+        back to tasks by id. Retries follow the first task's retry policy and only
+        resend the tasks whose responses carry a retryable error, within the latest
+        deadline of the tasks (the agent enforces each task's own deadline).
+
+        Tasks sharing a non-null id cannot be told apart in the agent's replies; they
+        are not sent and get -32600. Several tasks with id None (notifications) are
+        sent one per batch instead.
+        """
+        counts = Counter(task["id"] for task in tasks)
+        repeated = {i for i, n in counts.items() if n > 1 and i is not None}
+        if repeated or counts[None] > 1:
+            alone = [t for t in tasks if t["id"] is None]
+            batched = [
+                t for t in tasks if t["id"] is not None and t["id"] not in repeated
+            ]
+            replies = await asyncio.gather(
+                self.delegate_batch(agent, batched, timeout)
+                if batched
+                else _no_replies(),
+                *(self.delegate_batch(agent, [task], timeout) for task in alone),
+            )
+            sent = iter(replies[0])
+            sent_alone = iter(reply for (reply,) in replies[1:])
+            return [
+                next(sent_alone)
+                if task["id"] is None
+                else _error(task["id"], -32600, "Duplicate request id in batch")
+                if task["id"] in repeated
+                else next(sent)
+                for task in tasks
+            ]
+
+        method = tasks[0]["method"]
+        deadline = latest(deadline_of(task) for task in tasks)
+        policy = self.retry_policy_for(method, timeout)
+        responses = {task["id"]: None for task in tasks}
+        pending = list(tasks)
+        agent_name = self._agent_name(method, agent)
+        skill = method if all(task["method"] == method for task in tasks) else ""
+        trace_id = trace_id_of(tasks[0]["id"])
+        attempts = 0
+
+        async def attempt():
+            nonlocal pending, attempts
+            batch = pending
+            attempts += 1
+            began = time.perf_counter() if TRACER.enabled else None
+            if began is not None and attempts > 1:
+                TRACER.count("retries_total", skill, agent_name, n=len(batch))
             try:
-                return await asyncio.wait_for(attempt(), timeout=timeout)
-            except asyncio.TimeoutError:
-                if attempt_count == 1:
-                    return {
-                        "jsonrpc": "2.0",
-                        "error": {
-                            "code": -32001,
-                            "message": f"Timeout after {timeout} seconds",
-                        },
-                        "id": task["id"],
-                    }
-
-        # Safety fallback (should never happen)
-        return {
-            "jsonrpc": "2.0",
-            "error": {
-                "code": -32002,
-                "message": "Unexpected error: task handling failed without timeout",
-            },
-            "id": task["id"],
-        }
+                replies = await self._pick_agent(batch, agent).handle_rpc(batch)
+            except Exception as e:
+                replies = [_error(task["id"], -32000, str(e)) for task in batch]
+            else:
+                replies = _match_batch_replies(batch, replies)
+            finally:
+                if began is not None:
+                    TRACER.record("batch_attempt", began, skill, agent_name, trace_id)
+            for task, reply in zip(batch, replies):
+                responses[task["id"]] = reply
+            pending = [
+                task
+                for task, reply in zip(batch, replies)
+                if _error_codes([reply]) & policy.retry_on
+            ]
+            return [responses[task["id"]] for task in tasks]
+
+        def on_timeout(seconds: float) -> List[Dict]:
+            if TRACER.enabled:
+                TRACER.count("timeouts_total", skill, agent_name, n=len(pending))
+            for task in pending:
+                if deadline is not None and deadline.expired():
+                    responses[task["id"]] = _deadline_exceeded(task["id"])
+                else:
+                    message = f"Timeout after {seconds} seconds"
+                    responses[task["id"]] = _error(task["id"], -32001, message)
+            return [responses[task["id"]] for task in tasks]
+
+        def on_circuit_open() -> List[Dict]:
+            if TRACER.enabled:
+                TRACER.count("circuit_open_total", skill, agent_name, n=len(pending))
+            message = f"Circuit open for agent {agent_name}"
+            for task in pending:
+                responses[task["id"]] = _error(task["id"], -32004, message)
+            return [responses[task["id"]] for task in tasks]
+
+        return await call_with_retry(
+            attempt,
+            policy,
+            failure_codes=lambda _: _error_codes(responses[t["id"]] for t in pending),
+            on_timeout=on_timeout,
+            on_circuit_open=on_circuit_open,
+            breaker=self.circuit_breaker_for(method, agent),
+            latencies=self._latencies[method],
+            deadline=deadline,
+        )
+
+    def _pick_agent(self, tasks: List[Dict], agent):
+        """
+        Returns the agent to send `tasks` to right now. For a replicated skill the
+        registry picks a replica per call, so choosing at send time (rather than when
+        the task was grouped or first tried) routes every attempt and hedge by the
+        replicas' current load. Mixed-skill batches stay on `agent`.
+        """
+        method = tasks[0]["method"]
+        if all(task["method"] == method for task in tasks):
+            return self.registry.find_agent_for_method(method) or agent
+        return agent
+
+    def retry_policy_for(
+        self, method: str, timeout: float | None = None
+    ) -> RetryPolicy:
+        """
+        Returns the retry policy for a skill: the supervisor default, overridden by the
+        AgentCard's `retryPolicy` and then the skill's own `retryPolicy`.
+        """
+        generation = getattr(self.registry, "generation", None)
+        if generation != self._policy_generation:
+            # The registry reloaded its cards; policies are rebuilt from the new ones.
+            self._retry_policies.clear()
+            self._policy_generation = generation
+        policy = self._retry_policies.get(method)
+        if policy is None:
+            policy = self.default_retry_policy
+            card = self.registry.find_card_for_method(method) or {}
+            skill = self.registry.find_skill_for_method(method) or {}
+            for config in (card.get("retryPolicy"), skill.get("retryPolicy")):
+                if config:
+                    policy = RetryPolicy.from_config(config, base=policy)
+            self._retry_policies[method] = policy
+        if timeout is not None:
+            policy = replace(policy, attempt_timeout=timeout)
+        return policy
+
+    def circuit_breaker_for(self, method: str, agent) -> CircuitBreaker:
+        """
+        Returns the circuit breaker shared by every skill of the agent serving `method`.
+        """
+        name = self._agent_name(method, agent)
+        breaker = self._breakers.get(name)
+        if breaker is None:
+            card = self.registry.find_card_for_method(method) or {}
+            breaker = CircuitBreaker.from_config(card.get("circuitBreaker", {}))
+            self._breakers[name] = breaker
+        return breaker
+
+    def _agent_name(self, method: str, agent) -> str:
+        card = self.registry.find_card_for_method(method)
+        return card["name"] if card else f"{type(agent).__name__}@{id(agent):x}"
+
+    async def delegate_task_stream(
+        self, task: Dict, timeout: float | None = None
+    ) -> AsyncIterator[Dict]:
+        """
+        Streams the responses for one task from an agent that advertises streaming.
+
+        `timeout` bounds the wait for each message rather than the whole stream. Partial
+        results cannot be taken back, so streamed tasks are not retried; agents without
+        streaming fall back to `delegate_task` and yield a single response.
+        """
+        agent: BaseAgent | None = self.registry.find_agent_for_method(task["method"])
+        card = self.registry.find_card_for_method(task["method"]) or {}
+        if agent is None or not card.get("capabilities", {}).get("streaming"):
+            yield await self.delegate_task(task, timeout=timeout)
+            return
+
+        timeout = timeout or self.retry_policy_for(task["method"]).attempt_timeout
+        deadline = deadline_of(task)
+        stream = agent.handle_rpc_stream(task)
+        try:
+            while True:
+                try:
+                    wait = timeout
+                    if deadline is not None:
+                        wait = min(wait, deadline.remaining())
+                    message = await asyncio.wait_for(anext(stream), timeout=wait)
+                except StopAsyncIteration:
+                    return
+                except asyncio.TimeoutError:
+                    if deadline is not None and deadline.expired():
+                        yield _deadline_exceeded(task["id"])
+                    else:
+                        message = f"Timeout after {timeout} seconds"
+                        yield _error(task["id"], -32001, message)
+                    return
+                except Exception as e:
+                    yield _error(task["id"], -32000, str(e))
+                    return
+                yield message
+        finally:
+            await stream.aclose()
+
+
+class _ErrorResponse(Exception):
+    """
+    Carries an error response out of a deduplicated call so it is not kept for reuse.
+    """
+
+    def __init__(self, response: Dict):
+        super().__init__(response["error"]["message"])
+        self.response = response
+
+
+def _error_codes(responses) -> set:
+    return {r["error"]["code"] for r in responses if r and "error" in r}
+
+
+def _match_batch_replies(tasks: List[Dict], replies) -> List[Dict]:
+    if isinstance(replies, Mapping):
+        # The agent rejected the whole batch with a single error object.
+        return [with_id(replies, task["id"]) for task in tasks]
+    by_id = {reply.get("id"): reply for reply in replies or []}
+    return [
+        by_id.get(task["id"])
+        or _error(task["id"], -32603, "No response for request in batch")
+        for task in tasks
+    ]
+
+
+def _per_replica(limit: int | None, replicas: int) -> int | None:
+    return None if limit is None else limit * replicas
+
+
+async def _no_replies() -> List[Dict]:
+    return []
+
+
+def _error(request_id, code: int, message: str) -> Response:
+    return Response.failure(request_id, code, message)
+
+
+def _deadline_exceeded(request_id) -> Response:
+    return Response.failure(request_id, -32001, "Deadline exceeded")
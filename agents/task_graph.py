@@ -0,0 +1,266 @@
+"""
+Query plans as dependency graphs of tasks.
+
+The SupervisorAgent turns a query's parsed steps into a TaskGraph. A step's params can
+read another step's result (`{"$ref": <task id>, "field": <field>}` on the wire), each
+step starts as soon as its inputs are ready, and identical steps run once.
+`SupervisorAgent.handle_query_graph` also returns the query's critical path, which
+tracing records as `critical_path` spans per skill.
+"""
+
+import asyncio
+import time
+from collections.abc import Mapping
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, NamedTuple
+
+from protocol.cache import canonical_key
+from protocol.deadline import Deadline
+from protocol.messages import Response, Task
+
+
+class Ref(NamedTuple):
+    """
+    A task param that takes its value from another step's result: `field` (a dotted
+    path such as "company" or "articles.0.title") of the result of calling `method`
+    with `params`.
+    """
+
+    method: str
+    params: Dict
+    field: str
+
+
+class TaskNode:
+    """
+    One step of a TaskGraph. `inputs` maps each param filled from another step to that
+    step's node and the field of its result.
+    """
+
+    __slots__ = ("index", "method", "params", "inputs", "requested")
+
+    def __init__(self, index: int, method: str, params: Dict, inputs: Dict) -> None:
+        self.index = index
+        self.method = method
+        self.params = params
+        self.inputs: Dict[str, tuple] = inputs  # param → (TaskNode, field)
+        self.requested = False
+
+    def ref(self, field: str) -> Ref:
+        """
+        Returns a Ref to `field` of this step's result, for use in another step's params.
+        """
+        return Ref(self.method, self.params, field)
+
+
+class GraphRun(NamedTuple):
+    responses: List[Dict]  # one per requested step, in request order
+    critical_path: List[Dict]  # steps of the longest dependency chain, first to last
+
+
+class TaskGraph:
+    """
+    A query's tasks as a dependency graph.
+
+    Steps are added with `add(method, params)`, where a param value may be a `Ref` to
+    another step's result; the referenced step is added too (as an internal step unless
+    it is also requested). Identical steps, compared by method and canonical params,
+    are one node, so a subtask shared by several steps runs once. Nodes are kept in
+    dependency order and cannot form cycles.
+
+    `run` starts every step the moment its inputs are ready: steps without inputs all
+    start at once, and each dependent step starts when the last step it reads from
+    answers, so independent branches overlap. A step whose input failed, or lacks the
+    referenced field, answers with an error without being sent.
+    """
+
+    def __init__(self) -> None:
+        self.nodes: List[TaskNode] = []
+        self.requested: List[TaskNode] = []
+        self._by_key: Dict[Hashable, TaskNode] = {}
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def __iter__(self):
+        return iter(self.nodes)
+
+    def add(self, method: str, params: Dict, requested: bool = True) -> TaskNode:
+        """
+        Adds a step (or finds the identical one already added) and returns its node.
+        """
+        inputs = {}
+        for name, value in params.items():
+            if type(value) is Ref:
+                source = self.add(value.method, value.params, requested=False)
+                inputs[name] = (source, value.field)
+        if inputs:
+            key_params = dict(params)
+            for name, (source, field) in inputs.items():
+                key_params[name] = ("$ref", source.index, field)
+            key = _step_key(method, key_params)
+        else:
+            key = _step_key(method, params)
+        node = self._by_key.get(key)
+        if node is None:
+            node = TaskNode(len(self.nodes), method, params, inputs)
+            self.nodes.append(node)
+            self._by_key[key] = node
+        if requested and not node.requested:
+            node.requested = True
+            self.requested.append(node)
+        return node
+
+    def tasks(self, trace_id: str, deadline: Deadline | None = None) -> List[Task]:
+        """
+        Returns every step as a Task with id `<trace_id>:<index>`, in dependency order.
+        Params filled from another step read `{"$ref": <task id>, "field": <field>}`.
+        """
+        tasks = []
+        for node in self.nodes:
+            params = node.params
+            if node.inputs:
+                params = dict(params)
+                for name, (source, field) in node.inputs.items():
+                    params[name] = {"$ref": f"{trace_id}:{source.index}", "field": field}
+            tasks.append(Task(node.method, params, f"{trace_id}:{node.index}", deadline))
+        return tasks
+
+    async def run(
+        self,
+        dispatch: Callable[[List[Task]], Awaitable[List[Dict]]],
+        trace_id: str,
+        deadline: Deadline | None = None,
+        batch_key: Callable[[Task], Hashable] | None = None,
+        on_response: Callable[[TaskNode, Dict], Any] | None = None,
+    ) -> GraphRun:
+        """
+        Runs every step through `dispatch`, which takes a list of Tasks and returns their
+        responses in order. Steps without inputs that share a `batch_key` are sent in
+        one `dispatch` call (without `batch_key`, each step is sent on its own); steps
+        that other steps read from, and steps with inputs, are sent on their own, the
+        latter once their inputs are ready.
+
+        `on_response` is called with each requested step's response as it arrives.
+        Cancelling the run cancels every outstanding dispatch.
+        """
+        loop = asyncio.get_running_loop()
+        replies = [loop.create_future() for _ in self.nodes]
+        started = [0.0] * len(self.nodes)
+        finished = [0.0] * len(self.nodes)
+        began = time.perf_counter()
+
+        def answer(node: TaskNode, response: Dict) -> None:
+            finished[node.index] = time.perf_counter()
+            replies[node.index].set_result(response)
+            if on_response is not None and node.requested:
+                on_response(node, response)
+
+        async def send(nodes: List[TaskNode], tasks: List[Task]) -> None:
+            now = time.perf_counter()
+            for node in nodes:
+                started[node.index] = now
+            try:
+                responses = await dispatch(tasks)
+            except Exception as e:
+                responses = [Response.failure(t["id"], -32000, str(e)) for t in tasks]
+            for node, response in zip(nodes, responses):
+                answer(node, response)
+
+        async def run_dependent(node: TaskNode) -> None:
+            task_id = f"{trace_id}:{node.index}"
+            params = dict(node.params)
+            for name, (source, field) in node.inputs.items():
+                response = await replies[source.index]
+                source_id = f"{trace_id}:{source.index}"
+                if "error" in response:
+                    message = response["error"].get("message", "")
+                    failure = Response.failure(
+                        task_id, -32000, f"Dependency {source_id} failed: {message}"
+                    )
+                    started[node.index] = time.perf_counter()
+                    return answer(node, failure)
+                try:
+                    params[name] = _lookup(response["result"], field)
+                except (KeyError, IndexError, TypeError, ValueError):
+                    failure = Response.failure(
+                        task_id,
+                        -32602,
+                        f"Invalid params: the result of {source_id} has no '{field}'",
+                    )
+                    started[node.index] = time.perf_counter()
+                    return answer(node, failure)
+            await send([node], [Task(node.method, params, task_id, deadline)])
+
+        # A step other steps read from is sent alone, so a slower batch member never
+        # holds back its dependents.
+        feeding = {
+            source.index for node in self.nodes for source, _ in node.inputs.values()
+        }
+        groups: Dict[Hashable, List[TaskNode]] = {}
+        runners = []
+        for node in self.nodes:
+            if node.inputs:
+                runners.append(run_dependent(node))
+            elif batch_key is None or node.index in feeding:
+                groups[("node", node.index)] = [node]
+            else:
+                task = Task(node.method, node.params, f"{trace_id}:{node.index}", deadline)
+                groups.setdefault(batch_key(task), []).append(node)
+        for nodes in groups.values():
+            tasks = [
+                Task(n.method, n.params, f"{trace_id}:{n.index}", deadline)
+                for n in nodes
+            ]
+            runners.append(send(nodes, tasks))
+
+        runners = [asyncio.ensure_future(runner) for runner in runners]
+        try:
+            await asyncio.gather(*runners)
+        finally:
+            for runner in runners:
+                runner.cancel()
+
+        responses = [replies[node.index].result() for node in self.requested]
+        return GraphRun(responses, self._critical_path(trace_id, began, started, finished))
+
+    def _critical_path(
+        self, trace_id: str, began: float, started: List[float], finished: List[float]
+    ) -> List[Dict]:
+        """
+        Walks back from the step that finished last through the input that finished
+        last, which is the chain of steps that bounded the query's latency.
+        """
+        if not self.nodes:
+            return []
+        node = max(self.requested or self.nodes, key=lambda n: finished[n.index])
+        path = []
+        while node is not None:
+            path.append(
+                {
+                    "id": f"{trace_id}:{node.index}",
+                    "skill": node.method,
+                    "start": started[node.index] - began,
+                    "duration": finished[node.index] - started[node.index],
+                }
+            )
+            sources = [source for source, _ in node.inputs.values()]
+            node = max(sources, key=lambda n: finished[n.index]) if sources else None
+        path.reverse()
+        return path
+
+
+def _step_key(method: str, params: Dict) -> Hashable:
+    try:
+        return method, frozenset(params.items())
+    except TypeError:  # unhashable param values
+        return canonical_key(method, params)
+
+
+def _lookup(result: Any, field: str) -> Any:
+    value = result
+    for part in field.split("."):
+        if isinstance(value, Mapping):
+            value = value[part]
+        else:
+            value = value[int(part)]
+    return value
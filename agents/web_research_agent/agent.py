@@ -1,4 +1,5 @@
 from protocol.base_agent import BaseAgent
+from protocol.pagination import Page, aclose, read_page
 from .tools import fetch_mock_articles
 
 
@@ -7,7 +8,8 @@ class WebResearchAgent(BaseAgent):
     Specialized agent for handling web-based research tasks.
 
     This agent supports the 'get_company_news' method, which fetches simulated recent news articles
-    for a specified company.
+    for a specified company, one page at a time. When streaming is enabled, articles are delivered
+    one at a time as the tool layer produces them.
     """
 
     def __init__(self):
@@ -16,18 +18,62 @@ class WebResearchAgent(BaseAgent):
     def get_supported_methods(self):
         return {"get_company_news": self.get_company_news}
 
-    def get_company_news(self, params: dict) -> dict:
+    def get_streaming_methods(self):
+        return {"get_company_news": self.stream_company_news}
+
+    async def get_company_news(self, params: dict) -> dict:
         """
         Handles the 'get_company_news' method.
 
-        Expects a 'company_name' parameter in the input dictionary.
-        Returns mock news article data for the specified company using the injected tool layer.
+        Expects a 'company_name' parameter in the input dictionary, plus the optional
+        'limit', 'cursor' and 'since' pagination parameters. Returns one page of news
+        articles, newest first, read lazily from the injected tool layer.
+
+        Raises:
+            ValueError: If 'company_name' is not provided or a pagination parameter is invalid.
+        """
+        company_name = params.get("company_name")
+        if not company_name:
+            raise ValueError("Missing 'company_name' parameter.")
+        page = Page.from_params(params, self.pagination.get("get_company_news"))
+        articles, next_cursor = await read_page(
+            self.tool_layer(company_name, since=page.since, offset=page.offset), page
+        )
+        return {"articles": articles, "next_cursor": next_cursor}
+
+    async def stream_company_news(self, params: dict):
+        """
+        Streaming variant of 'get_company_news' that yields one article per chunk. When
+        another page follows, a last chunk without articles carries its 'next_cursor'.
 
         Raises:
-            ValueError: If 'company_name' is not provided in params.
+            ValueError: If 'company_name' is not provided or a pagination parameter is invalid.
         """
         company_name = params.get("company_name")
         if not company_name:
             raise ValueError("Missing 'company_name' parameter.")
-        articles = self.tool_layer(company_name)
-        return {"articles": articles}
+        page = Page.from_params(params, self.pagination.get("get_company_news"))
+        articles = self.tool_layer(company_name, since=page.since, offset=page.offset)
+        count = 0
+        try:
+            async for article in articles:
+                if count == page.limit:
+                    yield {
+                        "company_name": company_name,
+                        "articles": [],
+                        "next_cursor": page.next_cursor(),
+                    }
+                    break
+                count += 1
+                yield {"company_name": company_name, "articles": [article]}
+        finally:
+            await aclose(articles)
+
+    def merge_stream_chunks(self, method: str, chunks: list):
+        # The same shape as get_company_news returns, even for a stream without chunks.
+        return {
+            "articles": [a for chunk in chunks for a in chunk.get("articles", ())],
+            "next_cursor": next(
+                (c["next_cursor"] for c in chunks if "next_cursor" in c), None
+            ),
+        }
@@ -1,21 +1,31 @@
-def fetch_mock_articles(company_name: str) -> dict:
+def fetch_mock_article_page(
+    company_name: str, offset: int, size: int | None, since: str | None = None
+) -> list[dict]:
     """
-    Simulates news article retrieval. Returns a JSON-RPC 2.0 response object.
+    Simulates one page request to the news API. Returns up to `size` of the company's
+    recent articles, newest first, starting `offset` articles into those published on
+    or after `since`.
     """
-    return {
-        "jsonrpc": "2.0",
-        "result": {
-            "company_name": company_name,
-            "articles": [
-                {
-                    "title": f"{company_name} announces new AI initiative",
-                    "date": "2025-06-01",
-                },
-                {
-                    "title": f"{company_name} Q2 earnings exceed expectations",
-                    "date": "2025-06-03",
-                },
-            ],
+    articles = [
+        {
+            "title": f"{company_name} Q2 earnings exceed expectations",
+            "date": "2025-06-03",
         },
-        "id": "mock-id",
-    }
+        {
+            "title": f"{company_name} announces new AI initiative",
+            "date": "2025-06-01",
+        },
+    ]
+    articles = [a for a in articles if since is None or a["date"] >= since]
+    return articles[offset:][:size]
+
+
+async def fetch_mock_articles(
+    company_name: str, since: str | None = None, offset: int = 0
+):
+    """
+    Simulates incremental news retrieval. Yields the company's recent articles newest
+    first, starting `offset` articles into those published on or after `since`.
+    """
+    for article in fetch_mock_article_page(company_name, offset, None, since):
+        yield article
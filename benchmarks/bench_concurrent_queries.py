@@ -0,0 +1,74 @@
+"""
+Benchmark: N concurrent supervisor queries against blocking tool layers.
+
+Each tool call sleeps for TOOL_LATENCY seconds to simulate a slow HTTP/CRM backend.
+The tool layers are async iterators, so the blocking backend call runs on the agent's
+executor. With the AgentCards' `limits` lifted, N concurrent queries finish in about
+the time of one. With the card limits in force, the scheduler admits at most
+`maxConcurrency` calls per agent and skill (4 for `get_crm_history`), so the queries
+run in waves of that size. That is the intended trade-off: the limits protect the
+backend at the cost of queueing.
+
+Run from the project root:
+
+    PYTHONPATH=. python benchmarks/bench_concurrent_queries.py
+"""
+
+import asyncio
+import time
+
+from agent_registry import AgentRegistry
+from agents.supervisor_agent import SupervisorAgent
+
+TOOL_LATENCY = 0.2
+CONCURRENT_QUERIES = 20
+QUERY = "Find recent company news about Acme Inc and pull CRM history for John Doe"
+
+
+def slow(tool_layer, executor):
+    async def wrapper(*args, **kwargs):
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(executor, time.sleep, TOOL_LATENCY)
+        async for item in tool_layer(*args, **kwargs):
+            yield item
+
+    return wrapper
+
+
+def build_supervisor(card_limits: bool) -> SupervisorAgent:
+    registry = AgentRegistry.from_card_paths(
+        [
+            "agent_cards/web_research_agent_card.json",
+            "agent_cards/crm_research_agent_card.json",
+        ]
+    )
+    for method in ("get_company_news", "get_crm_history"):
+        agent = registry.find_agent_for_method(method)
+        agent.tool_layer = slow(agent.tool_layer, agent.executor)
+        agent.cache = None  # measure the executor, not the result cache
+        if not card_limits:
+            registry.find_card_for_method(method).pop("limits", None)
+            registry.find_skill_for_method(method).pop("limits", None)
+    return SupervisorAgent(agent_registry=registry)
+
+
+async def timed(supervisor: SupervisorAgent, n: int) -> float:
+    start = time.perf_counter()
+    await asyncio.gather(*(supervisor.handle_query(QUERY) for _ in range(n)))
+    return time.perf_counter() - start
+
+
+async def main():
+    print(f"tool latency:          {TOOL_LATENCY * 1000:.0f} ms")
+    for label, card_limits in (("no card limits", False), ("card limits", True)):
+        supervisor = build_supervisor(card_limits)
+        single = await timed(supervisor, 1)
+        concurrent = await timed(supervisor, CONCURRENT_QUERIES)
+        print(f"{label}:")
+        print(f"  1 query:               {single * 1000:.1f} ms")
+        print(f"  {CONCURRENT_QUERIES} concurrent queries: {concurrent * 1000:.1f} ms")
+        print(f"  serial estimate:       {single * CONCURRENT_QUERIES * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
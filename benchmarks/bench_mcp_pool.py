@@ -0,0 +1,79 @@
+"""
+Benchmark: MCP tool calls through a warm pool of tool servers versus spawning a server
+per call.
+
+CALLS `crm_interactions` calls run CONCURRENCY at a time against the stand-in server
+(mock_mcp_server.py). "spawn per call" starts, initializes and stops a server for
+every call, the way a tool layer shelling out to the tool would; the pools keep their
+servers running and multiplex calls over them.
+
+    PYTHONPATH=. python benchmarks/bench_mcp_pool.py [calls] [concurrency]
+"""
+
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+from protocol.mcp import MCPToolPool
+
+SERVER = os.path.join(os.path.dirname(os.path.dirname(__file__)), "mock_mcp_server.py")
+COMMAND = ["python", SERVER]
+
+
+async def call_once(pool: MCPToolPool | None, contact: str) -> None:
+    arguments = {"contact_name": contact, "limit": 20}
+    if pool is not None:
+        await pool.call_tool("crm_interactions", arguments)
+        return
+    pool = MCPToolPool(COMMAND, size=1)
+    try:
+        await pool.call_tool("crm_interactions", arguments)
+    finally:
+        await pool.aclose()
+
+
+async def run(pool_size: int | None, calls: int, concurrency: int) -> dict:
+    pool = MCPToolPool(COMMAND, size=pool_size) if pool_size else None
+    if pool is not None:
+        await pool.call_tool("crm_interactions", {"contact_name": "warm-up"})
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def timed(i: int) -> None:
+        async with semaphore:
+            began = time.perf_counter()
+            await call_once(pool, f"Person {i}")
+            latencies.append(time.perf_counter() - began)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(timed(i) for i in range(calls)))
+    elapsed = time.perf_counter() - start
+    if pool is not None:
+        await pool.aclose()
+    return {
+        "calls/s": calls / elapsed,
+        "p50": statistics.median(latencies) * 1000,
+        "p99": statistics.quantiles(latencies, n=100)[98] * 1000,
+    }
+
+
+async def main() -> None:
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    print(f"{calls} tool calls, {concurrency} at a time, {os.cpu_count()} CPUs")
+    for name, pool_size in (
+        ("spawn per call", None),
+        ("pool of 1", 1),
+        ("pool of 4", 4),
+    ):
+        m = await run(pool_size, calls, concurrency)
+        print(
+            f"  {name:<15} {m['calls/s']:8.0f} calls/s"
+            f"  p50 {m['p50']:7.2f} ms  p99 {m['p99']:7.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
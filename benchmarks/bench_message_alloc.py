@@ -0,0 +1,102 @@
+"""
+Micro-benchmark: memory and build time of in-process JSON-RPC messages, before and
+after the compact `Task`/`Response` representation.
+
+"dicts" rebuilds what the pipeline used to allocate per task: a request dict with a
+`str(uuid.uuid4())` id and a response dict whose result nested the tool layer's own
+JSON-RPC envelope. "slotted" builds the same messages as `Task`/`Response` objects
+with counter-based ids and flat tool results. Peak traced memory comes from
+`tracemalloc`; build times are measured separately without tracing.
+
+    PYTHONPATH=. python benchmarks/bench_message_alloc.py [tasks]
+"""
+
+import sys
+import time
+import tracemalloc
+import uuid
+
+from protocol.messages import Response, Task
+from protocol.tracing import new_trace_id
+
+INTERACTIONS = [
+    {"date": "2025-05-20", "type": "email", "note": "Initial outreach"},
+    {"date": "2025-05-25", "type": "call", "note": "Follow-up on proposal"},
+]
+
+
+def build_dicts(n: int) -> list:
+    messages = []
+    for i in range(n):
+        params = {"contact_name": f"Contact {i}"}
+        task = {
+            "jsonrpc": "2.0",
+            "method": "get_crm_history",
+            "params": params,
+            "id": str(uuid.uuid4()),
+        }
+        history = {"contact_name": params["contact_name"], "interactions": INTERACTIONS}
+        tool_output = {"jsonrpc": "2.0", "result": history, "id": "mock-id"}
+        response = {"jsonrpc": "2.0", "result": tool_output, "id": task["id"]}
+        messages.append((task, response))
+    return messages
+
+
+def build_slotted(n: int) -> list:
+    messages = []
+    trace_id = new_trace_id()
+    for i in range(n):
+        params = {"contact_name": f"Contact {i}"}
+        task = Task("get_crm_history", params, f"{trace_id}:{i}")
+        result = {"contact": params["contact_name"], "interactions": INTERACTIONS}
+        messages.append((task, Response(task.id, result)))
+    return messages
+
+
+def peak_bytes(build, n: int) -> int:
+    tracemalloc.start()
+    messages = build(n)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del messages
+    return peak
+
+
+def build_seconds(build, n: int) -> float:
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        build(n)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def id_seconds(generate, n: int) -> float:
+    start = time.perf_counter()
+    for _ in range(n):
+        generate()
+    return (time.perf_counter() - start) / n
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    print(f"{n} tasks with one response each")
+    results = {}
+    for name, build in (("dicts", build_dicts), ("slotted", build_slotted)):
+        results[name] = (peak_bytes(build, n), build_seconds(build, n))
+        peak, seconds = results[name]
+        print(
+            f"  {name:<8} {peak / n:7.0f} B/task peak  "
+            f"{seconds / n * 1e6:6.2f} µs/task to build"
+        )
+    (old_peak, old_time), (new_peak, new_time) = results["dicts"], results["slotted"]
+    print(f"  memory  -{(1 - new_peak / old_peak) * 100:.0f}%")
+    print(f"  time    -{(1 - new_time / old_time) * 100:.0f}%")
+
+    print("id generation")
+    print(f"  uuid4      {id_seconds(lambda: str(uuid.uuid4()), n) * 1e9:6.0f} ns/id")
+    print(f"  trace id   {id_seconds(new_trace_id, n) * 1e9:6.0f} ns/id")
+
+
+if __name__ == "__main__":
+    main()
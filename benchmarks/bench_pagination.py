@@ -0,0 +1,76 @@
+"""
+Micro-benchmark: one page of a long CRM history versus the whole history.
+
+The CRM tool layer serves `interactions` interactions per contact from a paged backend
+(BACKEND_PAGE_SIZE items per backend request, BACKEND_PAGE_LATENCY seconds each).
+`get_crm_history` is called with no limit (the old whole-history behaviour) and with a
+page of PAGE_LIMIT; reports wall time, backend requests, interactions read and the
+encoded response size.
+
+    PYTHONPATH=. python benchmarks/bench_pagination.py [interactions]
+"""
+
+import asyncio
+import sys
+import time
+
+from agents.crm_research_agent.agent import CRMResearchAgent
+from protocol.messages import Response
+from protocol.serialization import DEFAULT_SERIALIZER
+
+BACKEND_PAGE_SIZE = 100
+BACKEND_PAGE_LATENCY = 0.002
+PAGE_LIMIT = 20
+
+
+class Backend:
+    def __init__(self, interactions: int):
+        self.history = [
+            {"date": f"2025-05-{i % 28 + 1:02d}", "type": "email", "note": f"Note {i}"}
+            for i in range(interactions)
+        ]
+        self.requests = 0
+        self.read = 0
+
+    async def interactions(self, contact_name, since=None, offset=0):
+        while offset < len(self.history):
+            await asyncio.sleep(BACKEND_PAGE_LATENCY)
+            self.requests += 1
+            page = self.history[offset : offset + BACKEND_PAGE_SIZE]
+            for interaction in page:
+                self.read += 1
+                yield interaction
+            offset += len(page)
+
+
+async def measure(interactions: int, limit: int | None) -> dict:
+    backend = Backend(interactions)
+    agent = CRMResearchAgent(tool_layer=backend.interactions)
+    params = {"contact_name": "Jane Smith"}
+    if limit is not None:
+        params["limit"] = limit
+    start = time.perf_counter()
+    result = await agent.get_crm_history(params)
+    elapsed = time.perf_counter() - start
+    encoded = DEFAULT_SERIALIZER.dumps(Response("t:0", result))
+    return {
+        "ms": elapsed * 1000,
+        "requests": backend.requests,
+        "read": backend.read,
+        "bytes": len(encoded),
+    }
+
+
+async def main() -> None:
+    interactions = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    print(f"{interactions} interactions, backend pages of {BACKEND_PAGE_SIZE}")
+    for name, limit in (("whole history", None), (f"limit={PAGE_LIMIT}", PAGE_LIMIT)):
+        m = await measure(interactions, limit)
+        print(
+            f"  {name:<14} {m['ms']:8.1f} ms  {m['requests']:4d} backend requests"
+            f"  {m['read']:6d} read  {m['bytes'] / 1024:8.1f} KiB"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
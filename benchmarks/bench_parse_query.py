@@ -0,0 +1,139 @@
+"""
+Micro-benchmark: SupervisorAgent.parse_query versus the original regex implementation.
+
+Both parsers run over the same generated corpus; the script first checks that they
+produce the same (method, params) pairs, then reports queries/sec for each.
+
+    PYTHONPATH=. python benchmarks/bench_parse_query.py [corpus_size]
+"""
+
+import random
+import re
+import sys
+import time
+import uuid
+
+from agent_registry import AgentRegistry
+from agents.supervisor_agent import SupervisorAgent
+
+COMPANIES = ["Acme Inc", "BoltAI", "Globex Corp", "Initech", "Umbrella Labs", "Tesla"]
+CONTACTS = ["John Doe", "Jane Smith", "Ada Lovelace", "Alan Turing", "Grace Hopper"]
+TEMPLATES = [
+    "Find recent company news about {company} and pull CRM history for {contact}",
+    "Get news about {company}.",
+    "Pull CRM history for {contact}!",
+    "Can you show me the crm history for {contact} and then any news about {company}?",
+    "Summarize what happened at {company} last quarter for our meeting with {contact}",
+    "Hello world",
+]
+
+
+def build_corpus(size: int, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    return [
+        rng.choice(TEMPLATES).format(
+            company=rng.choice(COMPANIES), contact=rng.choice(CONTACTS)
+        )
+        for _ in range(size)
+    ]
+
+
+class LegacyParser(SupervisorAgent):
+    """The parse_query implementation this benchmark replaces, kept for comparison."""
+
+    def parse_query(self, query):
+        query = re.sub(r"[^\w\s]", "", query)
+        tasks = []
+        if "news about" in query.lower():
+            company = self.extract_company_name(query)
+            if company:
+                tasks.append(
+                    {
+                        "jsonrpc": "2.0",
+                        "method": "get_company_news",
+                        "params": {"company_name": company},
+                        "id": str(uuid.uuid4()),
+                    }
+                )
+        if "crm history for" in query.lower():
+            contact = self.extract_contact_name(query)
+            if contact:
+                tasks.append(
+                    {
+                        "jsonrpc": "2.0",
+                        "method": "get_crm_history",
+                        "params": {"contact_name": contact},
+                        "id": str(uuid.uuid4()),
+                    }
+                )
+        return tasks
+
+    def extract_company_name(self, query: str) -> str:
+        """
+        Naively extracts company name after 'news about' by taking the next two words.
+        Note: This is a placeholder and should be replaced with proper NLP.
+        """
+        words = query.lower().split()
+        if "news" in words and "about" in words:
+            try:
+                idx = words.index("about")
+                return " ".join(words[idx + 1 : idx + 3]).title()
+            except IndexError:
+                return ""
+        return ""
+
+    def extract_contact_name(self, query: str) -> str:
+        """
+        Naively extracts contact name after 'crm history for' by taking the next two words.
+        Note: This is a placeholder and should be replaced with proper NLP.
+        """
+        words = query.lower().split()
+        if "crm" in words and "history" in words and "for" in words:
+            try:
+                idx = words.index("for")
+                return " ".join(words[idx + 1 : idx + 3]).title()
+            except IndexError:
+                return ""
+        return ""
+
+
+def signature(tasks: list) -> list:
+    return [(task["method"], task["params"]) for task in tasks]
+
+
+def throughput(parse, corpus: list) -> float:
+    start = time.perf_counter()
+    for query in corpus:
+        parse(query)
+    return len(corpus) / (time.perf_counter() - start)
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    corpus = build_corpus(size)
+    registry = AgentRegistry.from_card_paths(
+        [
+            "agent_cards/web_research_agent_card.json",
+            "agent_cards/crm_research_agent_card.json",
+        ]
+    )
+    current = SupervisorAgent(agent_registry=registry)
+    legacy = LegacyParser(agent_registry=registry)
+
+    mismatches = [
+        query
+        for query in corpus[:5000]
+        if signature(current.parse_query(query)) != signature(legacy.parse_query(query))
+    ]
+    print(f"corpus:     {size} queries ({len(mismatches)} mismatches in first 5000)")
+
+    legacy_qps = throughput(legacy.parse_query, corpus)
+    current_qps = throughput(current.parse_query, corpus)
+    parse_only_qps = throughput(registry.query_parser.parse, corpus)
+    print(f"legacy:     {legacy_qps:,.0f} queries/s")
+    print(f"current:    {current_qps:,.0f} queries/s ({current_qps / legacy_qps:.2f}x)")
+    print(f"parse only: {parse_only_qps:,.0f} queries/s (without building task dicts)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Startup benchmark: AgentRegistry cold start with eager versus lazy agent creation.
+
+Generates a directory of AgentCards (copies of the bundled cards under distinct names
+and skill ids) and measures, each in a fresh interpreter so imports are not shared:
+
+- eager:       parse every card and create every agent (`prewarm=True`)
+- lazy:        parse every card, create agents on first use
+- lazy+index:  read unchanged cards from the on-disk CardIndex
+
+    PYTHONPATH=. python benchmarks/bench_registry_startup.py [num_cards] [runs]
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+TEMPLATES = [
+    ("web-research-agent", "agent_cards/web_research_agent_card.json"),
+    ("crm-research-agent", "agent_cards/crm_research_agent_card.json"),
+]
+
+CHILD = """
+import os, sys, time
+start = time.perf_counter()
+import agent_registry
+from agent_registry import AGENT_CLASS_REGISTRY, AgentRegistry
+mode, directory = sys.argv[1], sys.argv[2]
+for name in os.listdir(directory):
+    if name.endswith(".json"):
+        base, _, _ = name.rpartition("-")
+        AGENT_CLASS_REGISTRY[name[:-5]] = AGENT_CLASS_REGISTRY[base]
+if mode == "lazy+index":
+    AgentRegistry.from_card_dir(directory)
+else:
+    paths = sorted(
+        os.path.join(directory, n) for n in os.listdir(directory) if n.endswith(".json")
+    )
+    AgentRegistry.from_card_paths(paths, prewarm=mode == "eager")
+print(time.perf_counter() - start)
+"""
+
+
+def write_cards(directory: str, count: int) -> None:
+    for i in range(count):
+        base, template = TEMPLATES[i % len(TEMPLATES)]
+        with open(template) as f:
+            card = json.load(f)
+        card["name"] = f"{base}-{i}"
+        for skill in card["skills"]:
+            skill["id"] = f"{skill['id']}_{i}"
+        with open(os.path.join(directory, f"{base}-{i}.json"), "w") as f:
+            json.dump(card, f)
+
+
+def measure(mode: str, directory: str, runs: int) -> float:
+    env = {**os.environ, "PYTHONPATH": os.getcwd(), "PYTHONDONTWRITEBYTECODE": "0"}
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", CHILD, mode, directory],
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        samples.append(float(output.split()[-1]))
+    return statistics.median(samples)
+
+
+def main() -> None:
+    num_cards = int(sys.argv[1]) if len(sys.argv) > 1 else 60
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 7
+
+    with tempfile.TemporaryDirectory() as directory:
+        write_cards(directory, num_cards)
+        measure("lazy+index", directory, 1)  # build the index and bytecode caches
+
+        print(f"{num_cards} cards, median of {runs} cold starts")
+        baseline = None
+        for mode in ("eager", "lazy", "lazy+index"):
+            elapsed = measure(mode, directory, runs)
+            baseline = baseline or elapsed
+            print(f"  {mode:<11} {elapsed * 1000:8.2f} ms  ({baseline / elapsed:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
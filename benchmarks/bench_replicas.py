@@ -0,0 +1,93 @@
+"""
+Benchmark: throughput of a replicated skill as the card's `replicas` count grows.
+
+The CRM agent gets a blocking 10 ms tool layer and only two executor workers, so one
+instance tops out near 200 calls/s. The same load is sent with 1, 2 and 4 replicas for
+each load-balancing strategy; throughput should scale with the replica count.
+
+The card keeps its real `limits`, cache and retry policy, and every call goes through
+the supervisor's scheduler, so the per-replica agent and skill limits are in force.
+
+    PYTHONPATH=. python benchmarks/bench_replicas.py [calls]
+"""
+
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+
+from agent_registry import AgentRegistry
+from agents.crm_research_agent.agent import CRMResearchAgent
+from agents.supervisor_agent import SupervisorAgent
+
+TOOL_LATENCY = 0.01
+
+
+class NarrowCRMAgent(CRMResearchAgent):
+    max_workers = 2
+
+    def __init__(self):
+        super().__init__()
+        tool_layer = self.tool_layer
+
+        async def slow_tool_layer(*args, **kwargs):
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(self.executor, time.sleep, TOOL_LATENCY)
+            async for item in tool_layer(*args, **kwargs):
+                yield item
+
+        self.tool_layer = slow_tool_layer
+
+
+def write_card(directory: str, replicas: int, strategy: str) -> str:
+    with open("agent_cards/crm_research_agent_card.json") as f:
+        card = json.load(f)
+    card.update(
+        replicas=replicas,
+        loadBalancing=strategy,
+        agentClass="__main__.NarrowCRMAgent",
+    )
+    path = os.path.join(directory, f"crm-{replicas}-{strategy}.json")
+    with open(path, "w") as f:
+        json.dump(card, f)
+    return path
+
+
+async def run(path: str, calls: int) -> float:
+    supervisor = SupervisorAgent(agent_registry=AgentRegistry.from_card_paths([path]))
+    tasks = [
+        {
+            "jsonrpc": "2.0",
+            "method": "get_crm_history",
+            "params": {"contact_name": f"Contact {i}"},
+            "id": str(i),
+        }
+        for i in range(calls)
+    ]
+    start = time.perf_counter()
+    replies = await asyncio.gather(*(supervisor.delegate_tasks([t]) for t in tasks))
+    elapsed = time.perf_counter() - start
+    assert all("result" in r for (r,) in replies), "benchmark calls failed"
+    return calls / elapsed
+
+
+async def main() -> None:
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+    with tempfile.TemporaryDirectory() as directory:
+        print(f"{calls} concurrent calls, {TOOL_LATENCY * 1000:.0f} ms tool latency")
+        for strategy in ("power-of-two", "least-outstanding"):
+            baseline = None
+            for replicas in (1, 2, 4):
+                throughput = await run(write_card(directory, replicas, strategy), calls)
+                baseline = baseline or throughput
+                print(
+                    f"  {strategy:<17} replicas={replicas}  {throughput:8.1f} calls/s"
+                    f"  ({throughput / baseline:.2f}x)"
+                )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
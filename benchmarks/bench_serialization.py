@@ -0,0 +1,96 @@
+"""
+Micro-benchmark: encoding aggregated JSON-RPC responses.
+
+Large results: `responses` CRM responses with `interactions` interactions each, written
+either the old way (collect every response, then `json.dumps(results, indent=2)`) or
+streamed one response at a time through `NDJSONWriter` with each available backend.
+Reports wall time and peak traced memory of the encoding step.
+
+Small messages: per-response encoding cost of many small responses, building the
+wire-format dict for `json.dumps` versus `Serializer.dumps` with pre-encoded envelope
+fragments.
+
+    PYTHONPATH=. python benchmarks/bench_serialization.py [responses] [interactions]
+"""
+
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+from protocol.messages import Response, to_wire
+from protocol.serialization import BACKENDS, NDJSONWriter, Serializer, orjson
+
+
+def build_responses(count: int, interactions: int) -> list:
+    history = [
+        {"date": "2025-05-20", "type": "email", "note": f"Interaction {i}"}
+        for i in range(interactions)
+    ]
+    return [
+        Response(f"t:{i}", {"contact": f"Contact {i}", "interactions": history})
+        for i in range(count)
+    ]
+
+
+def measure(write, responses: list) -> tuple:
+    start = time.perf_counter()
+    write(responses)
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    write(responses)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    interactions = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    responses = build_responses(count, interactions)
+    sink = open(os.devnull, "wb")
+
+    def dump_all(responses):
+        sink.write(json.dumps(responses, indent=2, default=to_wire).encode())
+
+    candidates = [("json.dumps(all, indent=2)", dump_all)]
+    for backend in BACKENDS:
+        if backend == "orjson" and orjson is None:
+            continue
+        serializer = Serializer(backend)
+
+        def stream(responses, serializer=serializer):
+            writer = NDJSONWriter(sink, serializer)
+            for response in responses:
+                writer.write(response)
+
+        candidates.append((f"NDJSON stream ({backend})", stream))
+
+    print(f"{count} responses x {interactions} interactions")
+    for name, write in candidates:
+        elapsed, peak = measure(write, responses)
+        print(f"  {name:<28} {elapsed * 1000:8.1f} ms  {peak / 2**20:8.2f} MiB peak")
+
+    small = [Response(f"t:{i}", {"n": i}) for i in range(100000)]
+    print(f"{len(small)} small responses")
+    start = time.perf_counter()
+    for response in small:
+        json.dumps(response.to_wire(), separators=(",", ":")).encode()
+    baseline = time.perf_counter() - start
+    print(f"  {'json.dumps(to_wire())':<28} {baseline / len(small) * 1e9:8.0f} ns/msg")
+    for backend in BACKENDS:
+        if backend == "orjson" and orjson is None:
+            continue
+        dumps = Serializer(backend).dumps
+        start = time.perf_counter()
+        for response in small:
+            dumps(response)
+        elapsed = time.perf_counter() - start
+        name = f"Serializer.dumps ({backend})"
+        print(f"  {name:<28} {elapsed / len(small) * 1e9:8.0f} ns/msg")
+    sink.close()
+
+
+if __name__ == "__main__":
+    main()
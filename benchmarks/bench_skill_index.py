@@ -0,0 +1,151 @@
+"""
+Benchmark: skill discovery over a large catalog with the SkillIndex versus scanning
+every card.
+
+Generates NUM_CARDS AgentCards with one to three skills each, drawing tags, I/O modes
+and descriptions from small vocabularies, then reports:
+
+- build:   SkillIndex construction time, and a full AgentRegistry load of the
+           catalog (which builds the index) for scale
+- lookups: mean latency per query of `SkillIndex.search` and of a linear scan with the
+           same filters and scoring, for tag, tag + mode, keyword and combined
+           queries. The script checks that both return the same skills.
+
+    PYTHONPATH=. python benchmarks/bench_skill_index.py [num_cards] [queries]
+"""
+
+import json
+import math
+import os
+import random
+import sys
+import tempfile
+import time
+
+from agent_registry import AgentRegistry, card_paths
+from agents.skill_index import SkillIndex, _skill_terms, _tokenize
+
+TAGS = [
+    "crm", "contact", "history", "customer", "news", "company", "finance", "search",
+    "summary", "email", "calendar", "support", "billing", "sales", "legal", "hr",
+    "translation", "weather", "travel", "code", "analytics", "marketing", "security",
+    "inventory", "shipping", "health", "education", "research", "compliance", "audit",
+]  # fmt: skip
+MODES = ["application/json", "text/plain", "text/markdown", "image/png", "audio/wav"]
+VERBS = ["Fetches", "Summarizes", "Searches", "Classifies", "Translates", "Reports"]
+NOUNS = ["records", "articles", "tickets", "invoices", "events", "messages", "metrics"]
+
+QUERIES = {
+    "tag": dict(tags=["crm"]),
+    "tag + mode": dict(tags=["finance", "summary"], output_modes=["text/plain"]),
+    "keywords": dict(keywords="summarize billing invoices"),
+    "keywords + tag": dict(keywords="search support tickets", tags=["support"]),
+}
+
+
+def generate_cards(count: int, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    cards = []
+    for i in range(count):
+        skills = []
+        for j in range(rng.randint(1, 3)):
+            tags = rng.sample(TAGS, 3)
+            verb, noun = rng.choice(VERBS), rng.choice(NOUNS)
+            skill = {
+                "id": f"{verb.lower()}_{tags[0]}_{noun}_{i}_{j}",
+                "name": f"{verb} {tags[0].title()} {noun.title()}",
+                "description": f"{verb} {noun} about {tags[0]} and {tags[1]}.",
+                "tags": tags,
+                "examples": [f"{verb} the {tags[2]} {noun} for account {i}."],
+            }
+            if rng.random() < 0.3:
+                skill["outputModes"] = rng.sample(MODES, 2)
+            skills.append(skill)
+        cards.append(
+            {
+                "name": f"Generated Agent {i}",
+                "url": f"local://generated-{i}",
+                "agentClass": "agents.web_research_agent.agent.WebResearchAgent",
+                "version": "1.0.0",
+                "defaultInputModes": ["application/json"],
+                "defaultOutputModes": ["application/json"],
+                "skills": skills,
+            }
+        )
+    return cards
+
+
+def scan(catalog, keywords="", tags=(), input_modes=(), output_modes=(), limit=10):
+    """
+    Linear-scan baseline: the filters and scoring of SkillIndex.search over every
+    skill, with each skill's keyword weights computed up front.
+    """
+    entries, weights = catalog
+    terms = _tokenize(keywords)
+    wanted = {tag.lower() for tag in tags}
+    matches = []
+    for position, (card, skill) in enumerate(entries):
+        if not wanted <= {tag.lower() for tag in skill.get("tags", ())}:
+            continue
+        accepts = skill.get("inputModes", card.get("defaultInputModes", ()))
+        produces = skill.get("outputModes", card.get("defaultOutputModes", ()))
+        if not set(input_modes) <= set(accepts) or not set(output_modes) <= set(produces):
+            continue
+        matches.append((position, skill))
+    if not terms:
+        return [skill["id"] for _, skill in matches[:limit]]
+    df = {term: sum(1 for w in weights if term in w) for term in set(terms)}
+    scored = []
+    for position, skill in matches:
+        score = sum(
+            math.log(1 + len(entries) / df[term]) * weights[position][term]
+            for term in set(terms)
+            if term in weights[position]
+        )
+        if score:
+            scored.append((-score, position, skill["id"]))
+    return [skill_id for _, _, skill_id in sorted(scored)[:limit]]
+
+
+def mean_latency(function, runs: int) -> float:
+    start = time.perf_counter()
+    for _ in range(runs):
+        function()
+    return (time.perf_counter() - start) / runs
+
+
+def main() -> None:
+    num_cards = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    cards = generate_cards(num_cards)
+    entries = [(card, skill) for card in cards for skill in card["skills"]]
+    catalog = (entries, [_skill_terms(skill) for _, skill in entries])
+
+    start = time.perf_counter()
+    index = SkillIndex(cards)
+    build = time.perf_counter() - start
+    with tempfile.TemporaryDirectory() as directory:
+        for i, card in enumerate(cards):
+            with open(os.path.join(directory, f"card-{i}.json"), "w") as f:
+                json.dump(card, f)
+        paths = card_paths(directory)
+        start = time.perf_counter()
+        AgentRegistry.from_card_paths(paths)
+        load = time.perf_counter() - start
+
+    print(f"{num_cards} cards, {len(index)} skills")
+    print(f"  index build     {build * 1000:8.1f} ms")
+    print(f"  registry load   {load * 1000:8.1f} ms (including the index)")
+    for name, query in QUERIES.items():
+        indexed = [m.skill_id for m in index.search(**query)]
+        assert indexed == scan(catalog, **query), f"{name}: results differ"
+        fast = mean_latency(lambda: index.search(**query), runs)
+        slow = mean_latency(lambda: scan(catalog, **query), max(1, runs // 50))
+        print(
+            f"  {name:<15} index {fast * 1e6:9.1f} µs   scan {slow * 1e6:11.1f} µs"
+            f"   ({slow / fast:6.0f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Benchmark: a chained query run as two caller round trips versus one task graph.
+
+Tool calls take LATENCY seconds per skill, and each call from the caller to the
+supervisor costs CALLER_ROUND_TRIP seconds. The caller either asks for the contact's
+employer, then for that company's news and the contact's CRM history, or sends one
+chained query that the supervisor plans as a graph: the CRM history overlaps the
+company lookup, and the news starts as soon as the lookup answers. Prints wall time per
+query and the graph's critical path.
+
+    PYTHONPATH=. python benchmarks/bench_task_graph.py
+"""
+
+import asyncio
+import statistics
+import time
+
+from agent_registry import AgentRegistry
+from agents.supervisor_agent import SupervisorAgent
+from supervisor_server import DEFAULT_CARD_PATHS
+
+LATENCY = {"lookup": 0.05, "news": 0.05, "history": 0.08}
+CALLER_ROUND_TRIP = 0.02
+ROUNDS = 10
+CONTACT = "Jane Smith"
+
+
+def slow_iterator(tool_layer, executor, latency):
+    async def wrapper(*args, **kwargs):
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(executor, time.sleep, latency)
+        async for item in tool_layer(*args, **kwargs):
+            yield item
+
+    return wrapper
+
+
+def slow(tool_layer, latency):
+    def wrapper(*args, **kwargs):
+        time.sleep(latency)
+        return tool_layer(*args, **kwargs)
+
+    return wrapper
+
+
+def build_supervisor() -> SupervisorAgent:
+    registry = AgentRegistry.from_card_paths(DEFAULT_CARD_PATHS)
+    web = registry.find_agent_for_method("get_company_news")
+    crm = registry.find_agent_for_method("get_crm_history")
+    web.tool_layer = slow_iterator(web.tool_layer, web.executor, LATENCY["news"])
+    crm.tool_layer = slow_iterator(crm.tool_layer, crm.executor, LATENCY["history"])
+    crm.company_tool_layer = slow(crm.company_tool_layer, LATENCY["lookup"])
+    for agent in (web, crm):
+        agent.cache = None  # every round pays for its backend calls
+    return SupervisorAgent(agent_registry=registry)
+
+
+async def round_trips(supervisor: SupervisorAgent) -> None:
+    await asyncio.sleep(CALLER_ROUND_TRIP)
+    (lookup,) = await supervisor.handle_query(f"employer of {CONTACT}")
+    company = lookup["result"]["company"]
+    await asyncio.sleep(CALLER_ROUND_TRIP)
+    await supervisor.handle_query(
+        f"news about {company} and crm history for {CONTACT}"
+    )
+
+
+async def graph(supervisor: SupervisorAgent):
+    await asyncio.sleep(CALLER_ROUND_TRIP)
+    return await supervisor.handle_query_graph(
+        f"news about the company of {CONTACT} and crm history for {CONTACT}"
+    )
+
+
+async def timed(run, supervisor: SupervisorAgent) -> float:
+    samples = []
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        await run(supervisor)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+async def main() -> None:
+    supervisor = build_supervisor()
+    latencies = ", ".join(f"{k} {v * 1000:.0f} ms" for k, v in LATENCY.items())
+    print(f"{latencies}, caller round trip {CALLER_ROUND_TRIP * 1000:.0f} ms")
+    print(f"  two round trips   {await timed(round_trips, supervisor):7.1f} ms")
+    print(f"  one task graph    {await timed(graph, supervisor):7.1f} ms")
+    print(f"  critical path of one more run:")
+    for step in (await graph(supervisor)).critical_path:
+        print(
+            f"    {step['skill']:<20} starts {step['start'] * 1000:6.1f} ms"
+            f"  takes {step['duration'] * 1000:6.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
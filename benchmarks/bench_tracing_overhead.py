@@ -0,0 +1,63 @@
+"""
+Micro-benchmark: per-query cost of tracing, enabled versus disabled.
+
+Runs the full supervisor path (parse, schedule, retry wrapper, agent dispatch) against
+an agent whose skill is an instant coroutine, so the measured time is almost entirely
+pipeline overhead, and reports microseconds per query for each tracer setting.
+
+    PYTHONPATH=. python benchmarks/bench_tracing_overhead.py [queries]
+"""
+
+import asyncio
+import sys
+import time
+from unittest.mock import MagicMock
+
+from agent_registry import AgentRegistry
+from agents.supervisor_agent import SupervisorAgent
+from protocol.base_agent import BaseAgent
+from protocol.tracing import TRACER
+
+QUERY = "news about Acme Inc and crm history for John Doe"
+
+
+class InstantAgent(BaseAgent):
+    def __init__(self):
+        super().__init__(tool_layer=None)
+
+    def get_supported_methods(self) -> dict:
+        return {"get_company_news": self.echo, "get_crm_history": self.echo}
+
+    async def echo(self, params: dict) -> dict:
+        return params
+
+
+async def run(supervisor: SupervisorAgent, queries: int) -> float:
+    start = time.perf_counter()
+    for _ in range(queries):
+        await supervisor.handle_query(QUERY)
+    return (time.perf_counter() - start) / queries
+
+
+async def main() -> None:
+    queries = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    registry = AgentRegistry.from_card_paths([])
+    registry.find_agent_for_method = MagicMock(return_value=InstantAgent())
+    supervisor = SupervisorAgent(agent_registry=registry)
+    await run(supervisor, 1000)  # warm up
+
+    results = {}
+    for enabled in (False, True, False, True):
+        TRACER.enabled = enabled
+        TRACER.reset()
+        results.setdefault(enabled, []).append(await run(supervisor, queries))
+
+    disabled, enabled = min(results[False]), min(results[True])
+    print(f"{queries} queries, 2 tasks each (best of 2 runs)")
+    print(f"  tracing disabled  {disabled * 1e6:8.1f} µs/query")
+    print(f"  tracing enabled   {enabled * 1e6:8.1f} µs/query")
+    print(f"  overhead          {(enabled / disabled - 1) * 100:8.1f} %")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,88 @@
+"""
+Benchmark: backend calls and query latency right after a restart, with and without a
+persistent result store.
+
+Every tool call sleeps BACKEND_LATENCY seconds and is counted. QUERIES distinct
+queries run once to fill the caches, then again on a freshly loaded registry (the
+"restart"): without a store the second run hits the backends as hard as the first,
+with a ResultStore it is served from disk.
+
+    PYTHONPATH=. python benchmarks/bench_warm_restart.py [queries]
+"""
+
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+from agent_registry import AgentRegistry
+from agents.supervisor_agent import SupervisorAgent
+from protocol.result_store import ResultStore
+from supervisor_server import DEFAULT_CARD_PATHS
+
+BACKEND_LATENCY = 0.005
+
+
+class Backend:
+    def __init__(self):
+        self.calls = 0
+
+    def slow(self, tool_layer, executor):
+        async def wrapper(*args, **kwargs):
+            self.calls += 1
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(executor, time.sleep, BACKEND_LATENCY)
+            async for item in tool_layer(*args, **kwargs):
+                yield item
+
+        return wrapper
+
+
+async def run(store_path: str | None, queries: list) -> dict:
+    """Starts a registry (over the store, if any) and runs every query once."""
+    store = ResultStore(store_path) if store_path else None
+    registry = AgentRegistry.from_card_paths(DEFAULT_CARD_PATHS, result_store=store)
+    backend = Backend()
+    for method in ("get_company_news", "get_crm_history"):
+        agent = registry.find_agent_for_method(method)
+        agent.tool_layer = backend.slow(agent.tool_layer, agent.executor)
+    supervisor = SupervisorAgent(agent_registry=registry)
+
+    latencies = []
+    start = time.perf_counter()
+    for query in queries:
+        began = time.perf_counter()
+        await supervisor.handle_query(query)
+        latencies.append(time.perf_counter() - began)
+    elapsed = time.perf_counter() - start
+    if store is not None:
+        store.close()
+    return {
+        "calls": backend.calls,
+        "s": elapsed,
+        "p50": statistics.median(latencies) * 1000,
+    }
+
+
+async def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    queries = [
+        f"news about Company {i} and crm history for Person {i}" for i in range(count)
+    ]
+    print(f"{count} queries, {BACKEND_LATENCY * 1000:.0f} ms per backend call")
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "results.db")
+        for name, store_path in (("memory only", None), ("result store", path)):
+            cold = await run(store_path, queries)
+            warm = await run(store_path, queries)
+            for phase, m in (("first start", cold), ("restart", warm)):
+                print(
+                    f"  {name:<12} {phase:<11} {m['calls']:5d} backend calls"
+                    f"  {m['s']:6.2f} s  p50 {m['p50']:6.2f} ms"
+                )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,54 @@
+"""
+Micro-benchmark: bulk query throughput of the in-process supervisor versus a
+SupervisorPool of 1, 2 and 4 worker processes.
+
+The mock tool layers answer without latency, so throughput is bound by the CPU work of
+parsing, dispatch and serialization — the work a pool spreads across cores. Scaling is
+capped by the machine's core count, which is printed first.
+
+    PYTHONPATH=. python benchmarks/bench_workers.py [queries]
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+from agent_registry import AgentRegistry
+from agents.supervisor_agent import SupervisorAgent
+from supervisor_pool import SupervisorPool
+from supervisor_server import DEFAULT_CARD_PATHS
+
+WORKER_COUNTS = (1, 2, 4)
+
+
+def make_queries(count: int) -> list:
+    return [
+        f"news about Company {i} and crm history for Person {i}" for i in range(count)
+    ]
+
+
+async def drain(supervisor, queries: list) -> float:
+    start = time.perf_counter()
+    async for _ in supervisor.handle_queries(queries, ordered=False):
+        pass
+    return time.perf_counter() - start
+
+
+async def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    queries = make_queries(count)
+    print(f"{count} distinct queries, {os.cpu_count()} CPUs")
+
+    registry = AgentRegistry.from_card_paths(DEFAULT_CARD_PATHS)
+    elapsed = await drain(SupervisorAgent(agent_registry=registry), queries)
+    print(f"  in-process  {elapsed:7.2f} s  {count / elapsed:9,.0f} queries/s")
+
+    for workers in WORKER_COUNTS:
+        async with SupervisorPool(DEFAULT_CARD_PATHS, workers=workers) as pool:
+            elapsed = await drain(pool, queries)
+        print(f"  {workers} worker(s) {elapsed:7.2f} s  {count / elapsed:9,.0f} queries/s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,109 @@
+"""
+Load test for the Supervisor HTTP service.
+
+Each client thread keeps one HTTP/1.1 connection alive and sends `handle_query`
+requests back to back. Reports requests/sec and p50/p99 latency.
+
+Against a running server:
+
+    PYTHONPATH=. python supervisor_server.py --port 8000
+    PYTHONPATH=. python benchmarks/load_test_server.py --port 8000
+
+Or let the script start an in-process server on a free port:
+
+    PYTHONPATH=. python benchmarks/load_test_server.py --spawn
+"""
+
+import argparse
+import asyncio
+import http.client
+import json
+import statistics
+import threading
+import time
+
+QUERY = "Find recent company news about Acme Inc and pull CRM history for John Doe"
+
+
+def start_server_in_thread() -> int:
+    """Runs a SupervisorServer on its own event loop thread and returns its port."""
+    from supervisor_server import DEFAULT_CARD_PATHS, SupervisorServer
+
+    ready = threading.Event()
+    port = []
+
+    def run():
+        async def serve():
+            server = SupervisorServer.from_card_paths(DEFAULT_CARD_PATHS)
+            await server.start(port=0)
+            port.append(server.port)
+            ready.set()
+            await asyncio.Event().wait()
+
+        asyncio.run(serve())
+
+    threading.Thread(target=run, daemon=True).start()
+    ready.wait()
+    return port[0]
+
+
+def client(host: str, port: int, requests: int, latencies: list) -> None:
+    connection = http.client.HTTPConnection(host, port)
+    headers = {"Content-Type": "application/json"}
+    for i in range(requests):
+        body = json.dumps(
+            {
+                "jsonrpc": "2.0",
+                "method": "handle_query",
+                "params": {"query": QUERY},
+                "id": i,
+            }
+        )
+        start = time.perf_counter()
+        connection.request("POST", "/", body, headers)
+        response = connection.getresponse()
+        response.read()
+        latencies.append(time.perf_counter() - start)
+    connection.close()
+
+
+def percentile(ordered: list, pct: float) -> float:
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument(
+        "--spawn", action="store_true", help="start an in-process server"
+    )
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=250, help="per client")
+    args = parser.parse_args()
+
+    port = start_server_in_thread() if args.spawn else args.port
+    latencies: list = []
+    threads = [
+        threading.Thread(
+            target=client, args=(args.host, port, args.requests, latencies)
+        )
+        for _ in range(args.clients)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    ordered = sorted(latencies)
+    print(f"requests:     {len(ordered)} ({args.clients} keep-alive clients)")
+    print(f"throughput:   {len(ordered) / elapsed:.1f} req/s")
+    print(f"latency p50:  {percentile(ordered, 50) * 1000:.2f} ms")
+    print(f"latency p99:  {percentile(ordered, 99) * 1000:.2f} ms")
+    print(f"latency mean: {statistics.mean(ordered) * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,410 @@
+"""
+Benchmark suite for the supervisor/agent pipeline, with JSON results and baseline
+comparison for catching performance regressions.
+
+Scenarios (all seeded, so repeated runs do the same work):
+
+- single_query:       sequential `handle_query` latency (p50/p95/p99)
+- concurrent_queries: N concurrent queries against tools with a latency distribution
+- batch_fanout:       one large JSON-RPC batch fanned out through `delegate_tasks`
+- parse_throughput:   `parse_query` over a generated corpus
+- registry_cold_load: `AgentRegistry` load of many generated AgentCards
+- flaky_tools:        concurrent queries against slow tools that sometimes fail
+
+Each scenario runs `--repeat` times and reports the median of every metric. Results go
+to `--output` as JSON; with `--baseline`, metrics that got worse than the baseline by
+more than `--tolerance` are reported and the exit status is 1.
+
+`benchmarks/baseline.json` is the committed baseline, recorded with the default
+workloads (no `--quick`) and `--repeat 5`. Timings depend on the machine, so compare
+against a baseline recorded on the same machine: refresh it with
+`--repeat 5 --output benchmarks/baseline.json` on the current main branch before
+comparing a change, and commit it again when a change intentionally moves the numbers.
+A baseline recorded with a different workload config is reported with a warning.
+
+Tool latency distributions are given as `fixed:SECONDS`, `uniform:LOW:HIGH`,
+`lognormal:MEDIAN:SIGMA` or `exponential:MEAN`.
+
+    PYTHONPATH=. python benchmarks/suite.py --output results.json
+    PYTHONPATH=. python benchmarks/suite.py --baseline benchmarks/baseline.json
+    PYTHONPATH=. python benchmarks/suite.py --quick --only parse_throughput
+"""
+
+import argparse
+import asyncio
+import inspect
+import json
+import math
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict
+
+from agent_registry import AGENT_CLASS_REGISTRY, AgentRegistry
+from agents.supervisor_agent import SupervisorAgent
+from bench_parse_query import build_corpus
+from bench_registry_startup import write_cards
+from protocol.tracing import TRACER
+
+CARD_PATHS = [
+    "agent_cards/web_research_agent_card.json",
+    "agent_cards/crm_research_agent_card.json",
+]
+QUERY = "Find recent company news about {company} and pull CRM history for {contact}"
+
+SCENARIOS: Dict[str, Callable[["Config"], Awaitable[dict]]] = {}
+
+
+@dataclass
+class Config:
+    seed: int = 7
+    queries: int = 500  # single_query
+    concurrency: int = 200  # concurrent_queries, flaky_tools
+    batch_size: int = 1000  # batch_fanout
+    corpus_size: int = 50000  # parse_throughput
+    cards: int = 200  # registry_cold_load
+    tool_latency: str = "lognormal:0.005:0.5"
+    failure_rate: float = 0.1  # flaky_tools
+
+    @classmethod
+    def quick(cls) -> "Config":
+        return cls(queries=100, concurrency=50, batch_size=200, corpus_size=5000, cards=40)
+
+
+class LatencyModel:
+    """
+    Samples simulated tool latencies from a named distribution.
+    """
+
+    def __init__(self, spec: str) -> None:
+        kind, *args = spec.split(":")
+        values = [float(a) for a in args]
+        expected = {"fixed": 1, "uniform": 2, "lognormal": 2, "exponential": 1}
+        if expected.get(kind) != len(values):
+            raise ValueError(f"Invalid latency distribution: {spec!r}")
+        self.spec = spec
+        self.kind = kind
+        self.values = values
+
+    def sample(self, rng: random.Random) -> float:
+        if self.kind == "fixed":
+            return self.values[0]
+        if self.kind == "uniform":
+            return rng.uniform(*self.values)
+        if self.kind == "lognormal":
+            median, sigma = self.values
+            return rng.lognormvariate(math.log(median), sigma) if median else 0.0
+        return rng.expovariate(1 / self.values[0]) if self.values[0] else 0.0
+
+
+def simulated(
+    tool_layer, latency: LatencyModel, rng: random.Random, failure_rate=0.0, executor=None
+):
+    """
+    Adds a blocking backend delay and random failures to a tool layer. For async-iterator
+    tool layers the blocking call runs on `executor`, as a blocking backend client would.
+    """
+
+    def backend_call():
+        delay = latency.sample(rng)
+        if delay:
+            time.sleep(delay)
+        if failure_rate and rng.random() < failure_rate:
+            raise RuntimeError("Simulated tool failure")
+
+    if inspect.isasyncgenfunction(tool_layer):
+
+        async def iterate(*args, **kwargs):
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(executor, backend_call)
+            async for item in tool_layer(*args, **kwargs):
+                yield item
+
+        return iterate
+
+    def wrapper(*args, **kwargs):
+        backend_call()
+        return tool_layer(*args, **kwargs)
+
+    return wrapper
+
+
+def build_supervisor(
+    latency: LatencyModel, rng: random.Random, failure_rate: float = 0.0
+) -> SupervisorAgent:
+    registry = AgentRegistry.from_card_paths(CARD_PATHS, prewarm=True)
+    for method in ("get_company_news", "get_crm_history"):
+        agent = registry.find_agent_for_method(method)
+        agent.cache = None  # measure the pipeline, not the result cache
+        agent.tool_layer = simulated(
+            agent.tool_layer, latency, rng, failure_rate, agent.executor
+        )
+        if hasattr(agent, "batch_tool_layer"):
+            agent.batch_tool_layer = simulated(agent.batch_tool_layer, latency, rng)
+    return SupervisorAgent(agent_registry=registry)
+
+
+def queries(rng: random.Random, n: int) -> list:
+    return [
+        QUERY.format(company=f"Company {rng.randrange(10**6)}", contact=f"Jo {i}")
+        for i in range(n)
+    ]
+
+
+def percentiles(samples: list) -> dict:
+    ordered = sorted(samples)
+
+    def pick(q: float) -> float:
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000
+
+    return {
+        "p50_ms": lower(pick(0.50)),
+        "p95_ms": lower(pick(0.95)),
+        "p99_ms": lower(pick(0.99)),
+    }
+
+
+def lower(value: float) -> dict:
+    return {"value": value, "better": "lower"}
+
+
+def higher(value: float) -> dict:
+    return {"value": value, "better": "higher"}
+
+
+def scenario(function):
+    SCENARIOS[function.__name__] = function
+    return function
+
+
+@scenario
+async def single_query(config: Config) -> dict:
+    rng = random.Random(config.seed)
+    supervisor = build_supervisor(LatencyModel("fixed:0"), rng)
+    samples = []
+    for query in queries(rng, config.queries):
+        start = time.perf_counter()
+        await supervisor.handle_query(query)
+        samples.append(time.perf_counter() - start)
+    return percentiles(samples)
+
+
+@scenario
+async def concurrent_queries(config: Config) -> dict:
+    rng = random.Random(config.seed)
+    supervisor = build_supervisor(LatencyModel(config.tool_latency), rng)
+    samples = []
+
+    async def timed(query: str) -> None:
+        start = time.perf_counter()
+        await supervisor.handle_query(query)
+        samples.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(timed(q) for q in queries(rng, config.concurrency)))
+    wall = time.perf_counter() - start
+    return {
+        "wall_ms": lower(wall * 1000),
+        "queries_per_s": higher(config.concurrency / wall),
+        **percentiles(samples),
+    }
+
+
+@scenario
+async def batch_fanout(config: Config) -> dict:
+    rng = random.Random(config.seed)
+    supervisor = build_supervisor(LatencyModel("fixed:0"), rng)
+    tasks = [
+        {
+            "jsonrpc": "2.0",
+            "method": "get_crm_history" if i % 2 else "get_company_news",
+            "params": (
+                {"contact_name": f"Contact {i}"}
+                if i % 2
+                else {"company_name": f"Company {i}"}
+            ),
+            "id": f"batch:{i}",
+        }
+        for i in range(config.batch_size)
+    ]
+    start = time.perf_counter()
+    responses = await supervisor.delegate_tasks(tasks)
+    wall = time.perf_counter() - start
+    assert all("result" in r for r in responses), "batch fan-out returned errors"
+    return {
+        "wall_ms": lower(wall * 1000),
+        "tasks_per_s": higher(config.batch_size / wall),
+    }
+
+
+@scenario
+async def parse_throughput(config: Config) -> dict:
+    registry = AgentRegistry.from_card_paths(CARD_PATHS)
+    supervisor = SupervisorAgent(agent_registry=registry)
+    corpus = build_corpus(config.corpus_size, seed=config.seed)
+    start = time.perf_counter()
+    for query in corpus:
+        supervisor.parse_query(query)
+    return {"queries_per_s": higher(len(corpus) / (time.perf_counter() - start))}
+
+
+@scenario
+async def registry_cold_load(config: Config) -> dict:
+    with tempfile.TemporaryDirectory() as directory:
+        write_cards(directory, config.cards)
+        for name in os.listdir(directory):
+            base, _, _ = name.rpartition("-")
+            AGENT_CLASS_REGISTRY[name[:-5]] = AGENT_CLASS_REGISTRY[base]
+
+        start = time.perf_counter()
+        AgentRegistry.from_card_dir(directory)  # builds the card index
+        parse = time.perf_counter() - start
+        start = time.perf_counter()
+        AgentRegistry.from_card_dir(directory)
+        indexed = time.perf_counter() - start
+        start = time.perf_counter()
+        AgentRegistry.from_card_dir(directory, prewarm=True)
+        prewarmed = time.perf_counter() - start
+    return {
+        "load_ms": lower(parse * 1000),
+        "indexed_load_ms": lower(indexed * 1000),
+        "prewarmed_load_ms": lower(prewarmed * 1000),
+    }
+
+
+@scenario
+async def flaky_tools(config: Config) -> dict:
+    rng = random.Random(config.seed)
+    latency = LatencyModel(config.tool_latency)
+    supervisor = build_supervisor(latency, rng, failure_rate=config.failure_rate)
+    enabled = TRACER.enabled
+    TRACER.enabled = True
+    TRACER.reset()
+    samples = []
+    succeeded = 0
+
+    async def timed(query: str) -> None:
+        nonlocal succeeded
+        start = time.perf_counter()
+        responses = await supervisor.handle_query(query)
+        samples.append(time.perf_counter() - start)
+        succeeded += sum("result" in r for r in responses)
+
+    try:
+        start = time.perf_counter()
+        await asyncio.gather(*(timed(q) for q in queries(rng, config.concurrency)))
+        wall = time.perf_counter() - start
+        retries = sum(
+            c["value"] for c in TRACER.counters() if c["name"] == "retries_total"
+        )
+    finally:
+        TRACER.enabled = enabled
+        TRACER.reset()
+    return {
+        "wall_ms": lower(wall * 1000),
+        "success_rate": higher(succeeded / (2 * config.concurrency)),
+        "retries": lower(retries),
+        **percentiles(samples),
+    }
+
+
+async def run_suite(config: Config, names: list, repeat: int) -> dict:
+    results = {}
+    for name in names:
+        runs = [await SCENARIOS[name](config) for _ in range(repeat)]
+        results[name] = {
+            metric: {
+                "value": statistics.median(run[metric]["value"] for run in runs),
+                "better": runs[0][metric]["better"],
+            }
+            for metric in runs[0]
+        }
+        summary = ", ".join(
+            f"{metric}={entry['value']:.4g}" for metric, entry in results[name].items()
+        )
+        print(f"{name:<20} {summary}")
+    return results
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """
+    Returns a description of every metric that regressed by more than `tolerance`
+    (a fraction) relative to the baseline.
+    """
+    regressions = []
+    for name, metrics in results.items():
+        for metric, entry in metrics.items():
+            reference = baseline.get(name, {}).get(metric)
+            if reference is None or not reference["value"]:
+                continue
+            change = entry["value"] / reference["value"] - 1
+            worse = change > tolerance if entry["better"] == "lower" else (
+                change < -tolerance
+            )
+            if worse:
+                regressions.append(
+                    f"{name}.{metric}: {reference['value']:.4g} -> "
+                    f"{entry['value']:.4g} ({change:+.1%})"
+                )
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--only", action="append", choices=sorted(SCENARIOS))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--quick", action="store_true", help="Smaller workloads")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--tool-latency", help="Tool latency distribution")
+    parser.add_argument("--failure-rate", type=float)
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    parser.add_argument("--baseline", help="Compare against this results file")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args()
+
+    config = Config.quick() if args.quick else Config()
+    config.seed = args.seed
+    if args.tool_latency:
+        LatencyModel(args.tool_latency)  # validate before running anything
+        config.tool_latency = args.tool_latency
+    if args.failure_rate is not None:
+        config.failure_rate = args.failure_rate
+
+    names = args.only or list(SCENARIOS)
+    results = asyncio.run(run_suite(config, names, args.repeat))
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "repeat": args.repeat,
+            "config": vars(config),
+        },
+        "scenarios": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            stored = json.load(f)
+        baseline = stored["scenarios"]
+        if stored["meta"]["config"] != report["meta"]["config"]:
+            print("WARNING baseline was recorded with a different config")
+        regressions = compare(results, baseline, args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            return 1
+        print(f"No regressions beyond {args.tolerance:.0%} of the baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+import argparse
+import asyncio
+import sys
+
+from agent_registry import AgentRegistry
+from agents.bulk import BulkStats
+from agents.supervisor_agent import SupervisorAgent
+from protocol.result_store import ResultStore
+from protocol.serialization import JSONArrayWriter, NDJSONWriter
+from supervisor_pool import SupervisorPool
+from supervisor_server import DEFAULT_CARD_PATHS
+
+
+def read_queries(stream):
+    for line in stream:
+        query = line.strip()
+        if query:
+            yield query
+
+
+async def main():
+    parser = argparse.ArgumentParser(
+        description="Run a file of queries (one per line) through the Supervisor and "
+        "write one JSON result per line."
+    )
+    parser.add_argument("input", nargs="?", help="Query file (default: stdin)")
+    parser.add_argument("--card", action="append", dest="cards")
+    parser.add_argument("--max-in-flight", type=int, default=256)
+    parser.add_argument(
+        "--unordered", action="store_true", help="Write results as they complete"
+    )
+    parser.add_argument(
+        "--format",
+        choices=("ndjson", "array"),
+        default="ndjson",
+        help="One JSON result per line, or one streamed JSON array",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="Run queries on this many supervisor processes (default: in-process)",
+    )
+    parser.add_argument(
+        "--shared-cache-slots",
+        type=int,
+        default=0,
+        help="With --workers, share one result cache of this many slots between them",
+    )
+    parser.add_argument(
+        "--result-store",
+        help="Keep cached skill results in this SQLite file across runs",
+    )
+    args = parser.parse_args()
+
+    card_paths = args.cards or DEFAULT_CARD_PATHS
+    pool = None
+    if args.workers:
+        pool = await SupervisorPool(
+            card_paths,
+            workers=args.workers,
+            shared_cache_slots=args.shared_cache_slots,
+            result_store=args.result_store,
+        ).start()
+        supervisor = pool
+    else:
+        store = ResultStore(args.result_store) if args.result_store else None
+        registry = AgentRegistry.from_card_paths(card_paths, result_store=store)
+        supervisor = SupervisorAgent(agent_registry=registry)
+    stats = BulkStats()
+
+    stream = open(args.input) if args.input else sys.stdin
+    writer_type = JSONArrayWriter if args.format == "array" else NDJSONWriter
+    writer = writer_type(sys.stdout.buffer)
+    try:
+        async for result in supervisor.handle_queries(
+            read_queries(stream),
+            ordered=not args.unordered,
+            max_in_flight=args.max_in_flight,
+            stats=stats,
+        ):
+            writer.write({"query": result.query, "responses": result.responses})
+        writer.close()
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+        if pool is not None:
+            await pool.close()
+    print(stats.summary(), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,65 @@
+import json
+import marshal
+import os
+from typing import Dict, List
+
+INDEX_FORMAT = 1
+DEFAULT_INDEX_NAME = ".card_index.marshal"
+
+
+class CardIndex:
+    """
+    On-disk cache of parsed AgentCards keyed by each card file's mtime and size.
+
+    `load_cards` only re-parses cards whose file changed since the index was written and
+    rewrites the index when anything changed. The index is stored with `marshal`, which
+    loads plain JSON data much faster than re-reading every card; an unreadable or
+    incompatible index is ignored and rebuilt.
+    """
+
+    def __init__(self, index_path: str) -> None:
+        self.index_path = index_path
+        self.parsed = 0  # cards read from their JSON file on the last load
+        self.reused = 0  # cards taken from the index on the last load
+
+    def load_cards(self, paths: List[str]) -> List[dict]:
+        entries = self._read()
+        fresh: Dict[str, tuple] = {}  # path → (mtime_ns, size, card)
+        self.parsed = self.reused = 0
+
+        for path in paths:
+            stat = os.stat(path)
+            entry = entries.get(path)
+            if entry is not None and entry[:2] == (stat.st_mtime_ns, stat.st_size):
+                self.reused += 1
+            else:
+                with open(path, "r") as f:
+                    entry = (stat.st_mtime_ns, stat.st_size, json.load(f))
+                self.parsed += 1
+            fresh[path] = entry
+
+        if self.parsed or fresh.keys() != entries.keys():
+            self._write(fresh)
+        return [entry[2] for entry in fresh.values()]
+
+    def _read(self) -> Dict[str, tuple]:
+        try:
+            with open(self.index_path, "rb") as f:
+                version, entries = marshal.loads(f.read())
+        except (OSError, EOFError, ValueError, TypeError):
+            return {}
+        return entries if version == INDEX_FORMAT else {}
+
+    def _write(self, entries: Dict[str, tuple]) -> None:
+        # Write to a temporary file and rename so readers never see a partial index.
+        tmp_path = f"{self.index_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(marshal.dumps((INDEX_FORMAT, entries)))
+            os.replace(tmp_path, self.index_path)
+        except OSError:
+            # A read-only card directory just means every start re-parses the cards.
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
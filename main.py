@@ -1,7 +1,8 @@
 import asyncio
-import json
+import sys
 from agents.supervisor_agent import SupervisorAgent
 from agent_registry import AgentRegistry
+from protocol.serialization import NDJSONWriter
 
 
 async def main():
@@ -22,13 +23,13 @@ async def main():
     query = "Find recent company news about Acme Inc and pull CRM history for John Doe"
     print(f"\nReceived query: '{query}'")
 
-    # Handle the query and get results
+    # Handle the query and write each JSON-RPC response (one per line) as it arrives
     print("\nDelegating tasks to appropriate agents...")
-    results = await supervisor.handle_query(query)
-
-    # Print the JSON-RPC style aggregated responses
-    print("\nAggregated Agent Responses:\n")
-    print(json.dumps(results, indent=2))
+    print("\nAgent Responses (as they arrive):\n", flush=True)
+    writer = NDJSONWriter(sys.stdout.buffer)
+    async for response in supervisor.handle_query_stream(query):
+        writer.write(response)
+    writer.close()
 
 
 if __name__ == "__main__":
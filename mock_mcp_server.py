@@ -0,0 +1,129 @@
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+
+from agents.crm_research_agent.tools import fetch_mock_crm_page
+from agents.web_research_agent.tools import fetch_mock_article_page
+
+PROTOCOL_VERSION = "2025-06-18"
+
+# tool name → (page function, name of its subject argument)
+TOOLS = {
+    "crm_interactions": (fetch_mock_crm_page, "contact_name"),
+    "company_articles": (fetch_mock_article_page, "company_name"),
+}
+
+
+class MockMCPServer:
+    """
+    A stand-in MCP tool server over stdio, one JSON-RPC message per line, serving the
+    mock CRM and news tool layers a page at a time. Each `tools/call` is answered from
+    its own thread after `latency` seconds, so concurrent calls overlap and replies may
+    arrive out of order. With `crash_after`, the process exits without answering once
+    it has received that many tool calls.
+    """
+
+    def __init__(self, latency: float = 0.0, crash_after: int | None = None) -> None:
+        self.latency = latency
+        self.crash_after = crash_after
+        self.tool_calls = 0
+        self._write_lock = threading.Lock()
+
+    def serve(self, stdin, stdout) -> None:
+        self._stdout = stdout
+        for line in stdin:
+            if not line.strip():
+                continue
+            message = json.loads(line)
+            if "id" not in message:
+                continue  # notifications need no reply
+            if message.get("method") == "tools/call":
+                self.tool_calls += 1
+                if self.crash_after is not None and self.tool_calls > self.crash_after:
+                    os._exit(1)
+                threading.Thread(target=self.answer, args=(message,), daemon=True).start()
+            else:
+                self.answer(message)
+
+    def answer(self, message: dict) -> None:
+        method = message.get("method")
+        if method == "initialize":
+            reply = {
+                "result": {
+                    "protocolVersion": PROTOCOL_VERSION,
+                    "capabilities": {"tools": {}},
+                    "serverInfo": {"name": "mock-mcp-server", "version": "1.0.0"},
+                }
+            }
+        elif method == "tools/list":
+            reply = {"result": {"tools": [self.describe(name) for name in TOOLS]}}
+        elif method == "tools/call":
+            time.sleep(self.latency)
+            reply = {"result": self.call(message.get("params", {}))}
+        else:
+            reply = {"error": {"code": -32601, "message": f"Method not found: {method}"}}
+        self.write({"jsonrpc": "2.0", "id": message["id"], **reply})
+
+    def call(self, params: dict) -> dict:
+        name = params.get("name")
+        if name not in TOOLS:
+            return _tool_error(f"Unknown tool: {name}")
+        fetch_page, subject = TOOLS[name]
+        arguments = params.get("arguments", {})
+        if not arguments.get(subject):
+            return _tool_error(f"Missing '{subject}' argument.")
+        items = fetch_page(
+            arguments[subject],
+            arguments.get("offset", 0),
+            arguments.get("limit"),
+            arguments.get("since"),
+        )
+        page = {"items": items}
+        return {
+            "content": [{"type": "text", "text": json.dumps(page)}],
+            "structuredContent": page,
+        }
+
+    def describe(self, name: str) -> dict:
+        _, subject = TOOLS[name]
+        return {
+            "name": name,
+            "inputSchema": {
+                "type": "object",
+                "properties": {
+                    subject: {"type": "string"},
+                    "since": {"type": ["string", "null"]},
+                    "offset": {"type": "integer"},
+                    "limit": {"type": "integer"},
+                },
+                "required": [subject],
+            },
+        }
+
+    def write(self, message: dict) -> None:
+        with self._write_lock:
+            self._stdout.write(json.dumps(message) + "\n")
+            self._stdout.flush()
+
+
+def _tool_error(message: str) -> dict:
+    return {"content": [{"type": "text", "text": message}], "isError": True}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the mock tool layers over MCP stdio.")
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="seconds each tool call takes"
+    )
+    parser.add_argument(
+        "--crash-after", type=int, help="exit on receiving the tool call after this many"
+    )
+    args = parser.parse_args()
+    MockMCPServer(args.latency, args.crash_after).serve(sys.stdin, sys.stdout)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,80 @@
-from typing import Callable
+import asyncio
+import contextvars
+import inspect
+import time
+from collections import defaultdict
+from collections.abc import Mapping
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import AsyncIterator, Callable
+
+from protocol import deadline as deadlines
+from protocol.cache import MISSING, ResultCache, canonical_key
+from protocol.mcp import MCPToolLayer, MCPToolPool
+from protocol.messages import Response
+from protocol.pagination import PageConfig
+from protocol.tracing import TRACER, trace_id_of
 
 
 class BaseAgent:
-    def __init__(self, tool_layer: Callable):
+    """
+    Common JSON-RPC 2.0 dispatch for all agents.
+
+    Skill handlers may be coroutines, awaited on the event loop, or plain functions,
+    which are treated as blocking and run on the agent's executor so a slow tool layer
+    never stalls other agents. Subclasses choose the executor with `executor_type`
+    ("thread" for I/O-bound tool layers, "process" for CPU-bound skills) and
+    `max_workers`.
+
+    `handle_rpc` serves single requests and batch arrays, and `handle_rpc_stream` the
+    partial results of streaming skills. `apply_card` configures result caching
+    (protocol/cache.py), pagination (protocol/pagination.py), an MCP tool server
+    (protocol/mcp.py) and streaming from the AgentCard.
+    """
+
+    executor_type: str = "thread"
+    max_workers: int | None = 32
+
+    def __init__(self, tool_layer: Callable, executor: Executor | None = None):
         self.tool_layer = tool_layer
         self.methods = self.get_supported_methods()
+        self._executor = executor
+        self._owns_executor = executor is None
+        self.cache: ResultCache | None = None
+        self.result_store = None  # persistent tier under `cache`, if any
+        self.cache_ttls: dict = {}  # method_name → ttl seconds
+        self.pagination: dict = {}  # method_name → PageConfig
+        self.tool_server: MCPToolPool | None = None  # pool behind `tool_layer`, if any
+        self.streaming = False
+        self.name = type(self).__name__
+
+    def apply_card(self, card: dict) -> None:
+        """
+        Applies per-agent settings declared in the AgentCard, such as result caching,
+        page sizes and an MCP tool server.
+        """
+        self.cache_ttls = {
+            skill["id"]: skill["cache"]["ttlSeconds"]
+            for skill in card.get("skills", [])
+            if skill.get("cache", {}).get("ttlSeconds")
+        }
+        if self.cache_ttls:
+            max_entries = card.get("cache", {}).get("maxEntries", 1024)
+            self.cache = ResultCache(max_entries=max_entries, store=self.result_store)
+        else:
+            self.cache = None
+        self.pagination = {
+            skill["id"]: PageConfig.from_config(skill["pagination"])
+            for skill in card.get("skills", [])
+            if "pagination" in skill
+        }
+        if "toolServer" in card:
+            if self.tool_server is not None:
+                self.tool_server.close()
+            self.tool_layer = MCPToolLayer.from_config(card["toolServer"])
+            self.tool_server = self.tool_layer.pool
+        self.streaming = bool(card.get("capabilities", {}).get("streaming"))
+        self.name = card.get("name", self.name)
 
     def get_supported_methods(self) -> dict:
         """
@@ -13,24 +83,310 @@ class BaseAgent:
         """
         raise NotImplementedError("Agents must define supported methods.")
 
-    async def handle_rpc(self, request: dict) -> dict:
+    def get_batch_methods(self) -> dict:
+        """
+        Returns a map of JSON-RPC method names to batch handlers.
+
+        A batch handler takes a list of params dicts and returns a list of results in the
+        same order; an item may be an Exception to fail only that request. Optional.
+        """
+        return {}
+
+    def get_streaming_methods(self) -> dict:
+        """
+        Returns a map of JSON-RPC method names to async-generator handlers that yield
+        partial results. Only used when the AgentCard advertises streaming. Optional.
+        """
+        return {}
+
+    def merge_stream_chunks(self, method: str, chunks: list):
+        """
+        Combines the partial results of a streamed call into its final result.
+
+        By default dict chunks are merged key by key, with list values concatenated;
+        any other chunks are returned as a list.
+        """
+        if not chunks or not all(isinstance(chunk, dict) for chunk in chunks):
+            return chunks
+        merged: dict = {}
+        for chunk in chunks:
+            for key, value in chunk.items():
+                if isinstance(value, list):
+                    merged.setdefault(key, []).extend(value)
+                else:
+                    merged[key] = value
+        return merged
+
+    @property
+    def executor(self) -> Executor:
+        """
+        Executor used for synchronous handlers, created on first use.
+        """
+        if self._executor is None:
+            self._executor = self._create_executor()
+        return self._executor
+
+    def _create_executor(self) -> Executor:
+        if self.executor_type == "thread":
+            return ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix=type(self).__name__,
+            )
+        if self.executor_type == "process":
+            return ProcessPoolExecutor(max_workers=self.max_workers)
+        raise ValueError(f"Unknown executor type: {self.executor_type}")
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Releases the executor if this agent created it, and stops its tool servers.
+        """
+        if self.tool_server is not None:
+            self.tool_server.close()
+        if self._executor is not None and self._owns_executor:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+
+    def __getstate__(self):
+        # Executors, caches (with their in-flight asyncio Tasks), result stores and
+        # tool-server pools cannot be pickled; process-pool workers get a copy of the
+        # agent without them and only ever run handlers inline.
+        state = self.__dict__.copy()
+        state.update(_executor=None, cache=None, result_store=None, tool_server=None)
+        return state
+
+    def _in_context(self, call: Callable) -> Callable:
+        # Executor threads do not inherit context variables; copy them so a blocking
+        # tool layer sees the request's deadline.
+        if self.executor_type == "thread" and deadlines.current() is not None:
+            return partial(contextvars.copy_context().run, call)
+        return call
+
+    async def _invoke(self, handler: Callable, params, method: str = ""):
+        if not TRACER.enabled:
+            if inspect.iscoroutinefunction(handler):
+                return await handler(params)
+            loop = asyncio.get_running_loop()
+            call = self._in_context(handler)
+            return await loop.run_in_executor(self.executor, call, params)
+
+        start = time.perf_counter()
+        try:
+            if inspect.iscoroutinefunction(handler):
+                return await handler(params)
+            loop = asyncio.get_running_loop()
+            if self.executor_type != "thread":
+                return await loop.run_in_executor(self.executor, handler, params)
+
+            picked_up = []
+
+            def timed():
+                picked_up.append(time.perf_counter())
+                return handler(params)
+
+            try:
+                call = self._in_context(timed)
+                return await loop.run_in_executor(self.executor, call)
+            finally:
+                if picked_up:
+                    # Time spent queued behind busy executor workers, recorded on the
+                    # event loop thread like every other stage.
+                    wait = picked_up[0] - start
+                    TRACER.observe("executor_wait", wait, method, self.name)
+        finally:
+            TRACER.record("tool", start, method, self.name)
+
+    async def _call_cached(self, method: str, params: dict):
+        handler = self.methods[method]
+        ttl = self.cache_ttls.get(method)
+        if self.cache is None or not ttl:
+            return await self._invoke(handler, params, method)
+
+        async def shared_call():
+            # Coalesced callers each wait under their own deadline; the call they share
+            # (and the result it caches) must not be cut short by the first one's.
+            with deadlines.serving(None):
+                return await self._invoke(handler, params, method)
+
+        return await self.cache.get_or_call(
+            canonical_key(method, params), ttl, shared_call
+        )
+
+    async def handle_rpc(self, request: Mapping | list) -> Mapping | list | None:
+        if isinstance(request, list):
+            return await self.handle_batch(request)
+        return await self._handle_single(request)
+
+    async def handle_batch(self, requests: list) -> list | Mapping | None:
+        """
+        Handles a JSON-RPC 2.0 batch. Requests for the same method are grouped so a batch
+        handler sees them in one call; everything else runs concurrently. Responses are
+        returned in request order, without entries for notifications.
+        """
+        if not requests:
+            return Response.failure(None, -32600, "Invalid Request: empty batch")
+
+        responses: list = [None] * len(requests)
+        groups = defaultdict(list)  # method_name → [(index, request)]
+        for index, request in enumerate(requests):
+            if not isinstance(request, Mapping):
+                responses[index] = Response.failure(None, -32600, "Invalid Request")
+                continue
+            groups[request.get("method")].append((index, request))
+
+        batch_methods = self.get_batch_methods()
+
+        async def run_single(index: int, request: Mapping):
+            responses[index] = await self._handle_single(request)
+
+        async def run_group(method: str, members: list):
+            ttl = self.cache_ttls.get(method) if self.cache is not None else None
+            results: list = [MISSING] * len(members)
+            keys: list = [None] * len(members)
+            if ttl:
+                for position, (_, request) in enumerate(members):
+                    keys[position] = canonical_key(method, request.get("params", {}))
+                    results[position] = await self.cache.aget(keys[position])
+            misses = []
+            for position, result in enumerate(results):
+                if result is not MISSING:
+                    continue
+                deadline = deadlines.deadline_of(members[position][1])
+                if deadline is not None and deadline.expired():
+                    results[position] = _DeadlineExceeded()
+                else:
+                    misses.append((position, deadline))
+
+            if misses:
+                deadline = deadlines.latest(d for _, d in misses)
+                misses = [p for p, _ in misses]
+                try:
+                    params = [members[p][1].get("params", {}) for p in misses]
+                    call = self._invoke(batch_methods[method], params, method)
+                    with deadlines.serving(deadline):
+                        if deadline is not None and deadline.bounded:
+                            call = asyncio.wait_for(call, deadline.remaining())
+                        fetched = await call
+                    if deadline is not None and deadline.expired():
+                        raise asyncio.TimeoutError  # possibly cut short; don't cache
+                    if len(fetched) != len(misses):
+                        raise RuntimeError(
+                            "Batch handler returned the wrong number of results"
+                        )
+                except asyncio.TimeoutError:
+                    fetched = [_DeadlineExceeded()] * len(misses)
+                except Exception as e:
+                    fetched = [e] * len(misses)
+                for position, result in zip(misses, fetched):
+                    results[position] = result
+                    if ttl and not isinstance(result, Exception):
+                        self.cache.put(keys[position], result, ttl)
+
+            for (index, request), result in zip(members, results):
+                if isinstance(result, _DeadlineExceeded):
+                    responses[index] = _deadline_exceeded(request.get("id"))
+                elif isinstance(result, Exception):
+                    responses[index] = Response.failure(
+                        request.get("id"), -32000, str(result)
+                    )
+                else:
+                    responses[index] = Response(request.get("id"), result)
+
+        coroutines = []
+        for method, members in groups.items():
+            if method in batch_methods and len(members) > 1:
+                coroutines.append(run_group(method, members))
+            else:
+                coroutines.extend(
+                    run_single(index, request) for index, request in members
+                )
+        await asyncio.gather(*coroutines)
+
+        # Notifications (requests without an id) get no response.
+        replies = [
+            response
+            for request, response in zip(requests, responses)
+            if not isinstance(request, Mapping) or "id" in request
+        ]
+        return replies or None
+
+    async def _handle_single(self, request: Mapping) -> Response:
+        if not TRACER.enabled:
+            return await self._respond(request)
+        start = time.perf_counter()
+        try:
+            return await self._respond(request)
+        finally:
+            method = request.get("method")
+            TRACER.record(
+                "handle_rpc",
+                start,
+                # Unknown method names would each add a histogram; pool them.
+                method if method in self.methods else "unknown",
+                self.name,
+                trace_id_of(request.get("id")),
+            )
+
+    async def _respond(self, request: Mapping) -> Response:
         method = request.get("method")
         params = request.get("params", {})
         request_id = request.get("id")
 
         if method not in self.methods:
-            return {
-                "jsonrpc": "2.0",
-                "error": {"code": -32601, "message": f"Method '{method}' not found"},
-                "id": request_id,
-            }
+            return Response.failure(request_id, -32601, f"Method '{method}' not found")
 
+        deadline = deadlines.deadline_of(request)
         try:
-            result = self.methods[method](params)
-            return {"jsonrpc": "2.0", "result": result, "id": request_id}
+            if deadline is None:
+                result = await self._call_cached(method, params)
+            elif deadline.expired():
+                return _deadline_exceeded(request_id)
+            else:
+                with deadlines.serving(deadline):
+                    call = self._call_cached(method, params)
+                    if deadline.bounded:
+                        call = asyncio.wait_for(call, deadline.remaining())
+                    result = await call
+                if deadline.expired():
+                    # A tool layer that saw the deadline expire may have cut the
+                    # result short.
+                    return _deadline_exceeded(request_id)
+            return Response(request_id, result)
+        except asyncio.TimeoutError:
+            return _deadline_exceeded(request_id)
         except Exception as e:
-            return {
-                "jsonrpc": "2.0",
-                "error": {"code": -32000, "message": str(e)},
-                "id": request_id,
-            }
+            return Response.failure(request_id, -32000, str(e))
+
+    async def handle_rpc_stream(self, request: Mapping) -> AsyncIterator[Response]:
+        """
+        Streams the response to a single request. When the AgentCard sets
+        `capabilities.streaming`, skills with a handler in `get_streaming_methods`
+        yield one partial response per chunk (`"final": false`) and then the final
+        response (`"final": true`) with the chunks merged by `merge_stream_chunks`; any
+        other request yields exactly one response, as `handle_rpc` would return it.
+        """
+        method = request.get("method")
+        stream_handler = self.get_streaming_methods().get(method)
+        if not self.streaming or stream_handler is None:
+            yield await self._handle_single(request)
+            return
+
+        request_id = request.get("id")
+        chunks = []
+        try:
+            async for chunk in stream_handler(request.get("params", {})):
+                chunks.append(chunk)
+                yield Response(request_id, chunk, final=False)
+        except Exception as e:
+            yield Response.failure(request_id, -32000, str(e), final=True)
+            return
+        yield Response(request_id, self.merge_stream_chunks(method, chunks), final=True)
+
+
+class _DeadlineExceeded(Exception):
+    """
+    Marks a batch member whose deadline passed before or while it was served.
+    """
+
+
+def _deadline_exceeded(request_id) -> Response:
+    return Response.failure(request_id, -32001, "Deadline exceeded")
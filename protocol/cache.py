@@ -0,0 +1,187 @@
+"""
+Skill result caching for agents.
+
+Skills that declare `cache.ttlSeconds` in their AgentCard entry have their results kept
+in a per-agent `ResultCache`, bounded by the card's top-level `cache.maxEntries`
+(default 1024) and keyed on method and canonical params (`canonical_key`). Concurrent
+identical requests are coalesced into one call. With a `result_store` set by the
+AgentRegistry, cached results also persist across restarts (see
+protocol/result_store.py).
+"""
+
+import asyncio
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable
+
+MISSING = object()
+
+
+def canonical_key(method: str, params: Any) -> str:
+    """
+    Builds a cache key from a method name and its params, independent of key order.
+    """
+    encoded = json.dumps(params, sort_keys=True, separators=(",", ":"), default=str)
+    return f"{method}:{encoded}"
+
+
+class ResultCache:
+    """
+    Bounded LRU cache for skill results with per-entry TTLs and single-flight coalescing.
+
+    Concurrent `get_or_call` requests for the same key share one in-flight call. Only
+    successful results are stored; errors propagate to every waiter and are not cached.
+    Cached values are shared between callers and must be treated as read-only. The
+    shared call runs in the context of the caller that started it, so `call` should not
+    depend on that caller's context (BaseAgent clears the request deadline).
+
+    With a `store` (a protocol.result_store.ResultStore), entries are also written
+    behind to disk, and memory misses are looked up there before counting as misses,
+    so a restarted process starts warm. `get_or_call` and `aget` read the store off the
+    event loop; `get` reads it on the calling thread.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        clock: Callable[[], float] = time.monotonic,
+        store=None,
+    ):
+        self.max_entries = max_entries
+        self._clock = clock
+        self.store = store
+        self._entries: OrderedDict = OrderedDict()  # key → (expires_at, value)
+        self._inflight: dict = {}  # key → asyncio.Task
+        self._waiters: dict = {}  # in-flight asyncio.Task → callers awaiting it
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.coalesced = 0
+        self.store_hits = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Any:
+        """
+        Returns the cached value for `key`, or MISSING. Counts a hit or a miss.
+        """
+        value = self._recall(key)
+        if value is MISSING and self.store is not None:
+            value = self._loaded(key, *self.store.get(key))
+        return self._counted(value)
+
+    async def aget(self, key: str) -> Any:
+        """
+        Like `get`, but reads the store in an executor.
+        """
+        value = self._recall(key)
+        if value is MISSING and self.store is not None:
+            value = self._loaded(key, *await self.store.aget(key))
+        return self._counted(value)
+
+    def put(self, key: str, value: Any, ttl: float) -> None:
+        """
+        Stores `value` for `ttl` seconds, evicting least recently used entries if full,
+        and queues it for the store.
+        """
+        self._remember(key, value, ttl)
+        if self.store is not None:
+            self.store.put_later(key, value, ttl)
+
+    def _recall(self, key: str) -> Any:
+        """
+        Returns the live in-memory value for `key`, or MISSING, without counting.
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[0] > self._clock():
+                self._entries.move_to_end(key)
+                return entry[1]
+            del self._entries[key]
+            self.expirations += 1
+        return MISSING
+
+    def _loaded(self, key: str, value: Any, ttl: float) -> Any:
+        """
+        Keeps a value read from the store in memory for the rest of its TTL.
+        """
+        if value is not MISSING:
+            self.store_hits += 1
+            self._remember(key, value, ttl)
+        return value
+
+    def _counted(self, value: Any) -> Any:
+        if value is MISSING:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def _remember(self, key: str, value: Any, ttl: float) -> None:
+        self._entries[key] = (self._clock() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def get_or_call(
+        self, key: str, ttl: float, call: Callable[[], Awaitable]
+    ) -> Any:
+        """
+        Returns the cached value for `key`, joining an identical in-flight call or starting
+        `call()` on a miss. The shared call keeps running while any waiter remains and
+        is cancelled once all of them are.
+        """
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            value = self._recall(key)
+            if value is not MISSING:
+                self.hits += 1
+                return value
+            task = asyncio.ensure_future(self._load_or_call(key, ttl, call))
+            self._inflight[key] = task
+            self._waiters[task] = 0
+            task.add_done_callback(lambda t: self._inflight.pop(key, None))
+
+        self._waiters[task] += 1
+        try:
+            return await asyncio.shield(task)
+        finally:
+            self._waiters[task] -= 1
+            if not self._waiters[task]:
+                del self._waiters[task]
+                if not task.done():
+                    # Nobody wants the result any more; free the call's resources.
+                    task.cancel()
+                    if self._inflight.get(key) is task:
+                        del self._inflight[key]
+
+    async def _load_or_call(
+        self, key: str, ttl: float, call: Callable[[], Awaitable]
+    ) -> Any:
+        if self.store is not None:
+            value = self._loaded(key, *await self.store.aget(key))
+            if value is not MISSING:
+                self.hits += 1
+                return value
+        self.misses += 1
+        value = await call()
+        self.put(key, value, ttl)
+        return value
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "coalesced": self.coalesced,
+            "store_hits": self.store_hits,
+        }
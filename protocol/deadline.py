@@ -0,0 +1,123 @@
+"""
+Per-query deadlines carried through the agent call tree.
+
+The SupervisorAgent gives every query one `Deadline` (its `query_timeout`, or the
+`timeout` passed with the query), shared by all of its `Task`s. Queueing, attempts,
+retries and backoff only use the time the query has left.
+Across a process boundary a task carries its remaining budget as the request's
+`"timeout"` member (seconds), which the receiving side turns back into a local
+`Deadline`; relative budgets are immune to clock differences between nodes.
+
+While an agent runs a skill, the request's deadline is the *current* deadline, also in
+the executor thread that runs a blocking tool layer. Tool layers call `remaining()` to
+bound their own backend calls and `expired()` to stop early: a deadline also expires
+when the query it belongs to is cancelled. An agent answers a request whose deadline has
+already expired with -32001 without running its skill.
+"""
+
+import math
+import time
+from collections.abc import Mapping
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+
+class Deadline:
+    """
+    An absolute point on the `time.monotonic()` clock, `math.inf` for none, that can
+    also be cancelled.
+    """
+
+    __slots__ = ("at", "cancelled")
+
+    def __init__(self, at: float = math.inf) -> None:
+        self.at = at
+        self.cancelled = False
+
+    @classmethod
+    def after(cls, seconds: float | None) -> "Deadline":
+        return cls(math.inf if seconds is None else time.monotonic() + seconds)
+
+    @property
+    def bounded(self) -> bool:
+        return self.at != math.inf
+
+    def remaining(self) -> float:
+        if self.cancelled:
+            return 0.0
+        return max(0.0, self.at - time.monotonic())
+
+    def expired(self) -> bool:
+        return self.cancelled or time.monotonic() >= self.at
+
+    def cancel(self) -> None:
+        self.cancelled = True
+
+    def __repr__(self) -> str:
+        state = "cancelled" if self.cancelled else f"{self.remaining():.3f}s left"
+        return f"Deadline({state})"
+
+
+_current: ContextVar[Deadline | None] = ContextVar("a2a_deadline", default=None)
+
+
+def current() -> Deadline | None:
+    return _current.get()
+
+
+@contextmanager
+def serving(deadline: Deadline | None):
+    """
+    Makes `deadline` the current deadline inside the block.
+    """
+    token = _current.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current.reset(token)
+
+
+def latest(deadlines) -> Deadline | None:
+    """
+    Returns the deadline of a group of requests served together: the latest one, or
+    None when any of them has no deadline.
+    """
+    found = None
+    for deadline in deadlines:
+        if deadline is None:
+            return None
+        if found is None or deadline.at > found.at:
+            found = deadline
+    return found
+
+
+def remaining() -> float | None:
+    """
+    Seconds left for the request being served, or None when it has no time limit.
+    """
+    deadline = _current.get()
+    if deadline is None or not (deadline.bounded or deadline.cancelled):
+        return None
+    return deadline.remaining()
+
+
+def expired() -> bool:
+    """
+    True once the request being served ran out of time or was cancelled.
+    """
+    deadline = _current.get()
+    return deadline is not None and deadline.expired()
+
+
+def deadline_of(request) -> Deadline | None:
+    """
+    Returns the deadline of a request: a Task's own Deadline, or one built from the
+    `"timeout"` member of a decoded request dict.
+    """
+    deadline = getattr(request, "deadline", None)
+    if deadline is not None or not isinstance(request, Mapping):
+        return deadline
+    timeout = request.get("timeout")
+    if isinstance(timeout, (int, float)) and not isinstance(timeout, bool):
+        return Deadline.after(max(0.0, timeout))
+    return None
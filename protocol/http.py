@@ -0,0 +1,209 @@
+"""
+Minimal HTTP/1.1 plumbing on asyncio streams for JSON-RPC front-ends.
+
+Only what the PoC needs is implemented: Content-Length request bodies, persistent
+(keep-alive) connections, fixed-length responses and chunked responses for streaming,
+plus the client side (`write_request`/`read_response`) used by remote transports.
+"""
+
+import asyncio
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Awaitable, Callable, Dict
+
+MAX_HEADER_LINES = 100
+MAX_BODY_BYTES = 16 * 1024 * 1024
+
+REASONS = {
+    200: "OK",
+    204: "No Content",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    411: "Length Required",
+    413: "Payload Too Large",
+}
+
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str = ""):
+        super().__init__(message or REASONS.get(status, ""))
+        self.status = status
+
+
+@dataclass
+class HTTPRequest:
+    method: str
+    path: str
+    version: str
+    headers: Dict[str, str] = field(default_factory=dict)  # lower-cased names
+    body: bytes = b""
+
+    @property
+    def keep_alive(self) -> bool:
+        connection = self.headers.get("connection", "").lower()
+        if self.version == "HTTP/1.0":
+            return connection == "keep-alive"
+        return connection != "close"
+
+
+async def read_request(reader: asyncio.StreamReader) -> HTTPRequest | None:
+    """
+    Reads one request from a connection, or returns None when the peer closed it.
+    """
+    request_line = await reader.readline()
+    if not request_line:
+        return None
+    try:
+        method, path, version = request_line.decode("latin-1").split()
+    except ValueError:
+        raise HTTPError(400, "Malformed request line")
+
+    headers = {}
+    for _ in range(MAX_HEADER_LINES):
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    else:
+        raise HTTPError(400, "Too many headers")
+
+    body = b""
+    if method in ("POST", "PUT"):
+        if "content-length" not in headers:
+            raise HTTPError(411)
+        try:
+            length = int(headers["content-length"])
+        except ValueError:
+            length = -1
+        if length < 0:
+            raise HTTPError(400, "Invalid Content-Length")
+        if length > MAX_BODY_BYTES:
+            raise HTTPError(413)
+        body = await reader.readexactly(length)
+    return HTTPRequest(method, path, version, headers, body)
+
+
+def _head(status: int, headers: Dict[str, str], keep_alive: bool) -> bytes:
+    lines = [f"HTTP/1.1 {status} {REASONS.get(status, '')}"]
+    lines += [f"{name}: {value}" for name, value in headers.items()]
+    lines.append(f"Connection: {'keep-alive' if keep_alive else 'close'}")
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+
+async def write_response(
+    writer: asyncio.StreamWriter,
+    status: int,
+    body: bytes = b"",
+    content_type: str = "application/json",
+    keep_alive: bool = True,
+) -> None:
+    headers = {"Content-Type": content_type, "Content-Length": str(len(body))}
+    writer.write(_head(status, headers, keep_alive) + body)
+    await writer.drain()
+
+
+async def write_chunked(
+    writer: asyncio.StreamWriter,
+    chunks: AsyncIterator[bytes],
+    content_type: str,
+    keep_alive: bool = True,
+) -> None:
+    """
+    Writes a 200 response using chunked transfer encoding, flushing every chunk.
+    """
+    headers = {
+        "Content-Type": content_type,
+        "Transfer-Encoding": "chunked",
+        "Cache-Control": "no-cache",
+    }
+    writer.write(_head(200, headers, keep_alive))
+    async for chunk in chunks:
+        if chunk:
+            writer.write(b"%x\r\n%b\r\n" % (len(chunk), chunk))
+            await writer.drain()
+    writer.write(b"0\r\n\r\n")
+    await writer.drain()
+
+
+def write_request(
+    writer: asyncio.StreamWriter, host: str, path: str, body: bytes
+) -> None:
+    """
+    Writes a keep-alive JSON POST request. The caller drains the writer.
+    """
+    head = (
+        f"POST {path} HTTP/1.1\r\n"
+        f"Host: {host}\r\n"
+        "Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        "Connection: keep-alive\r\n\r\n"
+    )
+    writer.write(head.encode("latin-1") + body)
+
+
+async def read_response(reader: asyncio.StreamReader) -> tuple:
+    """
+    Reads one response and returns (status, headers, body), de-chunking if needed.
+    """
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError("Connection closed by peer")
+    try:
+        status = int(status_line.decode("latin-1").split()[1])
+    except (IndexError, ValueError):
+        raise ConnectionError("Malformed status line")
+
+    headers = {}
+    for _ in range(MAX_HEADER_LINES):
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    if headers.get("transfer-encoding", "").lower() == "chunked":
+        chunks = []
+        while True:
+            size = int((await reader.readline()).split(b";")[0], 16)
+            if size == 0:
+                await reader.readline()
+                break
+            chunks.append(await reader.readexactly(size))
+            await reader.readline()
+        body = b"".join(chunks)
+    else:
+        body = await reader.readexactly(int(headers.get("content-length", 0)))
+    return status, headers, body
+
+
+Handler = Callable[[HTTPRequest, asyncio.StreamWriter], Awaitable[None]]
+
+
+def connection_handler(handler: Handler):
+    """
+    Wraps a per-request handler into an asyncio connection callback that serves
+    requests until the client closes the connection or asks for `Connection: close`.
+    """
+
+    async def serve(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    request = await read_request(reader)
+                except HTTPError as e:
+                    await write_response(
+                        writer, e.status, str(e).encode(), "text/plain", False
+                    )
+                    break
+                if request is None:
+                    break
+                await handler(request, writer)
+                if not request.keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    return serve
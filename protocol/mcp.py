@@ -0,0 +1,384 @@
+"""
+MCP tool servers as agent tool layers.
+
+An MCP tool server is a subprocess that speaks JSON-RPC 2.0 over stdio, one message
+per line. `MCPToolPool` keeps `size` long-lived servers of one command warm: each is
+spawned and initialized once, concurrent `tools/call` requests are multiplexed over
+its pipes by request id, and every call goes to the server with the fewest requests
+outstanding. A server that exits fails its outstanding calls with ConnectionError.
+Calls keep going to the servers still running while its slot is respawned in the
+background; only a call that finds no server running waits for a spawn. After a failed
+spawn, slots are not retried for an exponentially growing backoff (RESPAWN_BACKOFF up to
+RESPAWN_BACKOFF_MAX seconds), and calls with no server running fail fast meanwhile.
+
+An agent uses a pool when its AgentCard declares a `toolServer`:
+
+    "toolServer": {
+        "command": ["python", "mock_mcp_server.py"],
+        "tool": "crm_interactions",
+        "arguments": ["contact_name"],
+        "poolSize": 4,
+        "pageSize": 50
+    }
+
+The agent's `tool_layer` then becomes an MCPToolLayer over the named tool: an async
+iterator over the items of the tool's pages, which is what the paginated skills read
+(see protocol/pagination.py). `arguments` names the tool layer's positional
+parameters. A leading "python" in `command` runs the current interpreter.
+"""
+
+import asyncio
+import itertools
+import sys
+from typing import Any, AsyncIterator, Dict, List, Sequence
+
+from protocol.serialization import DEFAULT_SERIALIZER
+
+MCP_PROTOCOL_VERSION = "2025-06-18"
+STREAM_LIMIT = 2**24  # longest message line from a tool server, in bytes
+CLIENT_INFO = {"name": "a2a-mcp-poc", "version": "1.0.0"}
+RESPAWN_BACKOFF = 0.5  # seconds before retrying after the first failed spawn
+RESPAWN_BACKOFF_MAX = 30.0
+
+
+class ToolError(Exception):
+    """
+    Raised when a tool server answers with a JSON-RPC error or a tool result flagged
+    `isError`.
+    """
+
+
+class MCPServerProcess:
+    """
+    One running tool server. Sends requests with process-local ids and resolves them
+    as the server's replies arrive, in any order.
+    """
+
+    def __init__(self, process: asyncio.subprocess.Process) -> None:
+        self.process = process
+        self._ids = itertools.count(1)
+        self._pending: Dict[int, asyncio.Future] = {}  # request id → reply future
+        self._closed = False
+        self._listener = asyncio.ensure_future(self._listen())
+
+    @classmethod
+    async def spawn(cls, command: Sequence[str]) -> "MCPServerProcess":
+        """
+        Starts the server and completes the MCP initialization handshake.
+        """
+        process = await asyncio.create_subprocess_exec(
+            *command,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            limit=STREAM_LIMIT,
+        )
+        server = cls(process)
+        try:
+            await server.request(
+                "initialize",
+                {
+                    "protocolVersion": MCP_PROTOCOL_VERSION,
+                    "capabilities": {},
+                    "clientInfo": CLIENT_INFO,
+                },
+            )
+            server.notify("notifications/initialized")
+        except BaseException:
+            server.close()
+            raise
+        return server
+
+    @property
+    def alive(self) -> bool:
+        return not self._closed and not self._listener.done()
+
+    @property
+    def outstanding(self) -> int:
+        return len(self._pending)
+
+    async def request(self, method: str, params: Dict | None = None) -> Any:
+        """
+        Sends a request and returns its result.
+
+        Raises:
+            ConnectionError: If the server exited.
+            ToolError: If the server answered with a JSON-RPC error.
+        """
+        if not self.alive:
+            raise ConnectionError(f"MCP tool server {self.process.pid} exited")
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        try:
+            try:
+                self._send(
+                    {
+                        "jsonrpc": "2.0",
+                        "id": request_id,
+                        "method": method,
+                        "params": params or {},
+                    }
+                )
+                await self.process.stdin.drain()
+            except ConnectionError:
+                # The pipe broke before the listener saw the server exit.
+                self.close()
+                raise ConnectionError(f"MCP tool server {self.process.pid} exited")
+            reply = await future
+        finally:
+            self._pending.pop(request_id, None)
+        if "error" in reply:
+            raise ToolError(reply["error"].get("message", "Tool server error"))
+        return reply.get("result")
+
+    def notify(self, method: str, params: Dict | None = None) -> None:
+        message = {"jsonrpc": "2.0", "method": method}
+        if params is not None:
+            message["params"] = params
+        self._send(message)
+
+    def close(self) -> None:
+        """
+        Closes the server's stdin, which asks it to exit, and terminates it.
+        """
+        self._closed = True
+        try:
+            if self.process.returncode is None:
+                self.process.stdin.close()
+                self.process.terminate()
+            self._listener.cancel()
+        except (ProcessLookupError, RuntimeError):
+            pass  # already exited, or its event loop is closed
+
+    async def wait_closed(self) -> None:
+        await self.process.wait()
+
+    def _send(self, message: Dict) -> None:
+        self.process.stdin.write(DEFAULT_SERIALIZER.dumps(message) + b"\n")
+
+    async def _listen(self) -> None:
+        try:
+            while line := await self.process.stdout.readline():
+                reply = DEFAULT_SERIALIZER.loads(line)
+                future = self._pending.get(reply.get("id"))
+                if future is not None and not future.done():
+                    future.set_result(reply)
+        except (ConnectionError, ValueError):
+            pass  # the server died or wrote garbage; fail its requests below
+        finally:
+            exited = ConnectionError(f"MCP tool server {self.process.pid} exited")
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(exited)
+
+
+class MCPToolPool:
+    """
+    A warm pool of `size` tool servers running `command`. Servers are spawned on the
+    first call; a server that has exited is replaced in the background, or by the next
+    call if no server is left.
+    """
+
+    def __init__(self, command: Sequence[str], size: int = 1) -> None:
+        command = list(command)
+        if command and command[0] == "python":
+            command[0] = sys.executable
+        self.command = command
+        self.size = size
+        self._servers: List[MCPServerProcess | None] = [None] * size
+        self._lock: asyncio.Lock | None = None
+        self._respawning: asyncio.Task | None = None
+        self._backoff = 0.0
+        self._retry_at = 0.0  # event loop time before which slots are not respawned
+        self._failure: BaseException | None = None  # the last failed spawn's error
+        self.calls = 0
+        self.restarts = 0
+        self.spawn_failures = 0
+
+    @classmethod
+    def from_config(cls, config: dict) -> "MCPToolPool":
+        return cls(config["command"], size=config.get("poolSize", 1))
+
+    async def call_tool(self, name: str, arguments: Dict) -> Any:
+        """
+        Calls tool `name` and returns its structured result (`structuredContent`, or
+        the JSON-decoded text of its first content item).
+
+        Raises:
+            ConnectionError: If the server handling the call exited.
+            ToolError: If the tool failed.
+        """
+        server = await self._choose()
+        self.calls += 1
+        result = await server.request(
+            "tools/call", {"name": name, "arguments": arguments}
+        )
+        if result.get("isError"):
+            raise ToolError(_text(result) or f"Tool {name} failed")
+        if "structuredContent" in result:
+            return result["structuredContent"]
+        text = _text(result)
+        return DEFAULT_SERIALIZER.loads(text) if text else None
+
+    def close(self) -> None:
+        """
+        Stops every server. The pool restarts them if it is used again.
+        """
+        if self._respawning is not None:
+            self._respawning.cancel()
+            self._respawning = None
+        for server in self._servers:
+            if server is not None:
+                server.close()
+        self._servers = [None] * self.size
+
+    async def aclose(self) -> None:
+        """
+        Stops every server and waits for the processes to exit.
+        """
+        servers = [server for server in self._servers if server is not None]
+        self.close()
+        await asyncio.gather(*(server.wait_closed() for server in servers))
+
+    def stats(self) -> dict:
+        return {
+            "size": self.size,
+            "alive": sum(1 for s in self._servers if s is not None and s.alive),
+            "outstanding": sum(s.outstanding for s in self._servers if s is not None),
+            "calls": self.calls,
+            "restarts": self.restarts,
+            "spawn_failures": self.spawn_failures,
+        }
+
+    async def _choose(self) -> MCPServerProcess:
+        alive = self._alive()
+        if len(alive) == self.size:
+            return min(alive, key=lambda server: server.outstanding)
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        if alive:
+            if self._respawning is None or self._respawning.done():
+                self._respawning = asyncio.ensure_future(self._respawn())
+        else:
+            # Nothing to route to: this call waits for a server.
+            async with self._lock:
+                if not self._alive():
+                    await self._replace_exited()
+            alive = self._alive()
+        return min(alive, key=lambda server: server.outstanding)
+
+    def _alive(self) -> List[MCPServerProcess]:
+        return [s for s in self._servers if s is not None and s.alive]
+
+    async def _respawn(self) -> None:
+        async with self._lock:
+            try:
+                await self._replace_exited()
+            except ConnectionError:
+                pass  # calls that find no server running report it
+
+    async def _replace_exited(self) -> None:
+        """
+        Spawns a server in every empty or exited slot, unless a failed spawn's backoff
+        has not yet elapsed. Slots whose server fails to start stay empty; this raises
+        ConnectionError only if no server is running.
+        """
+        loop = asyncio.get_running_loop()
+        if loop.time() < self._retry_at:
+            if not self._alive():
+                raise ConnectionError(
+                    f"Cannot start MCP tool server: {self._failure} (retrying in "
+                    f"{self._retry_at - loop.time():.1f} s)"
+                )
+            return
+        slots = [
+            index
+            for index, server in enumerate(self._servers)
+            if server is None or not server.alive
+        ]
+        if not slots:
+            return
+        spawned = await asyncio.gather(
+            *(MCPServerProcess.spawn(self.command) for _ in slots),
+            return_exceptions=True,
+        )
+        failure = None
+        for index, server in zip(slots, spawned):
+            if isinstance(server, BaseException):
+                failure = server
+                self.spawn_failures += 1
+                continue
+            if self._servers[index] is not None:
+                self._servers[index].close()
+                self.restarts += 1
+            self._servers[index] = server
+        if failure is None:
+            self._backoff = 0.0
+        else:
+            self._failure = failure
+            self._backoff = min(
+                max(self._backoff * 2, RESPAWN_BACKOFF), RESPAWN_BACKOFF_MAX
+            )
+            self._retry_at = loop.time() + self._backoff
+        if not self._alive():
+            raise ConnectionError(f"Cannot start MCP tool server: {failure}")
+
+
+class MCPToolLayer:
+    """
+    A paginated tool layer backed by an MCP tool. Calling it with the tool layer's
+    arguments returns an async iterator over the items of the tool's pages: each page is
+    one `tools/call` with the arguments plus `offset` and `limit` (`page_size`),
+    answering `{"items": [...]}`, and the next page is requested only when the caller
+    reads past the current one.
+    """
+
+    def __init__(
+        self,
+        pool: MCPToolPool,
+        tool: str,
+        arguments: Sequence[str] = (),
+        page_size: int = 50,
+    ) -> None:
+        self.pool = pool
+        self.tool = tool
+        self.arguments = tuple(arguments)
+        self.page_size = page_size
+
+    @classmethod
+    def from_config(cls, config: dict) -> "MCPToolLayer":
+        return cls(
+            MCPToolPool.from_config(config),
+            config["tool"],
+            config.get("arguments", ()),
+            config.get("pageSize", 50),
+        )
+
+    def __call__(self, *args, **kwargs) -> AsyncIterator:
+        if len(args) > len(self.arguments):
+            raise TypeError(
+                f"Tool {self.tool} takes {len(self.arguments)} positional arguments"
+            )
+        arguments = dict(zip(self.arguments, args))
+        arguments.update(kwargs)
+        return self._items(arguments)
+
+    async def _items(self, arguments: Dict):
+        offset = arguments.pop("offset", 0) or 0
+        while True:
+            page = await self.pool.call_tool(
+                self.tool, {**arguments, "offset": offset, "limit": self.page_size}
+            )
+            items = page.get("items", [])
+            for item in items:
+                yield item
+            if len(items) < self.page_size:
+                return
+            offset += len(items)
+
+
+def _text(result: Dict) -> str | None:
+    for content in result.get("content", ()):
+        if content.get("type") == "text":
+            return content.get("text")
+    return None
@@ -0,0 +1,180 @@
+"""
+Compact JSON-RPC 2.0 messages used inside the process.
+
+`Task` (a request) and `Response` store only their variable fields in `__slots__`;
+the constant `"jsonrpc": "2.0"` member and the per-message dict of a wire-format
+object are only materialized when a message leaves the process. Both are read-only
+`Mapping`s over their wire-format keys, so code that reads `task["method"]`,
+`"error" in response` or compares a message with a dict works on them and on plain
+decoded dicts alike.
+
+Encode at the boundary with `json.dumps(payload, default=to_wire)`, which also
+converts messages nested inside lists or results.
+
+Agents accept Tasks or decoded JSON dicts as requests and answer with Responses, which
+are encoded only when they leave the process.
+
+A Task may carry its query's `Deadline` (see protocol/deadline.py); on the wire a
+bounded deadline becomes the `"timeout"` member, the seconds left at encoding time.
+"""
+
+from collections.abc import Mapping
+
+from protocol.deadline import Deadline
+
+JSONRPC_VERSION = "2.0"
+
+_TASK_KEYS = ("jsonrpc", "method", "params", "id")
+_TIMED_TASK_KEYS = _TASK_KEYS + ("timeout",)
+
+
+class Task(Mapping):
+    """
+    A JSON-RPC 2.0 request with an id and an optional deadline. Treat instances as
+    immutable.
+    """
+
+    __slots__ = ("method", "params", "id", "deadline")
+
+    def __init__(
+        self, method: str, params: dict, id, deadline: Deadline | None = None
+    ) -> None:
+        self.method = method
+        self.params = params
+        self.id = id
+        self.deadline = deadline
+
+    def __getitem__(self, key: str):
+        if key == "method":
+            return self.method
+        if key == "params":
+            return self.params
+        if key == "id":
+            return self.id
+        if key == "jsonrpc":
+            return JSONRPC_VERSION
+        if key == "timeout" and self.timed:
+            return self.deadline.remaining()
+        raise KeyError(key)
+
+    @property
+    def timed(self) -> bool:
+        """
+        True when the task has a bounded deadline to send along as `"timeout"`.
+        """
+        return self.deadline is not None and self.deadline.bounded
+
+    def get(self, key: str, default=None):
+        return self[key] if key in self else default
+
+    def __contains__(self, key) -> bool:
+        return key in _TASK_KEYS or (key == "timeout" and self.timed)
+
+    def __iter__(self):
+        return iter(_TIMED_TASK_KEYS if self.timed else _TASK_KEYS)
+
+    def __len__(self) -> int:
+        return 5 if self.timed else 4
+
+    def __repr__(self) -> str:
+        return f"Task({self.method!r}, {self.params!r}, id={self.id!r})"
+
+    def to_wire(self) -> dict:
+        message = {
+            "jsonrpc": JSONRPC_VERSION,
+            "method": self.method,
+            "params": self.params,
+            "id": self.id,
+        }
+        if self.timed:
+            message["timeout"] = self.deadline.remaining()
+        return message
+
+
+class Response(Mapping):
+    """
+    A JSON-RPC 2.0 response carrying either `result` or `error` (a {"code", "message"}
+    dict). Streamed partial and final responses also carry `final`. Treat instances as
+    immutable; `with_id` returns a copy for another request.
+    """
+
+    __slots__ = ("id", "result", "error", "final")
+
+    def __init__(self, id, result=None, error: dict | None = None, final=None) -> None:
+        self.id = id
+        self.result = result
+        self.error = error
+        self.final = final
+
+    @classmethod
+    def failure(cls, id, code: int, message: str, final=None) -> "Response":
+        return cls(id, error={"code": code, "message": message}, final=final)
+
+    def with_id(self, id) -> "Response":
+        return Response(id, self.result, self.error, self.final)
+
+    def __getitem__(self, key: str):
+        if key == "id":
+            return self.id
+        if key == "result" and self.error is None:
+            return self.result
+        if key == "error" and self.error is not None:
+            return self.error
+        if key == "jsonrpc":
+            return JSONRPC_VERSION
+        if key == "final" and self.final is not None:
+            return self.final
+        raise KeyError(key)
+
+    def get(self, key: str, default=None):
+        return self[key] if key in self else default
+
+    def __contains__(self, key) -> bool:
+        if key == "error":
+            return self.error is not None
+        if key == "result":
+            return self.error is None
+        if key == "final":
+            return self.final is not None
+        return key == "id" or key == "jsonrpc"
+
+    def __iter__(self):
+        yield "jsonrpc"
+        yield "result" if self.error is None else "error"
+        yield "id"
+        if self.final is not None:
+            yield "final"
+
+    def __len__(self) -> int:
+        return 3 if self.final is None else 4
+
+    def __repr__(self) -> str:
+        return f"Response({self.to_wire()!r})"
+
+    def to_wire(self) -> dict:
+        if self.error is None:
+            message = {"jsonrpc": JSONRPC_VERSION, "result": self.result, "id": self.id}
+        else:
+            message = {"jsonrpc": JSONRPC_VERSION, "error": self.error, "id": self.id}
+        if self.final is not None:
+            message["final"] = self.final
+        return message
+
+
+def to_wire(message):
+    """
+    `default` hook for `json.dumps` that encodes Task and Response objects.
+    """
+    if isinstance(message, (Task, Response)):
+        return message.to_wire()
+    raise TypeError(f"Object of type {type(message).__name__} is not JSON serializable")
+
+
+def with_id(response: Mapping, id) -> Mapping:
+    """
+    Returns `response` addressed to request `id`, for Response objects and decoded
+    dicts alike.
+    """
+    if isinstance(response, Response):
+        return response.with_id(id)
+    return {**response, "id": id}
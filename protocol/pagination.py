@@ -0,0 +1,149 @@
+"""
+Cursor pagination for skills that return long, newest-first lists.
+
+A skill opts in with a `pagination` object in its AgentCard entry:
+
+    "pagination": {"defaultLimit": 20, "maxLimit": 100}
+
+and then accepts three optional params: `limit` (items per page, at most `maxLimit`,
+`defaultLimit` when omitted), `cursor` (the `next_cursor` of the previous page) and
+`since` (an ISO date; only items dated on or after it). Every page carries
+`next_cursor`, which is None on the last page.
+
+Tool layers of paginated skills return an async iterator over the items, newest first,
+starting at a given offset and stopping at the first item older than `since`. A page
+reads at most `limit + 1` items (the extra one tells whether another page follows) and
+then closes the iterator, so the backend is never asked for more than one page.
+An agent keeps the `PageConfig` of each paginated skill in its `pagination` map. A
+SupervisorAgent with `page_size` set asks paginated skills for at most that many items.
+"""
+
+import base64
+import binascii
+from dataclasses import dataclass
+from datetime import datetime
+from typing import AsyncIterator, Tuple
+
+
+@dataclass(frozen=True)
+class PageConfig:
+    """
+    Page size settings for one skill, built from the `pagination` object in an
+    AgentCard.
+    """
+
+    default_limit: int | None = None
+    max_limit: int | None = None
+
+    @classmethod
+    def from_config(cls, config: dict) -> "PageConfig":
+        return cls(
+            default_limit=config.get("defaultLimit"),
+            max_limit=config.get("maxLimit"),
+        )
+
+
+@dataclass(frozen=True)
+class Page:
+    """
+    One requested page: at most `limit` items (None for all), `offset` items into the
+    list filtered by `since`.
+    """
+
+    limit: int | None = None
+    offset: int = 0
+    since: str | None = None
+
+    @classmethod
+    def from_params(cls, params: dict, config: PageConfig | None = None) -> "Page":
+        """
+        Reads `limit`, `cursor` and `since` from a request's params.
+
+        Raises:
+            ValueError: If any of them is malformed.
+        """
+        config = config or PageConfig()
+        limit = params.get("limit", config.default_limit)
+        if limit is not None:
+            if isinstance(limit, bool) or not isinstance(limit, int) or limit < 1:
+                raise ValueError("Invalid 'limit' parameter.")
+            if config.max_limit is not None:
+                limit = min(limit, config.max_limit)
+
+        cursor = params.get("cursor")
+        offset = decode_cursor(cursor) if cursor is not None else 0
+
+        since = params.get("since")
+        if since is not None:
+            try:
+                datetime.fromisoformat(since)
+            except (TypeError, ValueError):
+                raise ValueError("Invalid 'since' parameter.") from None
+        return cls(limit, offset, since)
+
+    @property
+    def fetch_limit(self) -> int | None:
+        """
+        Items to read from the backend: one more than the page holds.
+        """
+        return None if self.limit is None else self.limit + 1
+
+    def cut(self, items: list) -> Tuple[list, str | None]:
+        """
+        Splits up to `fetch_limit` fetched items into the page and its `next_cursor`.
+        """
+        if self.limit is None or len(items) <= self.limit:
+            return items, None
+        return items[: self.limit], self.next_cursor()
+
+    def next_cursor(self) -> str:
+        """
+        The cursor of the page that follows this one.
+        """
+        return encode_cursor(self.offset + (self.limit or 0))
+
+
+async def read_page(items: AsyncIterator, page: Page) -> Tuple[list, str | None]:
+    """
+    Reads one page from a tool layer's async iterator and closes it. Returns the page's
+    items and its `next_cursor`.
+    """
+    fetched = []
+    try:
+        async for item in items:
+            fetched.append(item)
+            if len(fetched) == page.fetch_limit:
+                break
+    finally:
+        await aclose(items)
+    return page.cut(fetched)
+
+
+async def aclose(items: AsyncIterator) -> None:
+    """
+    Closes an async iterator early, letting an async-generator tool layer release its
+    backend connection.
+    """
+    close = getattr(items, "aclose", None)
+    if close is not None:
+        await close()
+
+
+def encode_cursor(offset: int) -> str:
+    return base64.urlsafe_b64encode(f"offset:{offset}".encode()).decode()
+
+
+def decode_cursor(cursor) -> int:
+    """
+    Returns the offset a cursor points at.
+
+    Raises:
+        ValueError: If the cursor was not issued by `encode_cursor`.
+    """
+    try:
+        kind, _, offset = base64.urlsafe_b64decode(cursor).decode().partition(":")
+        if kind == "offset" and offset.isdigit():
+            return int(offset)
+    except (TypeError, ValueError, binascii.Error):
+        pass
+    raise ValueError("Invalid 'cursor' parameter.")
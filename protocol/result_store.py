@@ -0,0 +1,278 @@
+"""
+A persistent tier under the per-agent result caches, so cached tool results survive
+restarts.
+
+`ResultStore` keeps skill results in one SQLite database, keyed like ResultCache
+entries (skill and canonical params, see `canonical_key`). Each entry expires at a
+wall-clock time set from its skill's `cache.ttlSeconds`, so an entry written before a
+restart is served only while it would still have been served from memory.
+
+Several worker processes can share one database file: it runs in WAL mode, so readers
+never wait for a writer, and concurrent writers wait up to `timeout` seconds for each
+other. Every process opens its own connections, one for reads and one for writes (a
+store passed to a child process, or inherited through fork, reconnects on first use).
+
+The event loop never runs SQLite itself. `aget` reads in the loop's default executor,
+and `put_later` queues writes on the store's single writer thread and returns at once
+(`flush` waits for them). `get` and `put` are the blocking calls behind both.
+
+The store holds at most about `max_bytes` of encoded results. Every `compact_every`
+writes it queues a compaction on the writer thread, which deletes expired entries and,
+if still over the limit, the oldest ones until the store is back under `low_water` of
+it.
+"""
+
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable
+
+from protocol.cache import MISSING
+from protocol.serialization import Serializer
+
+_SERIALIZER = Serializer()
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    stored_at REAL NOT NULL,
+    expires_at REAL NOT NULL
+)
+"""
+
+
+class ResultStore:
+    """
+    SQLite-backed store of JSON-encodable skill results with per-entry expiry times.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int = 256 * 2**20,
+        compact_every: int = 1024,
+        low_water: float = 0.9,
+        timeout: float = 5.0,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.path = path
+        self.max_bytes = max_bytes
+        self.compact_every = compact_every
+        self.low_water = low_water
+        self.timeout = timeout
+        self._clock = clock
+        self._lock = threading.Lock()  # guards the write connection
+        self._read_lock = threading.Lock()  # guards the read connection
+        self._connection: sqlite3.Connection | None = None
+        self._reader: sqlite3.Connection | None = None
+        self._writer: ThreadPoolExecutor | None = None
+        self._pid: int | None = None
+        self._writes = 0
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.compacted = 0
+        self.skipped = 0
+        self._connect()
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state.update(
+            _lock=None,
+            _read_lock=None,
+            _connection=None,
+            _reader=None,
+            _writer=None,
+            _pid=None,
+        )
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+        self._read_lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._read_lock:
+            (count,) = self._read_db().execute(
+                "SELECT COUNT(*) FROM results WHERE expires_at > ?", (self._clock(),)
+            ).fetchone()
+        return count
+
+    def get(self, key: str) -> tuple:
+        """
+        Returns the live value stored for `key` and its remaining TTL in seconds, or
+        (MISSING, 0.0).
+        """
+        now = self._clock()
+        with self._read_lock:
+            row = self._read_db().execute(
+                "SELECT value, expires_at FROM results WHERE key = ? AND expires_at > ?",
+                (key, now),
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return MISSING, 0.0
+            self.hits += 1
+        return _SERIALIZER.loads(row[0]), row[1] - now
+
+    async def aget(self, key: str) -> tuple:
+        """
+        `get` run in the event loop's default executor.
+        """
+        return await asyncio.get_running_loop().run_in_executor(None, self.get, key)
+
+    def put(self, key: str, value: Any, ttl: float) -> None:
+        """
+        Stores `value` for `ttl` seconds. Values that are not JSON data, or larger than
+        the whole store, are skipped.
+        """
+        try:
+            payload = _SERIALIZER.dumps(value)
+        except TypeError:  # not JSON data; keep it out of the store
+            self.skipped += 1
+            return
+        if len(payload) > self.max_bytes:
+            self.skipped += 1
+            return
+        now = self._clock()
+        with self._lock:
+            connection = self._db()
+            with connection:
+                connection.execute(
+                    "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)",
+                    (key, payload, len(payload), now, now + ttl),
+                )
+            self.writes += 1
+            self._writes += 1
+            compact = self._writes >= self.compact_every
+            if compact:
+                self._writes = 0
+        if compact:
+            self._writer_thread().submit(self.compact)
+
+    def put_later(self, key: str, value: Any, ttl: float) -> Future:
+        """
+        Queues `put(key, value, ttl)` on the writer thread and returns without waiting.
+        """
+        return self._writer_thread().submit(self.put, key, value, ttl)
+
+    def flush(self) -> None:
+        """
+        Waits until every write and compaction queued so far has finished.
+        """
+        if self._writer is not None and self._pid == os.getpid():
+            self._writer.submit(lambda: None).result()
+
+    def compact(self) -> int:
+        """
+        Deletes expired entries, then the oldest entries while the store holds more
+        than `max_bytes`. Returns how many entries were deleted.
+        """
+        with self._lock:
+            deleted = self._compact(self._db(), self._clock())
+        self.compacted += deleted
+        return deleted
+
+    def clear(self) -> None:
+        with self._lock:
+            connection = self._db()
+            with connection:
+                connection.execute("DELETE FROM results")
+
+    def close(self) -> None:
+        """
+        Finishes the queued writes and closes the connections.
+        """
+        if self._writer is not None and self._pid == os.getpid():
+            self._writer.shutdown(wait=True)
+        self._writer = None
+        with self._read_lock, self._lock:
+            if self._pid == os.getpid():
+                for connection in (self._connection, self._reader):
+                    if connection is not None:
+                        connection.close()
+            self._connection = None
+            self._reader = None
+            self._pid = None
+
+    def stats(self) -> dict:
+        with self._read_lock:
+            count, size = self._read_db().execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results"
+            ).fetchone()
+        return {
+            "entries": count,
+            "bytes": size,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "compacted": self.compacted,
+            "skipped": self.skipped,
+        }
+
+    def _compact(self, connection: sqlite3.Connection, now: float) -> int:
+        with connection:
+            deleted = connection.execute(
+                "DELETE FROM results WHERE expires_at <= ?", (now,)
+            ).rowcount
+            (size,) = connection.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM results"
+            ).fetchone()
+            if size > self.max_bytes:
+                # Keep the newest entries that fit under the low-water mark.
+                deleted += connection.execute(
+                    """
+                    DELETE FROM results WHERE key IN (
+                        SELECT key FROM (
+                            SELECT key, SUM(size) OVER (
+                                ORDER BY stored_at DESC, key
+                            ) AS running FROM results
+                        ) WHERE running > ?
+                    )
+                    """,
+                    (int(self.max_bytes * self.low_water),),
+                ).rowcount
+        return deleted
+
+    def _db(self) -> sqlite3.Connection:
+        if self._pid != os.getpid():
+            # First use in this process: a connection must not cross a fork.
+            self._connect()
+        return self._connection
+
+    def _read_db(self) -> sqlite3.Connection:
+        if self._pid != os.getpid():
+            with self._lock:
+                self._db()
+        return self._reader
+
+    def _writer_thread(self) -> ThreadPoolExecutor:
+        if self._writer is None or self._pid != os.getpid():
+            with self._lock:
+                self._db()
+                if self._writer is None:
+                    self._writer = ThreadPoolExecutor(1, "result-store-writer")
+        return self._writer
+
+    def _connect(self) -> None:
+        connection = sqlite3.connect(
+            self.path, timeout=self.timeout, check_same_thread=False
+        )
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        with connection:
+            connection.execute(_SCHEMA)
+        self._connection = connection
+        self._reader = sqlite3.connect(
+            self.path, timeout=self.timeout, check_same_thread=False
+        )
+        # A writer pool inherited through fork has no thread behind it.
+        self._writer = None
+        self._pid = os.getpid()
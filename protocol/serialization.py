@@ -0,0 +1,163 @@
+"""
+JSON encoding for JSON-RPC messages leaving the process.
+
+A `Serializer` encodes messages to UTF-8 bytes with a pluggable backend: `orjson` when
+it is installed, otherwise the stdlib `json` module with compact separators. Pick one
+explicitly with `Serializer("json")` / `Serializer("orjson")` or the
+`A2A_JSON_BACKEND` environment variable. The `Task`/`Response` envelope is assembled
+from pre-encoded byte fragments, so only the variable members (params, result or
+error, id) go through the backend and no wire-format dict is built per message.
+
+`NDJSONWriter` and `JSONArrayWriter` write messages to a binary stream one at a time
+as they become available, and `ndjson_chunks`/`array_chunks`/`sse_chunks` do the same
+for chunked HTTP bodies, so a large result set is never held as one encoded document.
+"""
+
+import json
+import os
+from typing import AsyncIterator, BinaryIO
+
+from protocol.messages import Response, Task, to_wire
+
+try:
+    import orjson
+except ImportError:  # optional, faster backend
+    orjson = None
+
+BACKENDS = ("json", "orjson")
+
+_TASK_HEAD = b'{"jsonrpc":"2.0","method":'
+_PARAMS = b',"params":'
+_RESULT_HEAD = b'{"jsonrpc":"2.0","result":'
+_ERROR_HEAD = b'{"jsonrpc":"2.0","error":'
+_ID = b',"id":'
+_TIMEOUT = b',"timeout":'
+_TAILS = {None: b"}", True: b',"final":true}', False: b',"final":false}'}
+
+
+class Serializer:
+    """
+    Encodes and decodes JSON-RPC payloads: Task and Response objects, decoded dicts,
+    and lists or results that contain either.
+    """
+
+    def __init__(self, backend: str = "auto") -> None:
+        if backend == "auto":
+            backend = "orjson" if orjson is not None else "json"
+        if backend == "orjson":
+            if orjson is None:
+                raise ValueError("The 'orjson' JSON backend is not installed")
+            self._dumps = _orjson_dumps
+            self.loads = orjson.loads
+        elif backend == "json":
+            encoder = json.JSONEncoder(
+                separators=(",", ":"), ensure_ascii=False, default=to_wire
+            )
+            self._dumps = lambda value: encoder.encode(value).encode()
+            self.loads = json.loads
+        else:
+            raise ValueError(
+                f"Unknown JSON backend {backend!r}; expected one of {', '.join(BACKENDS)}"
+            )
+        self.backend = backend
+
+    def dumps(self, message) -> bytes:
+        dumps = self._dumps
+        kind = type(message)
+        if kind is Response:
+            if message.error is None:
+                head, body = _RESULT_HEAD, dumps(message.result)
+            else:
+                head, body = _ERROR_HEAD, dumps(message.error)
+            tail = _TAILS[message.final]
+            return b"".join((head, body, _ID, dumps(message.id), tail))
+        if kind is Task:
+            parts = [
+                _TASK_HEAD,
+                dumps(message.method),
+                _PARAMS,
+                dumps(message.params),
+                _ID,
+                dumps(message.id),
+            ]
+            if message.timed:
+                parts += (_TIMEOUT, dumps(message.deadline.remaining()))
+            parts.append(b"}")
+            return b"".join(parts)
+        return dumps(message)
+
+
+def _orjson_dumps(value) -> bytes:
+    return orjson.dumps(value, default=to_wire)
+
+
+class NDJSONWriter:
+    """
+    Writes one encoded message per line to a binary stream, flushing after each.
+    """
+
+    content_type = "application/x-ndjson"
+
+    def __init__(self, stream: BinaryIO, serializer: Serializer | None = None) -> None:
+        self.stream = stream
+        self.serializer = serializer or DEFAULT_SERIALIZER
+
+    def write(self, message) -> None:
+        self.stream.write(self.serializer.dumps(message) + b"\n")
+        self.stream.flush()
+
+    def close(self) -> None:
+        self.stream.flush()
+
+
+class JSONArrayWriter:
+    """
+    Writes messages as the elements of one JSON array, opening it with the first
+    message; `close` ends the array (an empty one if nothing was written).
+    """
+
+    content_type = "application/json"
+
+    def __init__(self, stream: BinaryIO, serializer: Serializer | None = None) -> None:
+        self.stream = stream
+        self.serializer = serializer or DEFAULT_SERIALIZER
+        self._separator = b"["
+
+    def write(self, message) -> None:
+        self.stream.write(self._separator + self.serializer.dumps(message))
+        self._separator = b","
+        self.stream.flush()
+
+    def close(self) -> None:
+        self.stream.write(b"[]" if self._separator == b"[" else b"]")
+        self.stream.flush()
+
+
+async def ndjson_chunks(
+    messages: AsyncIterator, serializer: Serializer | None = None
+) -> AsyncIterator[bytes]:
+    serializer = serializer or DEFAULT_SERIALIZER
+    async for message in messages:
+        yield serializer.dumps(message) + b"\n"
+
+
+async def array_chunks(
+    messages: AsyncIterator, serializer: Serializer | None = None
+) -> AsyncIterator[bytes]:
+    serializer = serializer or DEFAULT_SERIALIZER
+    separator = b"["
+    async for message in messages:
+        yield separator + serializer.dumps(message)
+        separator = b","
+    yield b"[]" if separator == b"[" else b"]"
+
+
+async def sse_chunks(
+    messages: AsyncIterator, serializer: Serializer | None = None
+) -> AsyncIterator[bytes]:
+    serializer = serializer or DEFAULT_SERIALIZER
+    async for message in messages:
+        yield b"data: " + serializer.dumps(message) + b"\n\n"
+
+
+DEFAULT_SERIALIZER = Serializer(os.environ.get("A2A_JSON_BACKEND", "auto"))
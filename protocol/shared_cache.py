@@ -0,0 +1,172 @@
+"""
+A skill-result cache shared by the worker processes of a SupervisorPool.
+
+`SharedTable` is a fixed-size, direct-mapped hash table in one
+`multiprocessing.shared_memory` block: `slots` slots of `slot_size` bytes, each holding
+a 64-bit hash of the key, an expiry time on the system-wide monotonic clock and the
+encoded (key, value) pair. A key can only live in slot `hash % slots`, so a colliding
+key replaces it, and values that do not fit in a slot are not cached. One
+`multiprocessing.Lock` serializes access from every process.
+
+`SharedResultCache` is a ResultCache whose entries live in a SharedTable, so a result
+fetched by one worker is a hit in all of them; concurrent identical calls are still
+coalesced per process only. A persistent `store` sits under the table as it does under a
+ResultCache.
+"""
+
+import hashlib
+import multiprocessing
+import struct
+import time
+from multiprocessing import shared_memory
+from typing import Any
+
+from protocol.cache import MISSING, ResultCache
+from protocol.serialization import Serializer
+
+_SLOT_HEADER = struct.Struct("<QdI")  # key hash, expires at, payload length
+_SERIALIZER = Serializer()
+
+
+class SharedTable:
+    """
+    Shared-memory hash table of JSON-encodable values with per-entry expiry times.
+
+    Create it in the parent process with `SharedTable.create(...)` and pass it to child
+    processes as a `multiprocessing.Process` argument; children attach to the same
+    block. The creator must `close()` it to release the block.
+    """
+
+    def __init__(
+        self, name: str, slots: int, slot_size: int, lock, owner: bool = False
+    ) -> None:
+        self.name = name
+        self.slots = slots
+        self.slot_size = slot_size
+        self._lock = lock
+        self._owner = owner
+        self._memory = shared_memory.SharedMemory(name=name) if not owner else None
+
+    @classmethod
+    def create(
+        cls, slots: int = 4096, slot_size: int = 4096, context=None
+    ) -> "SharedTable":
+        """
+        Allocates a zeroed table of `slots` slots of `slot_size` bytes.
+        """
+        if slot_size <= _SLOT_HEADER.size:
+            raise ValueError(f"slot_size must exceed {_SLOT_HEADER.size} bytes")
+        memory = shared_memory.SharedMemory(create=True, size=slots * slot_size)
+        memory.buf[: slots * slot_size] = bytes(slots * slot_size)
+        lock = (context or multiprocessing).Lock()
+        table = cls(memory.name, slots, slot_size, lock, owner=True)
+        table._memory = memory
+        return table
+
+    def __getstate__(self) -> dict:
+        return {
+            "name": self.name,
+            "slots": self.slots,
+            "slot_size": self.slot_size,
+            "lock": self._lock,
+        }
+
+    def __setstate__(self, state: dict) -> None:
+        self.__init__(
+            state["name"], state["slots"], state["slot_size"], state["lock"]
+        )
+
+    def __len__(self) -> int:
+        now = time.monotonic()
+        buffer = self._memory.buf
+        live = 0
+        with self._lock:
+            for offset in range(0, self.slots * self.slot_size, self.slot_size):
+                _, expires_at, length = _SLOT_HEADER.unpack_from(buffer, offset)
+                live += bool(length) and expires_at > now
+        return live
+
+    def get(self, key: str, now: float) -> Any:
+        """
+        Returns the live value stored for `key`, or MISSING.
+        """
+        digest, offset = self._locate(key)
+        buffer = self._memory.buf
+        with self._lock:
+            stored, expires_at, length = _SLOT_HEADER.unpack_from(buffer, offset)
+            if not length or stored != digest or expires_at <= now:
+                return MISSING
+            start = offset + _SLOT_HEADER.size
+            payload = bytes(buffer[start : start + length])
+        stored_key, value = _SERIALIZER.loads(payload)
+        return value if stored_key == key else MISSING
+
+    def put(self, key: str, value: Any, expires_at: float, now: float) -> bool | None:
+        """
+        Stores `value` for `key` until `expires_at`. Returns True when this replaced
+        another live key, and None when the value is not JSON data or does not fit in a
+        slot.
+        """
+        try:
+            payload = _SERIALIZER.dumps([key, value])
+        except TypeError:  # not JSON data; keep it out of the table
+            return None
+        if _SLOT_HEADER.size + len(payload) > self.slot_size:
+            return None
+        digest, offset = self._locate(key)
+        buffer = self._memory.buf
+        with self._lock:
+            stored, old_expiry, length = _SLOT_HEADER.unpack_from(buffer, offset)
+            evicted = bool(length) and stored != digest and old_expiry > now
+            _SLOT_HEADER.pack_into(buffer, offset, digest, expires_at, len(payload))
+            start = offset + _SLOT_HEADER.size
+            buffer[start : start + len(payload)] = payload
+        return evicted
+
+    def close(self) -> None:
+        """
+        Detaches from the block, and frees it if this process created it.
+        """
+        if self._memory is None:
+            return
+        self._memory.close()
+        if self._owner:
+            self._memory.unlink()
+        self._memory = None
+
+    def _locate(self, key: str) -> tuple:
+        # Python's hash() is salted per process; every worker needs the same slot.
+        digest = int.from_bytes(
+            hashlib.blake2b(key.encode(), digest_size=8).digest(), "little"
+        )
+        return digest, (digest % self.slots) * self.slot_size
+
+
+class SharedResultCache(ResultCache):
+    """
+    ResultCache backed by a SharedTable. `namespace` (the agent name) keeps the keys of
+    different agents apart in one table.
+    """
+
+    def __init__(self, table: SharedTable, namespace: str = "", store=None) -> None:
+        super().__init__(max_entries=table.slots, store=store)
+        self.table = table
+        self.namespace = namespace
+        self.oversized = 0
+
+    def __len__(self) -> int:
+        return len(self.table)
+
+    def _recall(self, key: str) -> Any:
+        return self.table.get(f"{self.namespace}/{key}", self._clock())
+
+    def _remember(self, key: str, value: Any, ttl: float) -> None:
+        now = self._clock()
+        evicted = self.table.put(f"{self.namespace}/{key}", value, now + ttl, now)
+        if evicted is None:
+            self.oversized += 1
+        elif evicted:
+            self.evictions += 1
+
+    def stats(self) -> dict:
+        return {**super().stats(), "size": len(self), "oversized": self.oversized}
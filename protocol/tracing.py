@@ -0,0 +1,268 @@
+"""
+Low-overhead latency instrumentation for the supervisor/agent pipeline.
+
+The shared `TRACER` records per-stage timings into fixed-bucket histograms labelled by
+stage, skill and agent, counts events such as retries and timeouts, and keeps the most
+recent spans in a ring buffer so one request can be followed by its trace id. The
+supervisor builds JSON-RPC ids as `<trace id>:<task index>`, so agents (local or remote)
+recover the trace id from the request id alone.
+
+Instrumentation points read `TRACER.enabled` before taking any timestamp; with tracing
+switched off (`TRACER.enabled = False`, or `A2A_TRACING=0` in the environment) each
+point costs a single attribute check.
+
+Agents time `handle_rpc`, the wait in the executor queue (`executor_wait`) and the tool
+layer (`tool`) per skill, labelled with the agent's card `name`.
+"""
+
+import itertools
+import os
+import time
+from bisect import bisect_left
+from collections import deque
+from typing import Dict, List, Tuple
+
+# Histogram bucket upper bounds in seconds: 50 µs to ~52 s, a factor of √2 apart, so
+# interpolated percentiles are within about 20% of the true value.
+BUCKETS: Tuple[float, ...] = tuple(5e-5 * 2 ** (i / 2) for i in range(41))
+LABELS = ("stage", "skill", "agent")
+
+
+class Histogram:
+    __slots__ = ("counts", "count", "sum")
+
+    def __init__(self) -> None:
+        self.counts = [0] * (len(BUCKETS) + 1)  # the last bucket is +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(BUCKETS, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def merge(self, other: "Histogram") -> None:
+        for index, n in enumerate(other.counts):
+            self.counts[index] += n
+        self.count += other.count
+        self.sum += other.sum
+
+    def quantile(self, q: float) -> float | None:
+        """
+        Estimates the `q` quantile (0..1) by interpolating inside its bucket.
+        """
+        if not self.count:
+            return None
+        rank = q * self.count
+        cumulative = 0
+        for index, n in enumerate(self.counts):
+            if n and cumulative + n >= rank:
+                lower = BUCKETS[index - 1] if index else 0.0
+                if index == len(BUCKETS):
+                    return lower
+                return lower + (BUCKETS[index] - lower) * (rank - cumulative) / n
+            cumulative += n
+        return BUCKETS[-1]
+
+    def summary(self) -> dict:
+        return {
+            "count": self.count,
+            "mean": self.sum / self.count if self.count else None,
+            "p50": self.quantile(0.50),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+        }
+
+
+class Tracer:
+    """
+    Collects stage histograms, event counters and recent spans for one process.
+    """
+
+    def __init__(self, enabled: bool = True, max_spans: int = 10000) -> None:
+        self.enabled = enabled
+        self._histograms: Dict[Tuple[str, str, str], Histogram] = {}
+        self._counters: Dict[Tuple[str, str, str], int] = {}
+        # (trace_id, stage, skill, agent, start, duration) of the most recent spans
+        self.spans: deque = deque(maxlen=max_spans)
+
+    def record(
+        self,
+        stage: str,
+        start: float,
+        skill: str = "",
+        agent: str = "",
+        trace_id: str | None = None,
+    ) -> None:
+        """
+        Records a stage that began at `start` (a `time.perf_counter()` value) and ends
+        now.
+        """
+        self.observe(stage, time.perf_counter() - start, skill, agent, trace_id, start)
+
+    def observe(
+        self,
+        stage: str,
+        duration: float,
+        skill: str = "",
+        agent: str = "",
+        trace_id: str | None = None,
+        start: float | None = None,
+    ) -> None:
+        key = (stage, skill, agent)
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            histogram = self._histograms[key] = Histogram()
+        histogram.observe(duration)
+        if trace_id is not None:
+            if start is None:
+                start = time.perf_counter() - duration
+            self.spans.append((trace_id, stage, skill, agent, start, duration))
+
+    def count(self, name: str, skill: str = "", agent: str = "", n: int = 1) -> None:
+        key = (name, skill, agent)
+        self._counters[key] = self._counters.get(key, 0) + n
+
+    def trace(self, trace_id: str) -> List[dict]:
+        """
+        Returns the recorded spans of one trace, in start order.
+        """
+        spans = [span for span in self.spans if span[0] == trace_id]
+        spans.sort(key=lambda span: span[4])
+        return [
+            {
+                "stage": stage,
+                "skill": skill,
+                "agent": agent,
+                "start": start,
+                "duration": duration,
+            }
+            for _, stage, skill, agent, start, duration in spans
+        ]
+
+    def histograms(self, by: Tuple[str, ...] = LABELS) -> List[dict]:
+        """
+        Returns count, mean and p50/p95/p99 per combination of the `by` labels, e.g.
+        `by=("stage", "agent")` to aggregate every skill of each agent.
+        """
+        positions = [LABELS.index(label) for label in by]
+        merged: Dict[tuple, Histogram] = {}
+        for key, histogram in self._histograms.items():
+            group = tuple(key[p] for p in positions)
+            if group not in merged:
+                merged[group] = Histogram()
+            merged[group].merge(histogram)
+        return [
+            {**dict(zip(by, group)), **histogram.summary()}
+            for group, histogram in sorted(merged.items())
+        ]
+
+    def counters(self) -> List[dict]:
+        return [
+            {"name": name, "skill": skill, "agent": agent, "value": value}
+            for (name, skill, agent), value in sorted(self._counters.items())
+        ]
+
+    def export(self) -> dict:
+        """
+        Returns the histograms and counters as plain JSON data, for `merge` into the
+        Tracer of another process.
+        """
+        return {
+            "histograms": [
+                [list(key), histogram.counts, histogram.sum]
+                for key, histogram in self._histograms.items()
+            ],
+            "counters": [[list(key), value] for key, value in self._counters.items()],
+        }
+
+    def merge(self, exported: dict) -> None:
+        """
+        Adds the histograms and counters from another Tracer's `export()` to this one.
+        """
+        for key, counts, total in exported["histograms"]:
+            other = Histogram()
+            other.counts = list(counts)
+            other.count = sum(counts)
+            other.sum = total
+            key = tuple(key)
+            if key not in self._histograms:
+                self._histograms[key] = Histogram()
+            self._histograms[key].merge(other)
+        for key, value in exported["counters"]:
+            key = tuple(key)
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def reset(self) -> None:
+        self._histograms.clear()
+        self._counters.clear()
+        self.spans.clear()
+
+    def prometheus(self, prefix: str = "a2a") -> str:
+        """
+        Renders every histogram and counter in the Prometheus text exposition format.
+        """
+        lines = [f"# TYPE {prefix}_stage_seconds histogram"]
+        for key, histogram in sorted(self._histograms.items()):
+            labels = _labels(zip(LABELS, key))
+            cumulative = 0
+            for bound, n in zip(BUCKETS, histogram.counts):
+                cumulative += n
+                lines.append(
+                    f'{prefix}_stage_seconds_bucket{{{labels},le="{bound:.6g}"}} '
+                    f"{cumulative}"
+                )
+            lines.append(
+                f'{prefix}_stage_seconds_bucket{{{labels},le="+Inf"}} {histogram.count}'
+            )
+            lines.append(f"{prefix}_stage_seconds_sum{{{labels}}} {histogram.sum:.9g}")
+            lines.append(f"{prefix}_stage_seconds_count{{{labels}}} {histogram.count}")
+
+        names = sorted({name for name, _, _ in self._counters})
+        for name in names:
+            lines.append(f"# TYPE {prefix}_{name} counter")
+            for (counter, skill, agent), value in sorted(self._counters.items()):
+                if counter == name:
+                    labels = _labels((("skill", skill), ("agent", agent)))
+                    lines.append(f"{prefix}_{name}{{{labels}}} {value}")
+        return "\n".join(lines) + "\n"
+
+
+def _labels(pairs) -> str:
+    return ",".join(f'{name}="{_escape(value)}"' for name, value in pairs)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def new_trace_id() -> str:
+    """
+    Returns a process-unique trace id: a random per-process prefix and a counter, which
+    is far cheaper than a UUID per query.
+    """
+    return f"{_trace_prefix}{next(_trace_counter):x}"
+
+
+def _reseed_trace_ids() -> None:
+    global _trace_prefix, _trace_counter
+    _trace_prefix = os.urandom(6).hex() + "-"
+    _trace_counter = itertools.count()
+
+
+_reseed_trace_ids()
+# Forked workers must not hand out their parent's ids.
+os.register_at_fork(after_in_child=_reseed_trace_ids)
+
+
+def trace_id_of(request_id) -> str | None:
+    """
+    Returns the trace id carried by a JSON-RPC request id (`<trace id>:<index>`), or
+    the whole id when it has no task index.
+    """
+    if request_id is None:
+        return None
+    return str(request_id).partition(":")[0]
+
+
+TRACER = Tracer(enabled=os.environ.get("A2A_TRACING", "1") != "0")
@@ -0,0 +1,138 @@
+import asyncio
+from typing import AsyncIterator, List
+from urllib.parse import urlsplit
+
+from protocol.http import read_response, write_request
+from protocol.serialization import DEFAULT_SERIALIZER, Serializer
+
+REMOTE_SCHEMES = ("http", "unix")
+
+
+class TransportError(Exception):
+    """
+    Raised when a remote agent cannot be reached or answers with a non-JSON-RPC reply.
+    """
+
+
+def is_remote_url(url: str) -> bool:
+    return urlsplit(url).scheme in REMOTE_SCHEMES
+
+
+class HTTPTransport:
+    """
+    Sends JSON-RPC payloads (single requests or batch arrays) to a remote agent over a
+    pool of persistent HTTP/1.1 connections.
+
+    Supports `http://host:port/path` and `unix:///path/to/socket` URLs. At most
+    `max_connections` requests are in flight; idle connections are reused, and a request
+    that fails on a reused connection the server already closed is retried once on a
+    fresh one.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        max_connections: int = 10,
+        serializer: Serializer | None = None,
+    ) -> None:
+        parts = urlsplit(url)
+        if parts.scheme == "http":
+            self.host = parts.netloc
+            self.path = parts.path or "/"
+            self._address = (parts.hostname, parts.port or 80)
+        elif parts.scheme == "unix":
+            self.host = "localhost"
+            self.path = "/"
+            self._address = parts.path
+        else:
+            raise ValueError(f"Unsupported transport URL: {url}")
+        self.url = url
+        self.max_connections = max_connections
+        self.serializer = serializer or DEFAULT_SERIALIZER
+        self._idle: List[tuple] = []  # (reader, writer)
+        self._slots: asyncio.Semaphore | None = None
+        self.connections_opened = 0
+
+    async def _connect(self) -> tuple:
+        self.connections_opened += 1
+        if isinstance(self._address, str):
+            return await asyncio.open_unix_connection(self._address)
+        return await asyncio.open_connection(*self._address)
+
+    async def send(self, payload):
+        """
+        POSTs `payload` and returns the decoded JSON-RPC response payload, or None for
+        an empty (all-notification) reply.
+        """
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_connections)
+        body = self.serializer.dumps(payload)
+
+        async with self._slots:
+            while True:
+                reused = bool(self._idle)
+                reader, writer = self._idle.pop() if reused else await self._connect()
+                try:
+                    write_request(writer, self.host, self.path, body)
+                    await writer.drain()
+                    status, headers, reply = await read_response(reader)
+                except (ConnectionError, asyncio.IncompleteReadError) as e:
+                    writer.close()
+                    if reused:
+                        continue
+                    raise TransportError(f"{self.url}: {e}") from e
+                except BaseException:
+                    # Cancelled mid-exchange: the connection state is unknown.
+                    writer.close()
+                    raise
+                break
+
+            if headers.get("connection", "").lower() == "close":
+                writer.close()
+            else:
+                self._idle.append((reader, writer))
+
+        if status == 204:
+            return None
+        if status != 200:
+            raise TransportError(f"{self.url}: HTTP {status}")
+        return self.serializer.loads(reply)
+
+    def close(self) -> None:
+        while self._idle:
+            _, writer = self._idle.pop()
+            writer.close()
+
+
+class RemoteAgent:
+    """
+    Client-side stand-in for an agent served in another process or node, used for
+    AgentCards whose `url` is `http://` or `unix://`.
+
+    It exposes the same calling surface the SupervisorAgent uses on in-process agents
+    (`handle_rpc` for single requests and batches, `handle_rpc_stream`), forwarding every
+    call over a pooled HTTPTransport. Caching, executors and batch hooks live with the
+    agent on the serving side.
+    """
+
+    def __init__(self, url: str, transport: HTTPTransport | None = None) -> None:
+        self.url = url
+        self.transport = transport or HTTPTransport(url)
+        self.cache = None
+        self.streaming = False
+        self.card: dict = {}
+
+    def apply_card(self, card: dict) -> None:
+        self.card = card
+        pool_size = card.get("transport", {}).get("maxConnections")
+        if pool_size:
+            self.transport.max_connections = pool_size
+
+    async def handle_rpc(self, request: dict | list) -> dict | list | None:
+        return await self.transport.send(request)
+
+    async def handle_rpc_stream(self, request: dict) -> AsyncIterator[dict]:
+        yield await self.handle_rpc(request)
+
+    def shutdown(self, wait: bool = True) -> None:
+        self.transport.close()
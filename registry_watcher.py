@@ -0,0 +1,84 @@
+import asyncio
+import os
+from typing import Dict, List
+
+from agent_registry import AgentRegistry, card_paths
+from card_index import DEFAULT_INDEX_NAME
+
+
+class RegistryWatcher:
+    """
+    Polls an AgentCard directory and hot-reloads an AgentRegistry when it changes.
+
+    Every `interval` seconds the watcher compares the (name, mtime, size) of each card
+    file with the previous poll. On a change it re-reads the cards in a worker thread
+    (through the directory's CardIndex, so only changed cards are parsed) and calls
+    `AgentRegistry.reload`, which swaps the new skill map in atomically. Agents retired
+    by a reload are shut down after `drain_timeout` seconds. Polling keeps it portable:
+    no inotify/FSEvents dependency.
+    """
+
+    def __init__(
+        self,
+        registry: AgentRegistry,
+        directory: str,
+        interval: float = 1.0,
+        drain_timeout: float = 30.0,
+        index_path: str | None = None,
+    ) -> None:
+        self.registry = registry
+        self.directory = directory
+        self.interval = interval
+        self.drain_timeout = drain_timeout
+        self.index_path = index_path or os.path.join(directory, DEFAULT_INDEX_NAME)
+        self.reloads = 0
+        self._signature = self._scan()
+        self._task: asyncio.Task | None = None
+
+    def _scan(self) -> tuple:
+        signature = []
+        for path in card_paths(self.directory):
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            signature.append((path, stat.st_mtime_ns, stat.st_size))
+        return tuple(signature)
+
+    def start(self) -> asyncio.Task:
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._run())
+        return self._task
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.poll()
+            except Exception as e:
+                # A half-written or invalid card must not stop the watcher; the
+                # current skill map stays in place until the next good poll.
+                print(f"Agent card reload failed: {e}")
+
+    async def poll(self) -> Dict[str, List[str]] | None:
+        """
+        Reloads the registry if any card changed since the last poll and returns the
+        reload report, or None when nothing changed. Also drains retired agents.
+        """
+        report = None
+        signature = await asyncio.to_thread(self._scan)
+        if signature != self._signature:
+            paths = [path for path, _, _ in signature]
+            report = await asyncio.to_thread(
+                self.registry.reload, paths, self.index_path
+            )
+            self._signature = signature
+            self.reloads += 1
+        self.registry.drain(self.drain_timeout)
+        return report
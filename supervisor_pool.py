@@ -0,0 +1,434 @@
+"""
+Multi-process deployment of the Supervisor.
+
+One event loop caps query parsing, serialization and in-process agents at one core.
+`SupervisorPool` runs N worker processes instead, each with its own event loop,
+AgentRegistry and prewarmed agents, and hands every query (or chunk of bulk queries)
+to the worker with the fewest outstanding requests.
+
+The parent and each worker exchange newline-delimited JSON-RPC 2.0 messages over a
+socket pair. Workers answer `handle_query` and skill requests as the HTTP service does
+(`SupervisorServer.dispatch`), `handle_queries` with a chunk of bulk queries, and the
+`rpc.ping`, `rpc.metrics` and `rpc.cancel` control methods.
+
+Result caches are shared-nothing by default: every worker caches for itself. With
+`shared_cache_slots`, the agents of every worker cache into one shared-memory table
+instead (see protocol/shared_cache.py). With `result_store`, every worker's caches also
+write behind to one SQLite result store (see protocol/result_store.py). `metrics()` merges the workers' stage
+histograms and counters into one Tracer, and `cache_stats()` sums their caches.
+"""
+
+import asyncio
+import itertools
+import multiprocessing
+import os
+import socket
+import time
+from contextlib import aclosing
+from typing import AsyncIterable, AsyncIterator, Dict, Iterable, List
+
+from agent_registry import AgentRegistry
+from agents.balancer import LEAST_OUTSTANDING, Replica, ReplicaSet
+from agents.bulk import BulkStats, QueryResult, run_bounded
+from agents.supervisor_agent import SupervisorAgent
+from protocol.deadline import Deadline
+from protocol.messages import Response, Task
+from protocol.result_store import ResultStore
+from protocol.serialization import DEFAULT_SERIALIZER
+from protocol.shared_cache import SharedResultCache, SharedTable
+from protocol.tracing import TRACER, Tracer
+from supervisor_server import DEFAULT_CARD_PATHS, SupervisorServer
+
+STREAM_LIMIT = 2**26  # longest message line between parent and worker, in bytes
+
+
+class PoolWorker:
+    """
+    The parent's end of one worker process. Sends requests with connection-local ids
+    and resolves them as the worker's replies arrive, in any order. Like an agent it
+    serves `handle_rpc`, so the pool balances over workers with a ReplicaSet.
+    """
+
+    def __init__(
+        self,
+        process: multiprocessing.Process,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+    ) -> None:
+        self.process = process
+        self._reader = reader
+        self._writer = writer
+        self._ids = itertools.count()
+        self._pending: Dict[int, asyncio.Future] = {}  # request id → reply future
+        self._listener = asyncio.ensure_future(self._listen())
+
+    @property
+    def alive(self) -> bool:
+        return not self._listener.done()
+
+    async def handle_rpc(self, request: Task) -> Dict:
+        """
+        Sends `request` (its id is replaced) and returns the worker's decoded reply.
+        Cancelling the call cancels the request in the worker.
+
+        Raises:
+            ConnectionError: If the worker exited.
+        """
+        if not self.alive:
+            raise ConnectionError(f"Supervisor worker {self.process.pid} exited")
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        message = Task(request.method, request.params, request_id, request.deadline)
+        try:
+            self._send(message)
+            await self._writer.drain()
+            return await future
+        except asyncio.CancelledError:
+            if self.alive:
+                # A notification (no id): the worker does not reply.
+                cancel = {"id": request_id}
+                self._send({"jsonrpc": "2.0", "method": "rpc.cancel", "params": cancel})
+            raise
+        finally:
+            self._pending.pop(request_id, None)
+
+    def _send(self, message) -> None:
+        self._writer.write(DEFAULT_SERIALIZER.dumps(message) + b"\n")
+
+    async def _listen(self) -> None:
+        try:
+            while line := await self._reader.readline():
+                reply = DEFAULT_SERIALIZER.loads(line)
+                future = self._pending.get(reply.get("id"))
+                if future is not None and not future.done():
+                    future.set_result(reply)
+        except ConnectionError:
+            pass  # the worker died; fail its requests below
+        finally:
+            exited = ConnectionError(f"Supervisor worker {self.process.pid} exited")
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(exited)
+
+    def close(self) -> None:
+        self._writer.close()
+
+
+class SupervisorPool:
+    """
+    Runs `workers` supervisor processes (default: one per CPU) over the AgentCards at
+    `card_paths` and dispatches queries to them. Use it as an async context manager,
+    or call `start()` and `close()`.
+
+    `query_timeout` and `page_size` configure every worker's SupervisorAgent, and
+    `result_store` is the path of a persistent result store they share. Bulk
+    queries travel in chunks of `chunk_size`, and each worker runs its chunk through
+    `SupervisorAgent.handle_queries`, deduplicating and micro-batching within it.
+    """
+
+    def __init__(
+        self,
+        card_paths: List[str] | None = None,
+        workers: int | None = None,
+        query_timeout: float | None = None,
+        page_size: int | None = None,
+        shared_cache_slots: int = 0,
+        shared_cache_slot_size: int = 16384,
+        chunk_size: int = 32,
+        result_store: str | None = None,
+    ) -> None:
+        self.card_paths = list(card_paths or DEFAULT_CARD_PATHS)
+        self.workers = workers or os.cpu_count() or 1
+        self.options = {"query_timeout": query_timeout, "page_size": page_size}
+        self.shared_cache_slots = shared_cache_slots
+        self.shared_cache_slot_size = shared_cache_slot_size
+        self.chunk_size = chunk_size
+        self.result_store = result_store
+        self._workers: List[PoolWorker] = []
+        self._balancer: ReplicaSet | None = None
+        self._table: SharedTable | None = None
+
+    async def __aenter__(self) -> "SupervisorPool":
+        return await self.start()
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def start(self) -> "SupervisorPool":
+        """
+        Spawns the workers and waits until every one has loaded its agents.
+        """
+        context = multiprocessing.get_context("spawn")
+        if self.shared_cache_slots:
+            self._table = SharedTable.create(
+                self.shared_cache_slots, self.shared_cache_slot_size, context
+            )
+        try:
+            for _ in range(self.workers):
+                parent_end, child_end = socket.socketpair()
+                process = context.Process(
+                    target=_worker_main,
+                    args=(
+                        child_end,
+                        self.card_paths,
+                        self.options,
+                        self._table,
+                        self.result_store,
+                    ),
+                    name="supervisor-worker",
+                )
+                process.start()
+                child_end.close()
+                reader, writer = await asyncio.open_connection(
+                    sock=parent_end, limit=STREAM_LIMIT
+                )
+                self._workers.append(PoolWorker(process, reader, writer))
+            self._balancer = ReplicaSet(
+                [Replica(worker) for worker in self._workers], LEAST_OUTSTANDING
+            )
+            await self._broadcast("rpc.ping")
+        except BaseException:
+            await self.close()
+            raise
+        return self
+
+    async def close(self, timeout: float = 5.0) -> None:
+        """
+        Closes every worker's connection, which makes it exit, and waits for them.
+        """
+        for worker in self._workers:
+            worker.close()
+        for worker in self._workers:
+            await asyncio.to_thread(worker.process.join, timeout)
+            if worker.process.is_alive():
+                worker.process.terminate()
+        self._workers = []
+        if self._table is not None:
+            self._table.close()
+            self._table = None
+
+    async def handle_query(self, query: str, timeout: float | None = None) -> List:
+        """
+        Runs one query on a worker and returns its decoded agent responses.
+
+        Raises:
+            ConnectionError: If no worker is running.
+        """
+        deadline = Deadline.after(timeout) if timeout is not None else None
+        task = Task("handle_query", {"query": query}, None, deadline)
+        return _result(await self._choose().handle_rpc(task))
+
+    async def handle_queries(
+        self,
+        queries: Iterable[str] | AsyncIterable[str],
+        ordered: bool = True,
+        max_in_flight: int = 256,
+        stats: BulkStats | None = None,
+        timeout: float | None = None,
+    ) -> AsyncIterator[QueryResult]:
+        """
+        Bulk variant of `handle_query` with the interface of
+        `SupervisorAgent.handle_queries`: one QueryResult per query, in input order
+        unless `ordered` is False, with at most `max_in_flight` queries outstanding.
+        """
+        stats = stats if stats is not None else BulkStats()
+        stats.started = time.perf_counter()
+        chunk_size = self.chunk_size
+        params = {} if timeout is None else {"timeout": timeout}
+
+        async def run(index: int, chunk: List[str]) -> List[QueryResult]:
+            task = Task("handle_queries", {**params, "queries": chunk}, None)
+            result = _result(await self._choose().handle_rpc(task))
+            stats.queries += len(chunk)
+            stats.tasks += result["tasks"]
+            stats.dispatched += result["dispatched"]
+            first = index * chunk_size
+            return [
+                QueryResult(first + offset, query, responses)
+                for offset, (query, responses) in enumerate(
+                    zip(chunk, result["responses"])
+                )
+            ]
+
+        chunks = _chunks(queries, chunk_size)
+        in_flight = max(1, max_in_flight // chunk_size)
+        try:
+            async with aclosing(
+                run_bounded(chunks, run, ordered, in_flight)
+            ) as completed:
+                async for results in completed:
+                    for result in results:
+                        yield result
+        finally:
+            stats.finished = time.perf_counter()
+
+    async def metrics(self) -> Tracer:
+        """
+        Returns a Tracer holding the merged histograms and counters of every worker.
+        """
+        tracer = Tracer()
+        for result in await self._broadcast("rpc.metrics"):
+            tracer.merge(result["tracer"])
+        return tracer
+
+    async def cache_stats(self) -> dict:
+        """
+        Returns result-cache counters summed over the workers, keyed by agent name. With
+        a shared cache, `size` and `max_entries` describe the one shared table.
+        """
+        totals: dict = {}
+        for result in await self._broadcast("rpc.metrics"):
+            for name, stats in result["cache"].items():
+                merged = totals.setdefault(name, {})
+                for key, value in stats.items():
+                    if self._table is not None and key in ("size", "max_entries"):
+                        merged[key] = value
+                    else:
+                        merged[key] = merged.get(key, 0) + value
+        return totals
+
+    def worker_stats(self) -> List[dict]:
+        """
+        Returns the pid, in-flight requests and latency EWMA of every worker.
+        """
+        return [
+            {"pid": replica.process.pid, "alive": replica.alive, **replica.stats()}
+            for replica in self._balancer.replicas
+        ]
+
+    def _choose(self) -> Replica:
+        replica = self._balancer.choose()
+        if not replica.alive:
+            alive = [r for r in self._balancer.replicas if r.alive]
+            if not alive:
+                raise ConnectionError("No supervisor workers are running")
+            self._balancer = ReplicaSet(alive, LEAST_OUTSTANDING)
+            replica = self._balancer.choose()
+        return replica
+
+    async def _broadcast(self, method: str) -> List:
+        replies = await asyncio.gather(
+            *(worker.handle_rpc(Task(method, {}, None)) for worker in self._workers)
+        )
+        return [_result(reply) for reply in replies]
+
+
+def _result(reply: Dict):
+    if "error" in reply:
+        raise RuntimeError(f"Supervisor worker failed: {reply['error']['message']}")
+    return reply["result"]
+
+
+async def _chunks(
+    queries: Iterable[str] | AsyncIterable[str], size: int
+) -> AsyncIterator[List[str]]:
+    chunk: List[str] = []
+    if hasattr(queries, "__aiter__"):
+        async for query in queries:
+            chunk.append(query)
+            if len(chunk) == size:
+                yield chunk
+                chunk = []
+    else:
+        for query in queries:
+            chunk.append(query)
+            if len(chunk) == size:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+
+def _worker_main(
+    connection: socket.socket,
+    card_paths: List[str],
+    options: dict,
+    table: SharedTable | None,
+    store_path: str | None,
+) -> None:
+    asyncio.run(_serve_worker(connection, card_paths, options, table, store_path))
+
+
+async def _serve_worker(
+    connection: socket.socket,
+    card_paths: List[str],
+    options: dict,
+    table: SharedTable | None,
+    store_path: str | None,
+) -> None:
+    store = ResultStore(store_path) if store_path else None
+    registry = AgentRegistry.from_card_paths(
+        card_paths, prewarm=True, result_store=store
+    )
+    if table is not None:
+        for agent in registry.agents():
+            if getattr(agent, "cache", None) is not None:
+                agent.cache = SharedResultCache(table, agent.name, store)
+    server = SupervisorServer(SupervisorAgent(agent_registry=registry, **options))
+    reader, writer = await asyncio.open_connection(sock=connection, limit=STREAM_LIMIT)
+    running: Dict = {}  # request id → asyncio.Task answering it
+
+    async def answer(request: Dict) -> None:
+        try:
+            response = await _answer(server, registry, request)
+        except asyncio.CancelledError:
+            return
+        except Exception as e:
+            response = Response.failure(request.get("id"), -32603, f"Internal error: {e}")
+        if response is not None and "id" in request:
+            writer.write(server.serializer.dumps(response) + b"\n")
+            await writer.drain()
+
+    while line := await reader.readline():
+        request = server.serializer.loads(line)
+        if request.get("method") == "rpc.cancel":
+            task = running.get((request.get("params") or {}).get("id"))
+            if task is not None:
+                task.cancel()
+            continue
+        task = asyncio.ensure_future(answer(request))
+        if "id" in request:
+            request_id = request["id"]
+            running[request_id] = task
+            task.add_done_callback(lambda _, key=request_id: running.pop(key, None))
+
+    # The parent closed the connection: stop and exit.
+    for task in list(running.values()):
+        task.cancel()
+    await asyncio.gather(*running.values(), return_exceptions=True)
+    writer.close()
+    for agent in registry.agents():
+        shutdown = getattr(agent, "shutdown", None)
+        if shutdown is not None:
+            shutdown(wait=False)
+    if table is not None:
+        table.close()
+    if store is not None:
+        store.close()
+
+
+async def _answer(server: SupervisorServer, registry: AgentRegistry, request: Dict):
+    method = request.get("method")
+    request_id = request.get("id")
+    if method == "rpc.ping":
+        return Response(request_id, os.getpid())
+    if method == "rpc.metrics":
+        result = {"tracer": TRACER.export(), "cache": registry.cache_stats()}
+        return Response(request_id, result)
+    if method == "handle_queries":
+        params = request.get("params") or {}
+        stats = BulkStats()
+        responses = [
+            result.responses
+            async for result in server.supervisor.handle_queries(
+                params.get("queries", []), stats=stats, timeout=params.get("timeout")
+            )
+        ]
+        result = {
+            "responses": responses,
+            "tasks": stats.tasks,
+            "dispatched": stats.dispatched,
+        }
+        return Response(request_id, result)
+    return await server.dispatch(request)
@@ -0,0 +1,314 @@
+import argparse
+import asyncio
+from typing import AsyncIterator, Dict, List
+
+from agent_registry import AgentRegistry
+from agents.supervisor_agent import SupervisorAgent
+from protocol.http import HTTPRequest, connection_handler, write_chunked, write_response
+from protocol.deadline import deadline_of
+from protocol.messages import Response, Task
+from protocol.result_store import ResultStore
+from protocol.serialization import (
+    DEFAULT_SERIALIZER,
+    Serializer,
+    ndjson_chunks,
+    sse_chunks,
+)
+from protocol.tracing import TRACER
+from registry_watcher import RegistryWatcher
+
+DEFAULT_CARD_PATHS = [
+    "agent_cards/web_research_agent_card.json",
+    "agent_cards/crm_research_agent_card.json",
+]
+# Accept header value → encoder of a streamed response body
+STREAM_FORMATS = (
+    ("text/event-stream", sse_chunks),
+    ("application/x-ndjson", ndjson_chunks),
+)
+
+
+class SupervisorServer:
+    """
+    Long-lived HTTP/JSON-RPC 2.0 front-end for a SupervisorAgent.
+
+    One AgentRegistry and its warm agent instances serve every request. Clients POST a
+    single request or a batch array to `/`:
+
+    - `handle_query` with `{"query": "..."}` runs a natural-language query and returns
+      the list of agent responses as its result.
+    - Any skill id (e.g. `get_crm_history`) is delegated directly to the owning agent;
+      skill requests in one batch are grouped into one batch per agent.
+
+    A request's optional `"timeout"` member (seconds) becomes its deadline, overriding
+    the supervisor's `query_timeout` for `handle_query`.
+
+    Connections are kept alive between requests. With `Accept: text/event-stream` the
+    responses are streamed as server-sent events (over chunked encoding) as soon as each
+    one completes, and with `Accept: application/x-ndjson` as one JSON line each; for
+    `handle_query` every agent response is streamed on its own. Responses are encoded
+    by the server's Serializer (see protocol/serialization.py).
+
+    `GET /metrics` returns the process's stage histograms and counters in the Prometheus
+    text format.
+    """
+
+    def __init__(
+        self, supervisor: SupervisorAgent, serializer: Serializer | None = None
+    ) -> None:
+        self.supervisor = supervisor
+        self.serializer = serializer or DEFAULT_SERIALIZER
+        self._server: asyncio.AbstractServer | None = None
+
+    @classmethod
+    def from_card_paths(
+        cls,
+        paths: List[str],
+        query_timeout: float | None = None,
+        page_size: int | None = None,
+        result_store: ResultStore | None = None,
+    ) -> "SupervisorServer":
+        registry = AgentRegistry.from_card_paths(paths, result_store=result_store)
+        supervisor = SupervisorAgent(
+            agent_registry=registry, query_timeout=query_timeout, page_size=page_size
+        )
+        return cls(supervisor)
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8000):
+        self._server = await asyncio.start_server(
+            connection_handler(self.handle_http), host, port
+        )
+        return self._server
+
+    @property
+    def port(self) -> int:
+        return self._server.sockets[0].getsockname()[1]
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def handle_http(self, request: HTTPRequest, writer: asyncio.StreamWriter):
+        if request.path == "/metrics" and request.method == "GET":
+            body = TRACER.prometheus().encode()
+            await write_response(
+                writer,
+                200,
+                body,
+                "text/plain; version=0.0.4",
+                keep_alive=request.keep_alive,
+            )
+            return
+        if request.path not in ("/", "/rpc"):
+            await write_response(writer, 404, keep_alive=request.keep_alive)
+            return
+        if request.method != "POST":
+            await write_response(writer, 405, keep_alive=request.keep_alive)
+            return
+
+        try:
+            payload = self.serializer.loads(request.body)
+        except ValueError:
+            body = self.serializer.dumps(_error(None, -32700, "Parse error"))
+            await write_response(writer, 200, body, keep_alive=request.keep_alive)
+            return
+
+        accept = request.headers.get("accept", "")
+        for content_type, encode in STREAM_FORMATS:
+            if content_type in accept:
+                await write_chunked(
+                    writer,
+                    encode(self.dispatch_stream(payload), self.serializer),
+                    content_type,
+                    keep_alive=request.keep_alive,
+                )
+                return
+
+        response = await self.dispatch(payload)
+        if response is None:
+            await write_response(writer, 204, keep_alive=request.keep_alive)
+        else:
+            body = self.serializer.dumps(response)
+            await write_response(writer, 200, body, keep_alive=request.keep_alive)
+
+    async def dispatch(self, payload) -> Dict | List | None:
+        """
+        Handles a decoded JSON-RPC payload (single request or batch) and returns the
+        response payload, or None when nothing needs to be returned.
+        """
+        if not isinstance(payload, list):
+            return await self._dispatch_one(payload)
+        if not payload:
+            return _error(None, -32600, "Invalid Request: empty batch")
+
+        responses: List = [None] * len(payload)
+        skill_positions = []
+        coroutines = []
+        for position, request in enumerate(payload):
+            if _is_skill_request(request):
+                skill_positions.append(position)
+            else:
+                coroutines.append(self._fill(responses, position, request))
+
+        async def run_skills():
+            tasks = [_as_task(payload[p]) for p in skill_positions]
+            for position, response in zip(
+                skill_positions, await self.supervisor.delegate_tasks(tasks)
+            ):
+                responses[position] = response
+
+        if skill_positions:
+            coroutines.append(run_skills())
+        await asyncio.gather(*coroutines)
+
+        replies = [
+            response
+            for request, response in zip(payload, responses)
+            if not isinstance(request, dict) or "id" in request
+        ]
+        return replies or None
+
+    async def dispatch_stream(self, payload) -> AsyncIterator[Dict]:
+        """
+        Yields response objects as soon as each is ready. A single `handle_query`
+        request yields every agent response individually.
+        """
+        if isinstance(payload, dict) and payload.get("method") == "handle_query":
+            query = _query_of(payload)
+            if query is not None:
+                stream = self.supervisor.handle_query_stream(query, _timeout_of(payload))
+                async for message in stream:
+                    yield message
+                return
+
+        requests = payload if isinstance(payload, list) else [payload]
+        for next_done in asyncio.as_completed(
+            [self._dispatch_one(request) for request in requests]
+        ):
+            response = await next_done
+            if response is not None:
+                yield response
+
+    async def _fill(self, responses: List, position: int, request) -> None:
+        responses[position] = await self._dispatch_one(request)
+
+    async def _dispatch_one(self, request) -> Dict | None:
+        if not isinstance(request, dict) or not isinstance(request.get("method"), str):
+            return _error(None, -32600, "Invalid Request")
+        request_id = request.get("id")
+
+        if request["method"] == "handle_query":
+            query = _query_of(request)
+            if query is None:
+                return _error(request_id, -32602, "Invalid params: 'query' is required")
+            result = await self.supervisor.handle_query(query, _timeout_of(request))
+            response = Response(request_id, result)
+        elif not isinstance(request.get("params", {}), dict):
+            # Skills take named params only.
+            return _error(request_id, -32602, "Invalid params: expected an object")
+        else:
+            # Through delegate_tasks so the scheduler's concurrency limits apply.
+            (response,) = await self.supervisor.delegate_tasks([_as_task(request)])
+
+        return response if "id" in request else None
+
+
+def _is_skill_request(request) -> bool:
+    """
+    True for a well-formed skill request, which can join the batch sent to agents.
+    """
+    return (
+        isinstance(request, dict)
+        and isinstance(request.get("method"), str)
+        and request["method"] != "handle_query"
+        and isinstance(request.get("params", {}), dict)
+    )
+
+
+def _query_of(request: Dict) -> str | None:
+    """
+    Returns the `query` of a `handle_query` request, or None when its params are not
+    an object with a string `query` (positional params are valid JSON-RPC, but
+    `handle_query` only takes named ones).
+    """
+    params = request.get("params")
+    if not isinstance(params, dict):
+        return None
+    query = params.get("query")
+    return query if isinstance(query, str) else None
+
+
+def _as_task(request: Dict) -> Task:
+    return Task(
+        request["method"],
+        request.get("params", {}),
+        request.get("id"),
+        deadline_of(request),
+    )
+
+
+def _timeout_of(request: Dict) -> float | None:
+    deadline = deadline_of(request)
+    return deadline.remaining() if deadline is not None else None
+
+
+def _error(request_id, code: int, message: str) -> Response:
+    return Response.failure(request_id, code, message)
+
+
+async def main():
+    parser = argparse.ArgumentParser(
+        description="Run the Supervisor as an HTTP service."
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--card", action="append", dest="cards")
+    parser.add_argument("--card-dir", help="Load every AgentCard in this directory")
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Hot-reload --card-dir when its cards change",
+    )
+    parser.add_argument(
+        "--query-timeout",
+        type=float,
+        help="Default deadline in seconds for each handle_query request",
+    )
+    parser.add_argument(
+        "--page-size",
+        type=int,
+        help="Items per paginated skill result requested by handle_query",
+    )
+    parser.add_argument(
+        "--result-store",
+        help="Keep cached skill results in this SQLite file across restarts",
+    )
+    args = parser.parse_args()
+
+    store = ResultStore(args.result_store) if args.result_store else None
+    if args.card_dir:
+        registry = AgentRegistry.from_card_dir(args.card_dir, result_store=store)
+        supervisor = SupervisorAgent(
+            agent_registry=registry,
+            query_timeout=args.query_timeout,
+            page_size=args.page_size,
+        )
+        server = SupervisorServer(supervisor)
+        if args.watch:
+            RegistryWatcher(registry, args.card_dir).start()
+    else:
+        server = SupervisorServer.from_card_paths(
+            args.cards or DEFAULT_CARD_PATHS,
+            query_timeout=args.query_timeout,
+            page_size=args.page_size,
+            result_store=store,
+        )
+    await server.start(args.host, args.port)
+    print(f"Supervisor listening on http://{args.host}:{server.port}/")
+    await asyncio.Event().wait()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
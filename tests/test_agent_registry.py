@@ -1,5 +1,11 @@
+import json
+import shutil
+import threading
+
 import pytest
-from agent_registry import AgentRegistry
+import agent_registry
+from agent_registry import AGENT_CLASS_REGISTRY, AgentRegistry
+from card_index import DEFAULT_INDEX_NAME, CardIndex
 from agents.web_research_agent.agent import WebResearchAgent
 from agents.crm_research_agent.agent import CRMResearchAgent
 
@@ -26,3 +32,186 @@ def test_find_agent_for_crm_research(registry):
 def test_unknown_method_returns_none(registry):
     agent = registry.find_agent_for_method("unknown_method")
     assert agent is None
+
+
+@pytest.mark.asyncio
+async def test_cache_configured_from_agent_card(registry):
+    """Skill TTLs from the AgentCard enable caching; repeat calls hit the cache."""
+    agent = registry.find_agent_for_method("get_crm_history")
+    request = {
+        "jsonrpc": "2.0",
+        "method": "get_crm_history",
+        "params": {"contact_name": "John Doe"},
+        "id": "1",
+    }
+    await agent.handle_rpc(request)
+    await agent.handle_rpc({**request, "id": "2"})
+    stats = registry.cache_stats()["CRM Research Agent"]
+    assert stats["misses"] == 1
+    assert stats["hits"] == 1
+
+
+def test_agents_are_created_on_first_use(registry):
+    """Loading only indexes skills; the agent is created by the first lookup."""
+    assert registry.skill_map == {}
+    assert registry.find_card_for_method("get_crm_history")["name"] == (
+        "CRM Research Agent"
+    )
+    agent = registry.find_agent_for_method("get_crm_history")
+    assert registry.find_agent_for_method("get_crm_history") is agent
+    assert "get_company_news" not in registry.skill_map
+
+
+def test_prewarm_creates_every_agent():
+    registry = AgentRegistry.from_card_paths(
+        ["agent_cards/web_research_agent_card.json"], prewarm=True
+    )
+    assert isinstance(registry.skill_map["get_company_news"], WebResearchAgent)
+
+
+def test_card_index_reparses_only_changed_cards(tmp_path):
+    for name in ("web_research_agent_card.json", "crm_research_agent_card.json"):
+        shutil.copy(f"agent_cards/{name}", tmp_path / name)
+    paths = sorted(str(p) for p in tmp_path.glob("*.json"))
+    index = CardIndex(str(tmp_path / DEFAULT_INDEX_NAME))
+
+    assert len(index.load_cards(paths)) == 2
+    assert (index.parsed, index.reused) == (2, 0)
+
+    cards = index.load_cards(paths)
+    assert (index.parsed, index.reused) == (0, 2)
+    assert cards[0]["name"] == "CRM Research Agent"
+
+    card = json.loads((tmp_path / "web_research_agent_card.json").read_text())
+    card["version"] = "10.0.0"
+    (tmp_path / "web_research_agent_card.json").write_text(json.dumps(card, indent=2))
+    cards = index.load_cards(paths)
+    assert (index.parsed, index.reused) == (1, 1)
+    assert cards[1]["version"] == "10.0.0"
+
+    registry = AgentRegistry.from_card_dir(str(tmp_path))
+    assert isinstance(registry.find_agent_for_method("get_crm_history"), CRMResearchAgent)
+
+
+def _copy_cards(directory):
+    for name in ("web_research_agent_card.json", "crm_research_agent_card.json"):
+        shutil.copy(f"agent_cards/{name}", directory / name)
+
+
+def _bump_version(path, version):
+    card = json.loads(path.read_text())
+    card["version"] = version
+    path.write_text(json.dumps(card, indent=2))
+
+
+def test_reload_keeps_unchanged_agents_and_retires_changed(tmp_path):
+    _copy_cards(tmp_path)
+    registry = AgentRegistry.from_card_dir(str(tmp_path))
+    web = registry.find_agent_for_method("get_company_news")
+    crm = registry.find_agent_for_method("get_crm_history")
+    generation = registry.generation
+
+    _bump_version(tmp_path / "crm_research_agent_card.json", "1.1.0")
+    report = registry.reload(sorted(str(p) for p in tmp_path.glob("*.json")))
+
+    assert report == {"added": [], "updated": ["CRM Research Agent"], "removed": []}
+    assert registry.generation == generation + 1
+    assert registry.find_agent_for_method("get_company_news") is web
+    new_crm = registry.find_agent_for_method("get_crm_history")
+    assert new_crm is not crm
+    assert registry.card_versions()["CRM Research Agent"] == "1.1.0"
+    assert [(r.name, r.version) for r in registry.retired] == [
+        ("CRM Research Agent", "1.0.0")
+    ]
+
+    assert registry.drain(grace_period=60) == []
+    drained = registry.drain()
+    assert [r.agent for r in drained] == [crm]
+    assert registry.retired == []
+
+
+def test_reload_removes_agents(tmp_path):
+    _copy_cards(tmp_path)
+    registry = AgentRegistry.from_card_dir(str(tmp_path))
+    old_skill_map = registry.skill_map
+
+    report = registry.reload([str(tmp_path / "web_research_agent_card.json")])
+
+    assert report["removed"] == ["CRM Research Agent"]
+    assert registry.find_agent_for_method("get_crm_history") is None
+    assert registry.query_parser.parse("crm history for Jane Doe") == []
+    assert old_skill_map is not registry.skill_map
+
+
+def test_lookups_do_not_wait_for_a_reload_to_build_its_tables(tmp_path, monkeypatch):
+    """Agents can be created while a reload compiles its parser and skill index."""
+    _copy_cards(tmp_path)
+    registry = AgentRegistry.from_card_dir(str(tmp_path))
+    building, release = threading.Event(), threading.Event()
+    compile_query_parser = agent_registry._compile_query_parser
+
+    def slow_compile(card_map):
+        building.set()
+        release.wait(5)
+        return compile_query_parser(card_map)
+
+    monkeypatch.setattr(agent_registry, "_compile_query_parser", slow_compile)
+    paths = sorted(str(p) for p in tmp_path.glob("*.json"))
+    reload = threading.Thread(target=registry.reload, args=(paths,))
+    reload.start()
+    try:
+        assert building.wait(5)
+        looked_up = []
+
+        def look_up():
+            looked_up.append(registry.find_agent_for_method("get_crm_history"))
+
+        lookup = threading.Thread(target=look_up)
+        lookup.start()
+        lookup.join(2)
+        assert isinstance(looked_up[0], CRMResearchAgent)
+    finally:
+        release.set()
+        reload.join(5)
+    # The agent created during the reload carries over to the new generation.
+    assert registry.find_agent_for_method("get_crm_history") is looked_up[0]
+
+
+def test_replicas_are_load_balanced(tmp_path):
+    card = json.loads(open("agent_cards/crm_research_agent_card.json").read())
+    card["replicas"] = 3
+    card["loadBalancing"] = "least-outstanding"
+    path = tmp_path / "crm.json"
+    path.write_text(json.dumps(card))
+    registry = AgentRegistry.from_card_paths([str(path)])
+
+    first = registry.find_agent_for_method("get_crm_history")
+    assert isinstance(first.agent, CRMResearchAgent)
+    first.in_flight += 1
+    second = registry.find_agent_for_method("get_crm_history")
+    assert second is not first
+    assert len(registry.replica_stats()["get_crm_history"]) == 3
+    assert registry.cache_stats()["CRM Research Agent"]["max_entries"] == 3 * 1024
+
+
+def test_cards_sharing_a_skill_become_replicas(tmp_path):
+    card = json.loads(open("agent_cards/web_research_agent_card.json").read())
+    paths = []
+    for index in range(2):
+        copy = dict(card, name=f"Web Research Agent {index}")
+        paths.append(tmp_path / f"web{index}.json")
+        paths[-1].write_text(json.dumps(copy))
+    for index in range(2):
+        AGENT_CLASS_REGISTRY[f"web-research-agent-{index}"] = AGENT_CLASS_REGISTRY[
+            "web-research-agent"
+        ]
+    try:
+        registry = AgentRegistry.from_card_paths([str(p) for p in paths])
+        agents = {
+            id(registry.find_agent_for_method("get_company_news").agent)
+            for _ in range(50)
+        }
+    finally:
+        for index in range(2):
+            del AGENT_CLASS_REGISTRY[f"web-research-agent-{index}"]
+    assert len(agents) == 2
@@ -0,0 +1,62 @@
+import asyncio
+
+import pytest
+
+from agents.balancer import LEAST_OUTSTANDING, Replica, ReplicaSet
+
+
+class SleepyAgent:
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.cache = None
+
+    async def handle_rpc(self, request):
+        await asyncio.sleep(self.delay)
+        return {"jsonrpc": "2.0", "result": {}, "id": request["id"]}
+
+
+@pytest.mark.asyncio
+async def test_replica_tracks_in_flight_and_latency():
+    replica = Replica(SleepyAgent(0.02))
+    call = asyncio.ensure_future(replica.handle_rpc({"id": "1"}))
+    await asyncio.sleep(0)
+    assert replica.in_flight == 1
+
+    await call
+    assert replica.in_flight == 0
+    assert replica.requests == 1
+    assert replica.latency_ewma >= 0.02
+    assert replica.cache is None  # other attributes come from the agent
+
+
+def test_least_outstanding_prefers_idle_then_faster():
+    a, b, c = (Replica(SleepyAgent()) for _ in range(3))
+    a.in_flight, b.in_flight, c.in_flight = 2, 0, 0
+    b.latency_ewma, c.latency_ewma = 0.5, 0.1
+    assert ReplicaSet([a, b, c], LEAST_OUTSTANDING).choose() is c
+
+
+def test_power_of_two_picks_cheaper_of_sample():
+    a, b, c = (Replica(SleepyAgent()) for _ in range(3))
+    for replica in (a, b, c):
+        replica.latency_ewma = 0.1
+    a.in_flight = 3
+    replicas = ReplicaSet([a, b, c], rng=lambda n, k: [0, 2])
+    assert replicas.choose() is c
+
+
+def test_unknown_strategy_is_rejected():
+    with pytest.raises(ValueError):
+        ReplicaSet([], "round-robin")
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_spread_across_replicas():
+    replicas = [Replica(SleepyAgent(0.01)) for _ in range(4)]
+    balancer = ReplicaSet(replicas, LEAST_OUTSTANDING)
+
+    async def call(i):
+        return await balancer.choose().handle_rpc({"id": str(i)})
+
+    await asyncio.gather(*(call(i) for i in range(40)))
+    assert [r.requests for r in replicas] == [10, 10, 10, 10]
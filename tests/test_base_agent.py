@@ -0,0 +1,128 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from protocol.base_agent import BaseAgent
+
+
+class EchoAgent(BaseAgent):
+    """Agent with one blocking and one coroutine handler."""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        super().__init__(tool_layer=lambda value: value)
+
+    def get_supported_methods(self):
+        return {"echo_sync": self.echo_sync, "echo_async": self.echo_async}
+
+    def echo_sync(self, params: dict) -> dict:
+        time.sleep(self.delay)
+        return {"value": params.get("value"), "thread": threading.get_ident()}
+
+    async def echo_async(self, params: dict) -> dict:
+        await asyncio.sleep(self.delay)
+        return {"value": params.get("value"), "thread": threading.get_ident()}
+
+
+class CPUAgent(BaseAgent):
+    """Agent whose handlers run in a process pool."""
+
+    executor_type = "process"
+    max_workers = 1
+
+    def __init__(self):
+        super().__init__(tool_layer=sum)
+
+    def get_supported_methods(self):
+        return {"total": self.total}
+
+    def total(self, params: dict) -> int:
+        return self.tool_layer(range(params["n"]))
+
+
+@pytest.mark.asyncio
+async def test_sync_handler_runs_off_event_loop():
+    """Plain handlers are dispatched to the executor, not the loop thread."""
+    agent = EchoAgent()
+    request = {"jsonrpc": "2.0", "method": "echo_sync", "params": {"value": 1}, "id": "1"}
+    response = await agent.handle_rpc(request)
+    assert response["result"]["value"] == 1
+    assert response["result"]["thread"] != threading.get_ident()
+    agent.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_async_handler_is_awaited_on_loop():
+    """Coroutine handlers are awaited directly on the event loop."""
+    agent = EchoAgent()
+    request = {"jsonrpc": "2.0", "method": "echo_async", "params": {"value": 2}, "id": "2"}
+    response = await agent.handle_rpc(request)
+    assert response["result"] == {"value": 2, "thread": threading.get_ident()}
+
+
+@pytest.mark.asyncio
+async def test_blocking_handlers_run_concurrently():
+    """N blocking calls finish in roughly the time of one."""
+    agent = EchoAgent(delay=0.2)
+    requests = [
+        {"jsonrpc": "2.0", "method": "echo_sync", "params": {"value": i}, "id": str(i)}
+        for i in range(5)
+    ]
+    start = time.perf_counter()
+    responses = await asyncio.gather(*(agent.handle_rpc(r) for r in requests))
+    elapsed = time.perf_counter() - start
+    assert [r["result"]["value"] for r in responses] == list(range(5))
+    assert elapsed < 0.6
+    agent.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_process_executor_handler():
+    """Agents can declare a process pool for CPU-bound skills."""
+    agent = CPUAgent()
+    request = {"jsonrpc": "2.0", "method": "total", "params": {"n": 10}, "id": "3"}
+    response = await agent.handle_rpc(request)
+    assert response["result"] == 45
+    agent.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_process_executor_handler_with_cache():
+    """A cached skill's handler still pickles while its call is in flight."""
+    agent = CPUAgent()
+    agent.apply_card({"skills": [{"id": "total", "cache": {"ttlSeconds": 60}}]})
+    request = {"jsonrpc": "2.0", "method": "total", "params": {"n": 10}, "id": "4"}
+    responses = await asyncio.gather(agent.handle_rpc(request), agent.handle_rpc(request))
+    assert [r["result"] for r in responses] == [45, 45]
+    assert (await agent.handle_rpc(request))["result"] == 45
+    assert agent.cache.stats()["hits"] == 1
+    agent.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_batch_returns_responses_matched_by_id():
+    """Batch members run concurrently and notifications get no response."""
+    agent = EchoAgent(delay=0.2)
+    batch = [
+        {"jsonrpc": "2.0", "method": "echo_sync", "params": {"value": 1}, "id": "a"},
+        {"jsonrpc": "2.0", "method": "echo_async", "params": {"value": 2}, "id": "b"},
+        {"jsonrpc": "2.0", "method": "missing", "params": {}, "id": "c"},
+        {"jsonrpc": "2.0", "method": "echo_async", "params": {"value": 3}},
+    ]
+    start = time.perf_counter()
+    responses = await agent.handle_rpc(batch)
+    assert time.perf_counter() - start < 0.4
+    assert [r["id"] for r in responses] == ["a", "b", "c"]
+    assert responses[0]["result"]["value"] == 1
+    assert responses[1]["result"]["value"] == 2
+    assert responses[2]["error"]["code"] == -32601
+    agent.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_empty_batch_is_invalid_request():
+    """An empty batch is rejected with a single -32600 error object."""
+    agent = EchoAgent()
+    response = await agent.handle_rpc([])
+    assert response["error"]["code"] == -32600
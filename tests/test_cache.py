@@ -0,0 +1,95 @@
+import asyncio
+
+import pytest
+from protocol.cache import MISSING, ResultCache, canonical_key
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_canonical_key_ignores_param_order():
+    """Params with the same content produce the same key."""
+    assert canonical_key("m", {"a": 1, "b": 2}) == canonical_key("m", {"b": 2, "a": 1})
+    assert canonical_key("m", {"a": 1}) != canonical_key("n", {"a": 1})
+
+
+def test_lru_eviction_and_ttl_expiry():
+    """Entries are evicted least-recently-used first and expire after their TTL."""
+    clock = FakeClock()
+    cache = ResultCache(max_entries=2, clock=clock)
+    cache.put("a", 1, ttl=10)
+    cache.put("b", 2, ttl=10)
+    assert cache.get("a") == 1  # "b" is now least recently used
+    cache.put("c", 3, ttl=10)
+    assert cache.get("b") is MISSING
+    assert cache.evictions == 1
+
+    clock.now = 11
+    assert cache.get("a") is MISSING
+    assert cache.expirations == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_calls_are_coalesced():
+    """Concurrent requests for one key share a single in-flight call."""
+    cache = ResultCache()
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return {"value": 42}
+
+    calls_in_flight = [cache.get_or_call("k", 60, fetch) for _ in range(5)]
+    results = await asyncio.gather(*calls_in_flight)
+    assert results == [{"value": 42}] * 5
+    assert calls == 1
+    assert await cache.get_or_call("k", 60, fetch) == {"value": 42}
+    stats = cache.stats()
+    assert stats["misses"] == 1
+    assert stats["coalesced"] == 4
+    assert stats["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_errors_are_not_cached():
+    """A failed call propagates to waiters and is retried on the next request."""
+    cache = ResultCache()
+
+    async def fail():
+        raise RuntimeError("backend down")
+
+    with pytest.raises(RuntimeError):
+        await cache.get_or_call("k", 60, fail)
+    assert len(cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_shared_call_is_cancelled_with_its_last_waiter():
+    """The in-flight call stops once every request waiting on it is cancelled."""
+    cache = ResultCache()
+    cancelled = asyncio.Event()
+
+    async def fetch():
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    waiters = [
+        asyncio.ensure_future(cache.get_or_call("k", 60, fetch)) for _ in range(2)
+    ]
+    await asyncio.sleep(0.01)
+    waiters[0].cancel()
+    await asyncio.sleep(0.01)
+    assert not cancelled.is_set()
+    waiters[1].cancel()
+    await asyncio.wait_for(cancelled.wait(), 1)
+    assert len(cache) == 0
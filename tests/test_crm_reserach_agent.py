@@ -1,5 +1,7 @@
 import pytest
+from unittest.mock import MagicMock
 from agents.crm_research_agent.agent import CRMResearchAgent
+from protocol.pagination import Page, PageConfig
 
 
 def test_get_supported_methods():
@@ -10,20 +12,94 @@ def test_get_supported_methods():
     assert callable(methods["get_crm_history"])
 
 
-def test_get_crm_history_valid_input():
+@pytest.mark.asyncio
+async def test_get_crm_history_valid_input():
     """Valid input returns expected mock CRM data."""
     agent = CRMResearchAgent()
     params = {"contact_name": "Jane Smith"}
-    result = agent.get_crm_history(params)
+    result = await agent.get_crm_history(params)
     assert result["contact"] == "Jane Smith"
     assert isinstance(result["interactions"], list)
     assert all(
         "date" in i and "type" in i and "note" in i for i in result["interactions"]
     )
+    assert result["next_cursor"] is None
 
 
-def test_get_crm_history_missing_param():
+@pytest.mark.asyncio
+async def test_get_crm_history_missing_param():
     """Missing contact_name param raises ValueError."""
     agent = CRMResearchAgent()
     with pytest.raises(ValueError, match="Missing 'contact_name' parameter."):
-        agent.get_crm_history({})
+        await agent.get_crm_history({})
+
+
+@pytest.mark.asyncio
+async def test_get_crm_history_reads_only_the_requested_page():
+    """A page reads limit + 1 items from the tool layer and links to the next page."""
+    fetched = []
+
+    async def interactions(contact_name, since=None, offset=0):
+        for i in range(offset, 1000):
+            fetched.append(i)
+            yield {"date": "2025-05-20", "type": "call", "note": str(i)}
+
+    agent = CRMResearchAgent(tool_layer=interactions)
+    agent.pagination = {"get_crm_history": PageConfig(default_limit=2, max_limit=3)}
+    first = await agent.get_crm_history({"contact_name": "Jane"})
+    assert [i["note"] for i in first["interactions"]] == ["0", "1"]
+    assert fetched == [0, 1, 2]
+
+    second = await agent.get_crm_history(
+        {"contact_name": "Jane", "cursor": first["next_cursor"], "limit": 10}
+    )
+    assert [i["note"] for i in second["interactions"]] == ["2", "3", "4"]
+    assert second["next_cursor"] is not None
+
+    with pytest.raises(ValueError, match="Invalid 'cursor' parameter."):
+        await agent.get_crm_history({"contact_name": "Jane", "cursor": "bogus"})
+
+
+@pytest.mark.asyncio
+async def test_get_crm_history_since_filters_older_interactions():
+    agent = CRMResearchAgent()
+    result = await agent.get_crm_history({"contact_name": "Jane", "since": "2025-05-21"})
+    assert [i["date"] for i in result["interactions"]] == ["2025-05-25"]
+    with pytest.raises(ValueError, match="Invalid 'since' parameter."):
+        await agent.get_crm_history({"contact_name": "Jane", "since": "last week"})
+
+
+@pytest.mark.asyncio
+async def test_batch_get_crm_history_uses_one_backend_call():
+    """A batch of lookups reaches the CRM backend in a single call."""
+    batch_tool_layer = MagicMock(
+        side_effect=lambda names, pages: [[{"note": n}] for n in names]
+    )
+    agent = CRMResearchAgent(batch_tool_layer=batch_tool_layer)
+    batch = [
+        {
+            "jsonrpc": "2.0",
+            "method": "get_crm_history",
+            "params": {"contact_name": name},
+            "id": name,
+        }
+        for name in ("Jane Smith", "John Doe")
+    ]
+    batch.append({"jsonrpc": "2.0", "method": "get_crm_history", "params": {}, "id": "bad"})
+    responses = await agent.handle_rpc(batch)
+    batch_tool_layer.assert_called_once_with(["Jane Smith", "John Doe"], [Page(), Page()])
+    assert responses[0]["result"]["interactions"] == [{"note": "Jane Smith"}]
+    assert responses[1]["result"]["contact"] == "John Doe"
+    assert responses[2]["error"]["code"] == -32000
+    agent.shutdown()
+
+
+def test_get_contact_company():
+    """Looks up the contact's company through the injected tool layer."""
+    agent = CRMResearchAgent(company_tool_layer=lambda name: "Initech")
+    assert agent.get_contact_company({"contact_name": "Bill Lumbergh"}) == {
+        "contact": "Bill Lumbergh",
+        "company": "Initech",
+    }
+    with pytest.raises(ValueError):
+        agent.get_contact_company({})
@@ -0,0 +1,170 @@
+import asyncio
+import json
+import time
+from unittest.mock import MagicMock
+
+import pytest
+from agent_registry import AgentRegistry
+from agents.retry import RetryPolicy, call_with_retry
+from agents.supervisor_agent import SupervisorAgent
+from protocol import deadline as deadlines
+from protocol.base_agent import BaseAgent
+from protocol.deadline import Deadline, deadline_of
+from protocol.messages import Task
+from protocol.serialization import Serializer
+
+QUERY = "crm history for Jane A. Smith"
+
+
+class ToolAgent(BaseAgent):
+    """Agent whose blocking handler records the deadline its tool layer sees."""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.seen = []
+        super().__init__(tool_layer=self.poll)
+
+    def get_supported_methods(self):
+        return {"get_crm_history": self.get_crm_history}
+
+    def poll(self):
+        self.seen.append(deadlines.remaining())
+        stop = time.monotonic() + self.delay
+        while time.monotonic() < stop and not deadlines.expired():
+            time.sleep(0.01)
+        self.seen.append(deadlines.expired())
+        return {"ok": True}
+
+    def get_crm_history(self, params: dict) -> dict:
+        return self.tool_layer()
+
+
+def supervisor_for(agent, **kwargs) -> SupervisorAgent:
+    registry = AgentRegistry.from_card_paths([])
+    registry.find_agent_for_method = MagicMock(return_value=agent)
+    return SupervisorAgent(agent_registry=registry, **kwargs)
+
+
+def test_wire_timeout_round_trips():
+    """A bounded deadline travels as the remaining seconds in "timeout"."""
+    task = Task("m", {}, "t:0", Deadline.after(5))
+    assert 4.5 < task["timeout"] <= 5
+    assert "timeout" not in Task("m", {}, "t:1", Deadline())
+    decoded = json.loads(Serializer("json").dumps(task))
+    assert 4.5 < decoded["timeout"] <= 5
+    assert 4.5 < deadline_of(decoded).remaining() <= 5
+    assert deadline_of({"method": "m"}) is None
+
+
+@pytest.mark.asyncio
+async def test_query_timeout_bounds_retries():
+    """Retries share the query's budget instead of each getting a full timeout."""
+
+    class SlowAgent:
+        async def handle_rpc(self, task):
+            await asyncio.sleep(5)
+
+    sa = supervisor_for(SlowAgent(), query_timeout=0.2)
+    start = time.monotonic()
+    [response] = await sa.handle_query(QUERY)
+    assert time.monotonic() - start < 1.0
+    assert response["error"] == {"code": -32001, "message": "Deadline exceeded"}
+
+
+@pytest.mark.asyncio
+async def test_call_with_retry_stops_when_deadline_is_spent():
+    calls = []
+
+    async def attempt():
+        calls.append(1)
+        await asyncio.sleep(1)
+
+    policy = RetryPolicy(max_attempts=5, attempt_timeout=0.1)
+    result = await call_with_retry(
+        attempt,
+        policy,
+        failure_codes=lambda r: {-32001},
+        on_timeout=lambda seconds: seconds,
+        on_circuit_open=lambda: None,
+        deadline=Deadline.after(0.15),
+    )
+    assert len(calls) == 2
+    assert result < 0.1
+
+
+@pytest.mark.asyncio
+async def test_expired_request_is_rejected_without_running():
+    agent = ToolAgent()
+    request = {
+        "jsonrpc": "2.0",
+        "method": "get_crm_history",
+        "params": {},
+        "id": "1",
+        "timeout": 0,
+    }
+    response = await agent.handle_rpc(request)
+    assert response["error"]["code"] == -32001
+    assert agent.seen == []
+    agent.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_tool_layer_sees_deadline_and_stops_when_it_expires():
+    """The deadline reaches the executor thread; the tool stops once it expires."""
+    agent = ToolAgent(delay=5)
+    deadline = Deadline.after(30)
+    call = asyncio.ensure_future(
+        agent.handle_rpc(Task("get_crm_history", {}, "t:0", deadline))
+    )
+    while not agent.seen:
+        await asyncio.sleep(0.01)
+    deadline.cancel()  # expires it without racing a timer
+    response = await asyncio.wait_for(call, 2)
+
+    # The tool returned normally once it saw the deadline expire, but its possibly
+    # truncated result is not sent back.
+    assert response["error"]["code"] == -32001
+    assert 0 < agent.seen[0] <= 30
+    assert agent.seen[1] is True
+    agent.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_coalesced_call_ignores_the_first_callers_deadline():
+    """A short deadline on the first caller neither cuts short nor fails the others."""
+    agent = ToolAgent(delay=0.3)
+    agent.apply_card(
+        {"skills": [{"id": "get_crm_history", "cache": {"ttlSeconds": 60}}]}
+    )
+    hurried = agent.handle_rpc(Task("get_crm_history", {}, "t:0", Deadline.after(0.05)))
+    patient = agent.handle_rpc(Task("get_crm_history", {}, "t:1", Deadline.after(30)))
+    first, second = await asyncio.gather(hurried, patient)
+
+    assert first["error"]["code"] == -32001
+    assert second["result"] == {"ok": True}
+    assert agent.seen == [None, False]  # the shared call ran without a deadline
+    assert agent.cache.stats()["coalesced"] == 1
+    agent.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_cancelling_a_query_cancels_its_agent_calls():
+    started = asyncio.Event()
+    cancelled = asyncio.Event()
+
+    class WaitingAgent:
+        async def handle_rpc(self, task):
+            started.set()
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+    sa = supervisor_for(WaitingAgent())
+    query = asyncio.ensure_future(sa.handle_query(QUERY))
+    await asyncio.wait_for(started.wait(), 1)
+    query.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await query
+    await asyncio.wait_for(cancelled.wait(), 1)
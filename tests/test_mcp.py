@@ -0,0 +1,138 @@
+import asyncio
+import json
+import os
+import time
+
+import pytest
+from agents.crm_research_agent.agent import CRMResearchAgent
+from protocol.mcp import MCPToolLayer, MCPToolPool, ToolError
+from protocol.pagination import Page, read_page
+
+SERVER = os.path.join(os.path.dirname(os.path.dirname(__file__)), "mock_mcp_server.py")
+CRM_CARD = os.path.join(
+    os.path.dirname(SERVER), "agent_cards", "crm_research_agent_card.json"
+)
+
+
+def server_command(*flags):
+    return ["python", SERVER, *flags]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_server():
+    """Calls in flight together are multiplexed over one server's pipes."""
+    pool = MCPToolPool(server_command("--latency", "0.2"), size=1)
+    try:
+        await pool.call_tool("crm_interactions", {"contact_name": "Jane Smith"})
+        start = time.perf_counter()
+        pages = await asyncio.gather(
+            *(
+                pool.call_tool(
+                    "company_articles", {"company_name": f"Company {i}", "limit": 1}
+                )
+                for i in range(8)
+            )
+        )
+        elapsed = time.perf_counter() - start
+    finally:
+        await pool.aclose()
+
+    assert elapsed < 0.8  # 8 × 0.2 s if the calls were serialized
+    assert [page["items"][0]["title"].split(" Q2")[0] for page in pages] == [
+        f"Company {i}" for i in range(8)
+    ]
+    assert pool.stats()["calls"] == 9
+
+
+@pytest.mark.asyncio
+async def test_crashed_server_is_replaced():
+    """A server's exit fails its outstanding calls and the next call gets a new one."""
+    pool = MCPToolPool(server_command("--crash-after", "2"), size=1)
+    arguments = {"contact_name": "Jane Smith"}
+    try:
+        with pytest.raises(ToolError, match="Unknown tool"):
+            await pool.call_tool("no_such_tool", {})
+        assert len((await pool.call_tool("crm_interactions", arguments))["items"]) == 2
+        with pytest.raises(ConnectionError):
+            await pool.call_tool("crm_interactions", arguments)
+        assert len((await pool.call_tool("crm_interactions", arguments))["items"]) == 2
+        assert pool.stats()["restarts"] == 1
+    finally:
+        await pool.aclose()
+
+
+@pytest.mark.asyncio
+async def test_calls_go_to_live_servers_while_dead_slots_respawn():
+    """A dead server's slot is refilled in the background, not by the next call."""
+    pool = MCPToolPool(server_command(), size=2)
+    arguments = {"contact_name": "Jane Smith"}
+    try:
+        await pool.call_tool("crm_interactions", arguments)
+        dead = pool._servers[0]
+        dead.process.kill()
+        while dead.alive:
+            await asyncio.sleep(0.01)
+
+        assert len((await pool.call_tool("crm_interactions", arguments))["items"]) == 2
+        assert pool.stats()["alive"] == 1  # answered before the replacement started
+        await pool._respawning
+        assert pool.stats()["alive"] == 2
+        assert pool.stats()["restarts"] == 1
+    finally:
+        await pool.aclose()
+
+
+@pytest.mark.asyncio
+async def test_failed_spawns_back_off():
+    """After a failed spawn, calls fail fast instead of spawning again."""
+    pool = MCPToolPool(["python", "-c", "pass"], size=2)
+    with pytest.raises(ConnectionError):
+        await pool.call_tool("crm_interactions", {})
+    with pytest.raises(ConnectionError, match="retrying in"):
+        await pool.call_tool("crm_interactions", {})
+    assert pool.stats()["spawn_failures"] == 2  # both slots, once
+
+
+@pytest.mark.asyncio
+async def test_tool_layer_requests_pages_as_they_are_read():
+    """The tool layer asks the server for the next page only when the reader needs it."""
+    pool = MCPToolPool(server_command(), size=1)
+    layer = MCPToolLayer(pool, "crm_interactions", ["contact_name"], page_size=1)
+    try:
+        items, next_cursor = await read_page(layer("Jane Smith"), Page(limit=1))
+        assert [item["type"] for item in items] == ["call"]
+        assert next_cursor is not None
+        assert pool.calls == 2  # the page plus the one item that tells a next page exists
+    finally:
+        await pool.aclose()
+
+
+@pytest.mark.asyncio
+async def test_agent_reads_from_the_tool_server_declared_in_its_card():
+    """A card's toolServer replaces the agent's tool layer, batched requests included."""
+    with open(CRM_CARD) as f:
+        card = json.load(f)
+    request = {
+        "jsonrpc": "2.0",
+        "id": "t:0",
+        "method": "get_crm_history",
+        "params": {"contact_name": "Jane Smith", "since": "2025-05-22"},
+    }
+    expected = await CRMResearchAgent().handle_rpc(request)
+
+    card["toolServer"] = {
+        "command": server_command(),
+        "tool": "crm_interactions",
+        "arguments": ["contact_name"],
+        "poolSize": 2,
+    }
+    agent = CRMResearchAgent()
+    agent.apply_card(card)
+    try:
+        assert (await agent.handle_rpc(request))["result"] == expected["result"]
+        batch = await agent.handle_rpc([request, {**request, "id": "t:1"}])
+        assert [r["result"] for r in batch] == [expected["result"]] * 2
+        assert agent.tool_server.stats()["alive"] == 2
+    finally:
+        await agent.tool_server.aclose()
+        agent.shutdown()
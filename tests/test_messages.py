@@ -0,0 +1,72 @@
+import json
+
+from protocol.messages import Response, Task, to_wire, with_id
+
+
+def test_task_reads_like_a_request_dict():
+    """A Task exposes the JSON-RPC request members and compares equal to the dict."""
+    task = Task("get_crm_history", {"contact_name": "Jane Smith"}, "t:0")
+    assert task["method"] == "get_crm_history"
+    assert task.get("params") == {"contact_name": "Jane Smith"}
+    assert task.get("missing", 1) == 1
+    assert "id" in task and "result" not in task
+    assert task == {
+        "jsonrpc": "2.0",
+        "method": "get_crm_history",
+        "params": {"contact_name": "Jane Smith"},
+        "id": "t:0",
+    }
+
+
+def test_response_exposes_only_result_or_error():
+    """A success has no 'error' member, a failure has no 'result' member."""
+    ok = Response("t:0", None)
+    assert "result" in ok and "error" not in ok
+    assert ok["result"] is None
+    assert ok == {"jsonrpc": "2.0", "result": None, "id": "t:0"}
+
+    failed = Response.failure("t:1", -32001, "Timeout after 1 seconds")
+    assert "error" in failed and "result" not in failed
+    assert failed["error"]["code"] == -32001
+    assert failed.get("result") is None
+    assert "final" not in failed
+
+
+def test_streamed_response_carries_final():
+    response = Response("t:0", {"articles": []}, final=False)
+    assert response["final"] is False
+    assert dict(response) == {
+        "jsonrpc": "2.0",
+        "result": {"articles": []},
+        "id": "t:0",
+        "final": False,
+    }
+
+
+def test_with_id_readdresses_responses_and_dicts():
+    response = Response("t:0", {"n": 1})
+    moved = with_id(response, "t:9")
+    assert isinstance(moved, Response)
+    assert moved["id"] == "t:9" and response["id"] == "t:0"
+    assert with_id({"jsonrpc": "2.0", "result": 1, "id": 1}, 2)["id"] == 2
+
+
+def test_to_wire_encodes_nested_messages():
+    """json.dumps(default=to_wire) encodes messages inside lists and results."""
+    inner = [Response("t:0", {"n": 1}), Response.failure("t:1", -32000, "boom")]
+    payload = [Response(7, inner), Task("echo", {}, "t:2")]
+    assert json.loads(json.dumps(payload, default=to_wire)) == [
+        {
+            "jsonrpc": "2.0",
+            "result": [
+                {"jsonrpc": "2.0", "result": {"n": 1}, "id": "t:0"},
+                {
+                    "jsonrpc": "2.0",
+                    "error": {"code": -32000, "message": "boom"},
+                    "id": "t:1",
+                },
+            ],
+            "id": 7,
+        },
+        {"jsonrpc": "2.0", "method": "echo", "params": {}, "id": "t:2"},
+    ]
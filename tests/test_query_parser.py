@@ -0,0 +1,81 @@
+import pytest
+from agent_registry import AgentRegistry
+from agents.query_parser import DEFAULT_QUERY_PARSER, QueryParser
+from agents.task_graph import Ref
+
+
+@pytest.fixture
+def registry():
+    return AgentRegistry.from_card_paths(
+        [
+            "agent_cards/web_research_agent_card.json",
+            "agent_cards/crm_research_agent_card.json",
+        ]
+    )
+
+
+def test_parser_compiled_from_agent_cards(registry):
+    """The registry compiles queryPatterns from every loaded card."""
+    parser = registry.query_parser
+    assert isinstance(parser, QueryParser)
+    assert {rule.method for rule in parser.rules} == {
+        "get_company_news",
+        "get_crm_history",
+        "get_contact_company",
+    }
+
+
+def test_parse_matches_all_intents_in_skill_order():
+    """Every matching skill yields one task, in declaration order."""
+    query = "Pull CRM history for John Doe, then news about Acme Inc."
+    assert DEFAULT_QUERY_PARSER.parse(query) == [
+        ("get_company_news", {"company_name": "Acme Inc"}),
+        ("get_crm_history", {"contact_name": "John Doe"}),
+    ]
+
+
+def test_trigger_without_entity_yields_no_task():
+    """A trigger at the end of the query has no entity and produces no task."""
+    assert DEFAULT_QUERY_PARSER.parse("Any news about") == []
+
+
+def test_custom_patterns_and_entity_width():
+    """Patterns and entity width come from the card's skill entries."""
+    card = {
+        "skills": [
+            {
+                "id": "get_weather",
+                "queryPatterns": ["weather in {city}"],
+                "queryEntityWords": 1,
+            }
+        ]
+    }
+    parser = QueryParser.from_cards([card])
+    assert parser.parse("What's the weather in Paris today?") == [
+        ("get_weather", {"city": "Paris"})
+    ]
+
+
+def test_invalid_pattern_is_rejected():
+    """Patterns must end in exactly one placeholder."""
+    with pytest.raises(ValueError):
+        QueryParser.from_patterns({"m": ["{city} weather"]})
+
+
+def test_chained_pattern_reads_param_from_another_skill(registry):
+    """A chained pattern wins over a shorter overlapping trigger and returns a Ref."""
+    query = "news about the company of Jane Smith"
+    assert registry.query_parser.parse(query) == [
+        (
+            "get_company_news",
+            {
+                "company_name": Ref(
+                    "get_contact_company", {"contact_name": "Jane Smith"}, "company"
+                )
+            },
+        ),
+    ]
+    with pytest.raises(ValueError):
+        QueryParser.from_cards(
+            [{"skills": [{"id": "m", "queryPatterns": [{"pattern": "x {y}"}]}]}]
+        )
@@ -0,0 +1,70 @@
+import asyncio
+import json
+import shutil
+
+import pytest
+
+from agent_registry import AgentRegistry
+from registry_watcher import RegistryWatcher
+
+
+@pytest.fixture
+def card_dir(tmp_path):
+    shutil.copy("agent_cards/web_research_agent_card.json", tmp_path)
+    return tmp_path
+
+
+@pytest.mark.asyncio
+async def test_poll_reloads_only_on_change(card_dir):
+    registry = AgentRegistry.from_card_dir(str(card_dir))
+    watcher = RegistryWatcher(registry, str(card_dir), drain_timeout=0)
+    web = registry.find_agent_for_method("get_company_news")
+
+    assert await watcher.poll() is None
+    assert registry.find_agent_for_method("get_crm_history") is None
+
+    shutil.copy("agent_cards/crm_research_agent_card.json", card_dir)
+    report = await watcher.poll()
+
+    assert report == {"added": ["CRM Research Agent"], "updated": [], "removed": []}
+    assert registry.find_agent_for_method("get_crm_history") is not None
+    assert registry.find_agent_for_method("get_company_news") is web
+    assert watcher.reloads == 1
+
+
+@pytest.mark.asyncio
+async def test_in_flight_call_finishes_on_retired_agent(card_dir):
+    """A call that resolved its agent before a reload completes on the old instance."""
+    registry = AgentRegistry.from_card_dir(str(card_dir))
+    watcher = RegistryWatcher(registry, str(card_dir), drain_timeout=60)
+    old = registry.find_agent_for_method("get_company_news")
+    request = {
+        "jsonrpc": "2.0",
+        "method": "get_company_news",
+        "params": {"company_name": "Acme"},
+        "id": "1",
+    }
+    in_flight = asyncio.ensure_future(old.handle_rpc(request))
+
+    path = card_dir / "web_research_agent_card.json"
+    card = json.loads(path.read_text())
+    card["version"] = "2.0.0-rc1"
+    path.write_text(json.dumps(card))
+    report = await watcher.poll()
+
+    assert report["updated"] == ["Web Research Agent"]
+    assert registry.find_agent_for_method("get_company_news") is not old
+    assert [r.agent for r in registry.retired] == [old]
+    assert "result" in await in_flight
+
+
+@pytest.mark.asyncio
+async def test_watcher_survives_invalid_card(card_dir):
+    registry = AgentRegistry.from_card_dir(str(card_dir))
+    watcher = RegistryWatcher(registry, str(card_dir), interval=0.01)
+    watcher.start()
+    (card_dir / "broken.json").write_text("{not json")
+    await asyncio.sleep(0.05)
+    await watcher.stop()
+
+    assert registry.find_agent_for_method("get_company_news") is not None
@@ -0,0 +1,154 @@
+import multiprocessing
+import threading
+
+import pytest
+from agent_registry import AgentRegistry
+from protocol.cache import MISSING, ResultCache
+from protocol.result_store import ResultStore
+from supervisor_server import DEFAULT_CARD_PATHS
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def _fill(store, first, count):
+    for i in range(first, first + count):
+        store.put(f"k{i}", {"i": i}, ttl=60)
+
+
+def test_entries_survive_reopening_and_expire(tmp_path):
+    """A reopened store serves live entries with their remaining TTL."""
+    path = str(tmp_path / "results.db")
+    clock = FakeClock()
+    store = ResultStore(path, clock=clock)
+    store.put("get_crm_history:{}", {"contact": "Jane"}, ttl=60)
+    store.close()
+
+    clock.now += 20
+    store = ResultStore(path, clock=clock)
+    value, ttl = store.get("get_crm_history:{}")
+    assert value == {"contact": "Jane"}
+    assert ttl == pytest.approx(40)
+
+    clock.now += 41
+    assert store.get("get_crm_history:{}") == (MISSING, 0.0)
+    assert store.compact() == 1
+    assert store.stats()["entries"] == 0
+
+
+def test_compaction_keeps_newest_entries_under_the_size_limit(tmp_path):
+    """Compaction drops the oldest entries until the store is under its low-water mark."""
+    clock = FakeClock()
+    store = ResultStore(str(tmp_path / "results.db"), max_bytes=1000, clock=clock)
+    for i in range(100):
+        clock.now += 1
+        store.put(f"k{i}", {"i": i, "note": "x" * 20}, ttl=600)
+    store.compact()
+    stats = store.stats()
+    assert 0 < stats["bytes"] <= 900
+    assert store.get("k99")[0]["i"] == 99
+    assert store.get("k0")[0] is MISSING
+
+    store.put("object", object(), ttl=60)
+    assert store.stats()["skipped"] == 1
+
+
+def test_writers_in_several_processes_share_one_store(tmp_path):
+    """Worker processes can write to one database concurrently."""
+    store = ResultStore(str(tmp_path / "results.db"))
+    context = multiprocessing.get_context("spawn")
+    processes = [
+        context.Process(target=_fill, args=(store, first, 200))
+        for first in (0, 200, 400)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(30)
+        assert process.exitcode == 0
+    assert len(store) == 600
+    assert store.get("k450")[0] == {"i": 450}
+
+
+def test_cache_reads_through_to_the_store(tmp_path):
+    """A fresh ResultCache over a warm store serves its entries as hits."""
+    store = ResultStore(str(tmp_path / "results.db"))
+    ResultCache(store=store).put("k", [1, 2], ttl=60)
+    store.flush()  # cache writes reach the store in the background
+
+    cache = ResultCache(store=store)
+    assert cache.get("k") == [1, 2]
+    assert cache.get("k") == [1, 2]  # now from memory
+    assert cache.get("other") is MISSING
+    stats = cache.stats()
+    assert (stats["hits"], stats["store_hits"], stats["misses"]) == (2, 1, 1)
+
+
+@pytest.mark.asyncio
+async def test_cache_uses_the_store_off_the_event_loop(tmp_path):
+    """Store reads, writes and compactions run on other threads than the loop's."""
+    threads = []
+
+    class RecordingStore(ResultStore):
+        def get(self, key):
+            threads.append(("get", threading.current_thread()))
+            return super().get(key)
+
+        def put(self, key, value, ttl):
+            threads.append(("put", threading.current_thread()))
+            super().put(key, value, ttl)
+
+        def compact(self):
+            threads.append(("compact", threading.current_thread()))
+            return super().compact()
+
+    store = RecordingStore(str(tmp_path / "results.db"), compact_every=2)
+    cache = ResultCache(store=store)
+
+    async def call():
+        return {"ok": True}
+
+    for key in ("a", "b", "a"):
+        assert await cache.get_or_call(key, 60, call) == {"ok": True}
+    store.flush()
+    assert await ResultCache(store=store).aget("b") == {"ok": True}
+
+    assert {name for name, _ in threads} == {"get", "put", "compact"}
+    assert all(thread is not threading.main_thread() for _, thread in threads)
+    assert store.stats()["writes"] == 2
+    store.close()
+
+
+@pytest.mark.asyncio
+async def test_restarted_registry_serves_skills_from_the_store(tmp_path):
+    """Agents of a new registry answer cached skills without calling their tool layer."""
+    path = str(tmp_path / "results.db")
+    request = {
+        "jsonrpc": "2.0",
+        "id": "t:0",
+        "method": "get_crm_history",
+        "params": {"contact_name": "Jane Smith"},
+    }
+    store = ResultStore(path)
+    registry = AgentRegistry.from_card_paths(DEFAULT_CARD_PATHS, result_store=store)
+    first = await registry.find_agent_for_method("get_crm_history").handle_rpc(request)
+    store.close()
+
+    registry = AgentRegistry.from_card_paths(
+        DEFAULT_CARD_PATHS, result_store=ResultStore(path)
+    )
+    agent = registry.find_agent_for_method("get_crm_history")
+
+    async def unavailable(*args, **kwargs):
+        raise ConnectionError("CRM backend is down")
+        yield
+
+    agent.tool_layer = unavailable
+    second = await agent.handle_rpc(request)
+    assert second["result"] == first["result"]
+    assert registry.cache_stats()["CRM Research Agent"]["store_hits"] == 1
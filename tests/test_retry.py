@@ -0,0 +1,123 @@
+import asyncio
+
+import pytest
+from agents.retry import CircuitBreaker, LatencyWindow, RetryPolicy, call_with_retry
+
+
+def error(code):
+    return {"jsonrpc": "2.0", "error": {"code": code, "message": "x"}, "id": "1"}
+
+
+OK = {"jsonrpc": "2.0", "result": {}, "id": "1"}
+
+
+def codes(response):
+    return {response["error"]["code"]} if "error" in response else set()
+
+
+def scripted(*responses):
+    """Returns an attempt function that replays `responses` and counts calls."""
+    calls = []
+
+    async def attempt():
+        calls.append(len(calls))
+        response = responses[min(len(calls) - 1, len(responses) - 1)]
+        if isinstance(response, float):
+            await asyncio.sleep(response)
+            return OK
+        return response
+
+    return attempt, calls
+
+
+async def run(attempt, policy, breaker=None, latencies=None):
+    return await call_with_retry(
+        attempt,
+        policy,
+        failure_codes=codes,
+        on_timeout=lambda seconds: error(-32001),
+        on_circuit_open=lambda: error(-32004),
+        breaker=breaker,
+        latencies=latencies,
+    )
+
+
+def test_policy_from_card_config_and_backoff():
+    """Card config overrides defaults; backoff grows exponentially within jitter."""
+    policy = RetryPolicy.from_config(
+        {"maxAttempts": 4, "backoffBase": 0.1, "jitter": 0.5, "retryOn": [-32000]}
+    )
+    assert policy.max_attempts == 4
+    assert policy.attempt_timeout == 3.0
+    assert policy.retry_on == frozenset({-32000})
+    assert policy.backoff(0, rng=lambda: 1.0) == pytest.approx(0.1)
+    assert policy.backoff(2, rng=lambda: 0.0) == pytest.approx(0.2)
+
+
+@pytest.mark.asyncio
+async def test_retries_only_retryable_codes():
+    """Retryable errors are retried; others such as -32601 return immediately."""
+    policy = RetryPolicy(max_attempts=3, retry_on=frozenset({-32000}))
+    attempt, calls = scripted(error(-32000), OK)
+    assert await run(attempt, policy) == OK
+    assert len(calls) == 2
+
+    attempt, calls = scripted(error(-32601))
+    assert (await run(attempt, policy))["error"]["code"] == -32601
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_deadline_bounds_total_time():
+    """Attempts share one deadline budget instead of each getting a full timeout."""
+    policy = RetryPolicy(max_attempts=5, attempt_timeout=1.0, deadline=0.15)
+    attempt, calls = scripted(1.0)
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    result = await run(attempt, policy)
+    assert result["error"]["code"] == -32001
+    assert loop.time() - start < 0.5
+
+
+@pytest.mark.asyncio
+async def test_hedged_request_beats_slow_primary():
+    """A duplicate fired after the hedge delay returns before a stalled primary."""
+    policy = RetryPolicy(max_attempts=1, attempt_timeout=1.0, hedge_delay=0.05)
+    attempt, calls = scripted(0.5, 0.01)
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    assert await run(attempt, policy) == OK
+    assert len(calls) == 2
+    assert loop.time() - start < 0.3
+
+
+def test_hedge_delay_uses_observed_percentile():
+    """With enough samples, the hedge delay follows the configured percentile."""
+    window = LatencyWindow(min_samples=10)
+    for ms in range(1, 101):
+        window.record(ms / 1000)
+    policy = RetryPolicy(hedge_percentile=95, hedge_delay=1.0)
+    assert policy.hedge_after(window) == pytest.approx(0.096)
+    assert policy.hedge_after(LatencyWindow()) == 1.0
+
+
+@pytest.mark.asyncio
+async def test_circuit_breaker_fails_fast_then_recovers():
+    """An open circuit rejects calls until the reset timeout allows a trial call."""
+    now = [0.0]
+    breaker = CircuitBreaker(
+        failure_threshold=2, reset_timeout=10, clock=lambda: now[0]
+    )
+    policy = RetryPolicy(max_attempts=1)
+    failing, calls = scripted(error(-32000))
+    await run(failing, policy, breaker)
+    await run(failing, policy, breaker)
+    assert breaker.state == CircuitBreaker.OPEN
+
+    assert (await run(failing, policy, breaker))["error"]["code"] == -32004
+    assert len(calls) == 2
+
+    now[0] = 11
+    healthy, _ = scripted(OK)
+    assert await run(healthy, policy, breaker) == OK
+    assert breaker.state == CircuitBreaker.CLOSED
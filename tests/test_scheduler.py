@@ -0,0 +1,81 @@
+import asyncio
+
+import pytest
+from agents.scheduler import SchedulerOverloaded, TaskScheduler
+
+
+@pytest.mark.asyncio
+async def test_global_and_resource_limits_are_enforced():
+    """No more calls run at once than the global or per-resource limit allows."""
+    scheduler = TaskScheduler(max_concurrency=3)
+    running = {"all": 0, "crm": 0}
+    peak = {"all": 0, "crm": 0}
+
+    async def work(resource):
+        running["all"] += 1
+        running[resource] = running.get(resource, 0) + 1
+        peak["all"] = max(peak["all"], running["all"])
+        peak[resource] = max(peak.get(resource, 0), running[resource])
+        await asyncio.sleep(0.01)
+        running["all"] -= 1
+        running[resource] -= 1
+
+    submissions = [
+        scheduler.submit("q", [("crm", 1)], lambda: work("crm")) for _ in range(3)
+    ]
+    submissions += [
+        scheduler.submit("q", [("web", None)], lambda: work("web")) for _ in range(5)
+    ]
+    await asyncio.gather(*submissions)
+    assert peak["all"] == 3
+    assert peak["crm"] == 1
+    assert scheduler.running == 0 and scheduler.queued == 0
+
+
+@pytest.mark.asyncio
+async def test_round_robin_across_queries():
+    """A later query is not stuck behind every task of an earlier one."""
+    scheduler = TaskScheduler(max_concurrency=1)
+    order = []
+
+    async def work(label):
+        order.append(label)
+        await asyncio.sleep(0)
+
+    submissions = [
+        scheduler.submit("a", [], lambda i=i: work(f"a{i}")) for i in range(3)
+    ]
+    submissions.append(scheduler.submit("b", [], lambda: work("b0")))
+    await asyncio.gather(*submissions)
+    assert order.index("b0") < order.index("a2")
+
+
+@pytest.mark.asyncio
+async def test_full_queue_sheds_load():
+    """With overflow='shed', submissions beyond the queue bound are rejected."""
+    scheduler = TaskScheduler(max_concurrency=1, max_queue=1, overflow="shed")
+    release = asyncio.Event()
+
+    running = asyncio.ensure_future(scheduler.submit("q", [], release.wait))
+    queued = asyncio.ensure_future(scheduler.submit("q", [], release.wait))
+    await asyncio.sleep(0)
+    with pytest.raises(SchedulerOverloaded):
+        await scheduler.submit("q", [], release.wait)
+    release.set()
+    await asyncio.gather(running, queued)
+    assert scheduler.shed == 1
+
+
+@pytest.mark.asyncio
+async def test_full_queue_applies_backpressure():
+    """With overflow='block', submitters wait for queue space instead of failing."""
+    scheduler = TaskScheduler(max_concurrency=1, max_queue=1)
+
+    async def work(i):
+        await asyncio.sleep(0.01)
+        return i
+
+    results = await asyncio.gather(
+        *(scheduler.submit("q", [], lambda i=i: work(i)) for i in range(5))
+    )
+    assert results == list(range(5))
@@ -0,0 +1,73 @@
+import io
+import json
+
+import pytest
+from protocol.messages import Response, Task
+from protocol.serialization import (
+    JSONArrayWriter,
+    NDJSONWriter,
+    Serializer,
+    array_chunks,
+    orjson,
+)
+
+BACKENDS = ["json"] + (["orjson"] if orjson is not None else [])
+
+MESSAGES = [
+    Task("get_crm_history", {"contact_name": "Zoë"}, "t:0"),
+    Response("t:0", {"contact": "Zoë", "interactions": []}),
+    Response.failure("t:1", -32001, "Timeout after 3.0 seconds"),
+    Response("t:2", [Response("t:2:0", 1)], final=True),
+    {"jsonrpc": "2.0", "result": None, "id": 7},
+]
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_dumps_matches_the_wire_format(backend):
+    """Envelope fragments plus backend encoding produce the same JSON as to_wire."""
+    serializer = Serializer(backend)
+    for message in MESSAGES:
+        expected = message.to_wire() if hasattr(message, "to_wire") else message
+        assert json.loads(serializer.dumps(message)) == json.loads(
+            json.dumps(expected, default=lambda m: m.to_wire())
+        )
+    assert serializer.loads(serializer.dumps(MESSAGES[1]))["result"]["contact"] == "Zoë"
+
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError, match="Unknown JSON backend"):
+        Serializer("yaml")
+
+
+def test_writers_stream_ndjson_and_arrays():
+    serializer = Serializer("json")
+    stream = io.BytesIO()
+    writer = NDJSONWriter(stream, serializer)
+    for message in MESSAGES[1:3]:
+        writer.write(message)
+    writer.close()
+    lines = stream.getvalue().splitlines()
+    assert [json.loads(line)["id"] for line in lines] == ["t:0", "t:1"]
+
+    stream = io.BytesIO()
+    writer = JSONArrayWriter(stream, serializer)
+    writer.close()
+    assert json.loads(stream.getvalue()) == []
+
+    stream = io.BytesIO()
+    writer = JSONArrayWriter(stream, serializer)
+    for message in MESSAGES[1:3]:
+        writer.write(message)
+    writer.close()
+    assert [r["id"] for r in json.loads(stream.getvalue())] == ["t:0", "t:1"]
+
+
+@pytest.mark.asyncio
+async def test_array_chunks_yield_one_chunk_per_message():
+    async def messages():
+        for message in MESSAGES[1:3]:
+            yield message
+
+    chunks = [c async for c in array_chunks(messages(), Serializer("json"))]
+    assert len(chunks) == 3
+    assert len(json.loads(b"".join(chunks))) == 2
@@ -0,0 +1,82 @@
+import json
+
+from agent_registry import AgentRegistry
+from agents.crm_research_agent.agent import CRMResearchAgent
+from agents.skill_index import SkillIndex
+from supervisor_server import DEFAULT_CARD_PATHS
+
+
+def load_cards():
+    cards = []
+    for path in DEFAULT_CARD_PATHS:
+        with open(path) as f:
+            cards.append(json.load(f))
+    return cards
+
+
+def summary_card():
+    return {
+        "name": "Summary Agent",
+        "url": "local://summary",
+        "agentClass": "agents.crm_research_agent.agent.CRMResearchAgent",
+        "defaultInputModes": ["application/json"],
+        "defaultOutputModes": ["application/json"],
+        "skills": [
+            {
+                "id": "summarize_company",
+                "name": "Summarize Company",
+                "description": "Writes a short plain-text summary of a company.",
+                "tags": ["company", "summary"],
+                "outputModes": ["text/plain"],
+            }
+        ],
+    }
+
+
+def test_filters_intersect_tags_and_modes():
+    """A skill matches only if it has every requested tag and supports every mode."""
+    index = SkillIndex(load_cards() + [summary_card()])
+    ids = lambda matches: [m.skill_id for m in matches]
+
+    assert ids(index.search(tags=["crm"])) == ["get_crm_history", "get_contact_company"]
+    assert ids(index.search(tags=["CRM", "company"])) == ["get_contact_company"]
+    assert ids(index.search(output_modes=["text/plain"])) == ["summarize_company"]
+    assert ids(index.search(tags=["company"], output_modes=["application/json"])) == [
+        "get_company_news",
+        "get_contact_company",
+    ]
+    assert index.search(tags=["crm"], input_modes=["image/png"]) == []
+    assert len(index.search(limit=None)) == len(index) == 4
+
+
+def test_keywords_rank_matching_skills():
+    """Skills matching more keywords, in weightier fields, rank first."""
+    index = SkillIndex(load_cards() + [summary_card()])
+    matches = index.search("company summary")
+    assert [m.skill_id for m in matches] == [
+        "summarize_company",
+        "get_contact_company",  # "company" in its id, name, tags and description
+        "get_company_news",
+    ]
+    assert matches[0].score > matches[1].score > matches[2].score > 0
+    assert matches[0].card["name"] == "Summary Agent"
+
+    (match,) = index.search("history of interactions", tags=["contact"])
+    assert match.skill_id == "get_crm_history"
+    assert index.search("unknown words") == []
+
+
+def test_registry_indexes_cards_and_resolves_card_classes(tmp_path):
+    """Skills are searchable once loaded; the card's agentClass names the agent class."""
+    path = tmp_path / "summary.json"
+    path.write_text(json.dumps(summary_card()))
+    registry = AgentRegistry.from_card_paths(DEFAULT_CARD_PATHS + [str(path)])
+
+    (match,) = registry.find_skills(output_modes=["text/plain"])
+    assert match.skill_id == "summarize_company"
+    assert registry.agents() == []
+
+    assert isinstance(registry.find_agent_for_method("summarize_company"), CRMResearchAgent)
+
+    registry.reload(DEFAULT_CARD_PATHS)
+    assert registry.find_skills(output_modes=["text/plain"]) == []
@@ -7,7 +7,11 @@ timeout handling, and error responses when no agent is found.
 
 from unittest.mock import MagicMock
 import asyncio
+import json
 import pytest
+from agents.bulk import BulkStats
+from agents.retry import RetryPolicy
+from agents.scheduler import TaskScheduler
 from agents.supervisor_agent import SupervisorAgent
 from agent_registry import AgentRegistry
 
@@ -18,6 +22,11 @@ def mock_agent():
 
     class MockAgent:
         async def handle_rpc(self, task):
+            if isinstance(task, list):
+                return [
+                    {"jsonrpc": "2.0", "result": {"mocked": True}, "id": t["id"]}
+                    for t in task
+                ]
             return {
                 "jsonrpc": "2.0",
                 "result": {"mocked": True},
@@ -110,27 +119,257 @@ async def test_parse_query_with_no_task_matches():
 
 
 @pytest.mark.asyncio
-async def test_extract_company_name_single_word():
-    """Extracts single-word company name correctly."""
-    sa = SupervisorAgent(agent_registry=MagicMock())
-    query = "Find recent company news about Tesla"
-    company = sa.extract_company_name(query)
-    assert company == "Tesla"
+async def test_delegate_tasks_sends_one_batch_per_agent():
+    """Tasks for the same agent arrive as one batch; responses keep task order."""
+
+    class RecordingAgent:
+        def __init__(self):
+            self.payloads = []
+
+        async def handle_rpc(self, payload):
+            self.payloads.append(payload)
+            # Reply out of order to exercise matching by id.
+            return [
+                {"jsonrpc": "2.0", "result": {"echo": t["params"]}, "id": t["id"]}
+                for t in reversed(payload)
+            ]
+
+    agent = RecordingAgent()
+    registry = AgentRegistry.from_card_paths([])
+    registry.find_agent_for_method = MagicMock(return_value=agent)
+    sa = SupervisorAgent(agent_registry=registry)
+
+    tasks = [
+        {
+            "jsonrpc": "2.0",
+            "method": "get_crm_history",
+            "params": {"n": i},
+            "id": str(i),
+        }
+        for i in range(3)
+    ]
+    responses = await sa.delegate_tasks(tasks)
+    assert len(agent.payloads) == 1
+    assert isinstance(agent.payloads[0], list)
+    assert [r["id"] for r in responses] == ["0", "1", "2"]
+    assert [r["result"]["echo"]["n"] for r in responses] == [0, 1, 2]
 
 
 @pytest.mark.asyncio
-async def test_extract_company_name_with_and_delimiter():
-    """Stops extraction at 'and' when extracting company name."""
-    sa = SupervisorAgent(agent_registry=MagicMock())
-    query = "Find news about Acme Inc. and CRM history for John Doe"
-    company = sa.extract_company_name(query)
-    assert company == "Acme Inc."
+async def test_handle_query_sheds_load_with_jsonrpc_error(registry_with_mock_agent):
+    """Tasks rejected by a full scheduler queue get a -32003 error response."""
+    scheduler = TaskScheduler(max_concurrency=1, max_queue=0, overflow="shed")
+    sa = SupervisorAgent(agent_registry=registry_with_mock_agent, scheduler=scheduler)
+    responses = await sa.handle_query("company news about Company")
+    assert responses[0]["error"]["code"] == -32003
 
 
 @pytest.mark.asyncio
-async def test_extract_contact_name_single_name():
-    """Extracts contact name correctly."""
-    sa = SupervisorAgent(agent_registry=MagicMock())
-    query = "Get CRM history for John Doe"
-    contact = sa.extract_contact_name(query)
-    assert contact == "John Doe"
+async def test_handle_query_stream_yields_fast_results_first():
+    """Responses are yielded in completion order, before slow tasks finish."""
+
+    class DelayedAgent:
+        def __init__(self, delay):
+            self.delay = delay
+
+        async def handle_rpc(self, task):
+            await asyncio.sleep(self.delay)
+            return {"jsonrpc": "2.0", "result": {"delay": self.delay}, "id": task["id"]}
+
+    agents = {
+        "get_company_news": DelayedAgent(0.3),
+        "get_crm_history": DelayedAgent(0.01),
+    }
+    registry = AgentRegistry.from_card_paths([])
+    registry.find_agent_for_method = MagicMock(side_effect=agents.get)
+    sa = SupervisorAgent(agent_registry=registry)
+
+    query = "company news about Acme Inc and crm history for John Doe"
+    stream = sa.handle_query_stream(query)
+    first = await anext(stream)
+    assert first["result"]["delay"] == 0.01
+    rest = [response async for response in stream]
+    assert [r["result"]["delay"] for r in rest] == [0.3]
+
+
+@pytest.mark.asyncio
+async def test_handle_query_stream_yields_partial_results():
+    """Streaming-capable agents deliver partial responses before the final one."""
+    registry = AgentRegistry.from_card_paths(
+        ["agent_cards/web_research_agent_card.json"]
+    )
+    sa = SupervisorAgent(agent_registry=registry)
+    responses = [r async for r in sa.handle_query_stream("news about Acme Inc")]
+    partials = [r for r in responses if r.get("final") is False]
+    assert len(partials) == 2
+    assert all(len(r["result"]["articles"]) == 1 for r in partials)
+    assert responses[-1]["final"] is True
+    assert len(responses[-1]["result"]["articles"]) == 2
+
+
+@pytest.mark.asyncio
+async def test_delegate_batch_retries_only_failed_tasks():
+    """Retries resend just the batch members that failed with a retryable code."""
+
+    class FlakyAgent:
+        def __init__(self):
+            self.payloads = []
+
+        async def handle_rpc(self, payload):
+            self.payloads.append([t["id"] for t in payload])
+            first_call = len(self.payloads) == 1
+            busy = {"code": -32000, "message": "busy"}
+            return [
+                {"jsonrpc": "2.0", "error": busy, "id": t["id"]}
+                if first_call and t["id"] == "b"
+                else {"jsonrpc": "2.0", "result": {}, "id": t["id"]}
+                for t in payload
+            ]
+
+    agent = FlakyAgent()
+    registry = AgentRegistry.from_card_paths([])
+    registry.find_agent_for_method = MagicMock(return_value=agent)
+    policy = RetryPolicy(max_attempts=2, retry_on=frozenset({-32000}))
+    sa = SupervisorAgent(agent_registry=registry, default_retry_policy=policy)
+
+    tasks = [
+        {"jsonrpc": "2.0", "method": "get_crm_history", "params": {}, "id": task_id}
+        for task_id in ("a", "b")
+    ]
+    responses = await sa.delegate_tasks(tasks)
+    assert agent.payloads == [["a", "b"], ["b"]]
+    assert all("result" in r for r in responses)
+
+
+@pytest.mark.asyncio
+async def test_delegate_batch_rejects_duplicate_ids():
+    """Repeated ids get -32600 instead of a mixed-up reply; notifications still run."""
+    agent = CountingAgent()
+    registry = AgentRegistry.from_card_paths([])
+    sa = SupervisorAgent(agent_registry=registry)
+    tasks = [
+        {"jsonrpc": "2.0", "method": "get_crm_history", "params": {"n": i}, "id": id_}
+        for i, id_ in enumerate(["a", "b", "a", None, None])
+    ]
+
+    responses = await sa.delegate_batch(agent, tasks)
+
+    assert sorted(t["params"]["n"] for t in agent.calls) == [1, 3, 4]
+    assert [responses[i]["result"] for i in (1, 3, 4)] == [{"n": 1}, {"n": 3}, {"n": 4}]
+    for i in (0, 2):
+        assert responses[i]["error"]["code"] == -32600
+        assert responses[i]["id"] == "a"
+
+
+class CountingAgent:
+    """Agent that records every task it receives and echoes its params."""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.calls = []
+
+    async def handle_rpc(self, request):
+        tasks = request if isinstance(request, list) else [request]
+        self.calls.extend(tasks)
+        await asyncio.sleep(self.delay)
+        replies = [
+            {"jsonrpc": "2.0", "result": dict(t["params"]), "id": t["id"]}
+            for t in tasks
+        ]
+        return replies if isinstance(request, list) else replies[0]
+
+
+@pytest.mark.asyncio
+async def test_handle_queries_dedups_across_queries():
+    """Identical tasks across queries run once and every query gets its own ids."""
+    agent = CountingAgent(delay=0.01)
+    registry = AgentRegistry.from_card_paths([])
+    registry.find_agent_for_method = MagicMock(return_value=agent)
+    sa = SupervisorAgent(agent_registry=registry)
+    queries = ["news about Acme Inc", "crm history for John Doe"] * 50
+    stats = BulkStats()
+
+    results = [r async for r in sa.handle_queries(iter(queries), stats=stats)]
+
+    assert [r.index for r in results] == list(range(100))
+    assert [r.query for r in results] == queries
+    assert len(agent.calls) == 2
+    assert stats.queries == 100
+    assert stats.tasks == 100
+    assert stats.dispatched == 2
+    assert stats.deduplicated == 98
+    assert results[2].responses[0]["result"] == {"company_name": "Acme Inc"}
+    ids = {r.responses[0]["id"] for r in results}
+    assert len(ids) == 100
+
+
+@pytest.mark.asyncio
+async def test_handle_queries_bounded_and_unordered():
+    """Completion order yields every query while keeping the window bounded."""
+    agent = CountingAgent()
+    registry = AgentRegistry.from_card_paths([])
+    registry.find_agent_for_method = MagicMock(return_value=agent)
+    sa = SupervisorAgent(agent_registry=registry)
+    consumed = 0
+
+    async def queries():
+        nonlocal consumed
+        for i in range(40):
+            consumed += 1
+            yield f"news about Company {i}"
+
+    seen = []
+    async for result in sa.handle_queries(queries(), ordered=False, max_in_flight=4):
+        assert consumed - len(seen) <= 4
+        seen.append(result.index)
+
+    assert sorted(seen) == list(range(40))
+    assert len(agent.calls) == 40
+
+
+@pytest.mark.asyncio
+async def test_handle_queries_does_not_reuse_errors():
+    """An error response is returned for its query but the task is retried later."""
+    registry = AgentRegistry.from_card_paths([])
+    registry.find_agent_for_method = MagicMock(return_value=None)
+    sa = SupervisorAgent(agent_registry=registry)
+    stats = BulkStats()
+    queries = ["news about Acme"] * 3
+
+    results = [r async for r in sa.handle_queries(queries, max_in_flight=1, stats=stats)]
+
+    assert [r.responses[0]["error"]["code"] for r in results] == [-32601] * 3
+    assert stats.dispatched == 3
+
+
+@pytest.mark.asyncio
+async def test_page_size_limits_paginated_skills():
+    """With page_size set, paginated skills return one page and a cursor to the rest."""
+    registry = AgentRegistry.from_card_paths(
+        [
+            "agent_cards/web_research_agent_card.json",
+            "agent_cards/crm_research_agent_card.json",
+        ]
+    )
+    sa = SupervisorAgent(agent_registry=registry, page_size=1)
+    query = "news about Acme Inc and crm history for John Doe"
+    assert all(task["params"]["limit"] == 1 for task in sa.parse_query(query))
+    responses = await sa.handle_query(query)
+    for response in responses:
+        result = response["result"]
+        assert len(result.get("articles", result.get("interactions"))) == 1
+        assert result["next_cursor"] is not None
+
+
+def test_card_and_skill_limits_scale_with_replicas(tmp_path):
+    """Both the agent's and the skill's maxConcurrency apply per replica."""
+    card = json.loads(open("agent_cards/crm_research_agent_card.json").read())
+    card["replicas"] = 3
+    path = tmp_path / "crm.json"
+    path.write_text(json.dumps(card))
+    sa = SupervisorAgent(agent_registry=AgentRegistry.from_card_paths([str(path)]))
+    task = {"jsonrpc": "2.0", "method": "get_crm_history", "params": {}, "id": "t:0"}
+    assert sa._scheduler_resources([task]) == [
+        (("agent", "CRM Research Agent"), 8 * 3),
+        (("skill", "get_crm_history"), 4 * 3),
+    ]
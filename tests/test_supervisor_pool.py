@@ -0,0 +1,79 @@
+import asyncio
+import os
+import signal
+
+import pytest
+from protocol.cache import MISSING
+from protocol.messages import Task
+from protocol.shared_cache import SharedResultCache, SharedTable
+from supervisor_pool import SupervisorPool
+
+QUERY = "news about Acme Inc and crm history for John Doe"
+
+
+@pytest.mark.asyncio
+async def test_pool_answers_queries_and_merges_metrics():
+    async with SupervisorPool(workers=2) as pool:
+        responses = await pool.handle_query(QUERY)
+        assert [sorted(r["result"]) for r in responses] == [
+            ["articles", "next_cursor"],
+            ["contact", "interactions", "next_cursor"],
+        ]
+
+        queries = [f"crm history for Contact {i}" for i in range(70)]
+        results = [r async for r in pool.handle_queries(queries, max_in_flight=64)]
+        assert [r.index for r in results] == list(range(70))
+        assert results[42].responses[0]["result"]["contact"] == "Contact 42"
+        assert sum(w["requests"] for w in pool.worker_stats()) >= 3
+
+        tracer = await pool.metrics()
+        stages = {h["stage"]: h["count"] for h in tracer.histograms(by=("stage",))}
+        assert stages["query"] == 1  # handle_query, recorded by one worker
+        assert stages["batch_attempt"] >= 2  # at least one per bulk chunk
+
+
+@pytest.mark.asyncio
+async def test_shared_cache_serves_results_fetched_by_another_worker():
+    async with SupervisorPool(workers=2, shared_cache_slots=64) as pool:
+        task = Task("handle_query", {"query": "crm history for Jane Doe"}, None)
+        first, second = pool._workers
+        await first.handle_rpc(task)
+        await second.handle_rpc(task)
+        stats = (await pool.cache_stats())["CRM Research Agent"]
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+
+
+@pytest.mark.asyncio
+async def test_queries_avoid_a_worker_that_died():
+    async with SupervisorPool(workers=2) as pool:
+        dead = pool._workers[0]
+        os.kill(dead.process.pid, signal.SIGKILL)
+        for _ in range(100):
+            if not dead.alive:
+                break
+            await asyncio.sleep(0.02)
+        assert not dead.alive
+        for _ in range(3):
+            assert len(await pool.handle_query(QUERY)) == 2
+        with pytest.raises(ConnectionError):
+            await dead.handle_rpc(Task("rpc.ping", {}, None))
+
+
+def test_shared_table_expiry_collisions_and_oversized_values():
+    table = SharedTable.create(slots=1, slot_size=128)
+    try:
+        cache = SharedResultCache(table, "agent")
+        cache.put("a", {"n": 1}, ttl=60)
+        assert cache.get("a") == {"n": 1}
+        cache.put("b", {"n": 2}, ttl=60)  # one slot: "b" replaces "a"
+        assert cache.get("a") is MISSING
+        assert cache.evictions == 1
+        cache.put("c", "x" * 200, ttl=60)
+        assert cache.oversized == 1
+        assert cache.get("b") == {"n": 2}
+        cache.put("b", {"n": 2}, ttl=-1)
+        assert cache.get("b") is MISSING
+        assert len(cache) == 0
+    finally:
+        table.close()
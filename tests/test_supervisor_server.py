@@ -0,0 +1,261 @@
+import asyncio
+import http.client
+import json
+
+import pytest
+from agent_registry import AgentRegistry
+from agents.scheduler import TaskScheduler
+from agents.supervisor_agent import SupervisorAgent
+from supervisor_server import DEFAULT_CARD_PATHS, SupervisorServer
+
+
+def post(connection, payload, headers=None):
+    """Sends one JSON-RPC POST over an existing stdlib connection."""
+    body = json.dumps(payload)
+    connection.request(
+        "POST", "/", body, {"Content-Type": "application/json", **(headers or {})}
+    )
+    response = connection.getresponse()
+    return response, response.read()
+
+
+@pytest.mark.asyncio
+async def test_single_and_batch_requests_share_a_connection():
+    """Single and batch requests are served over one keep-alive connection."""
+    server = SupervisorServer.from_card_paths(DEFAULT_CARD_PATHS)
+    await server.start(port=0)
+    connection = http.client.HTTPConnection("127.0.0.1", server.port)
+
+    query = {
+        "jsonrpc": "2.0",
+        "method": "handle_query",
+        "params": {"query": "news about Acme Inc and crm history for John Doe"},
+        "id": 1,
+    }
+    response, body = await asyncio.to_thread(post, connection, query)
+    assert response.status == 200
+    result = json.loads(body)
+    assert result["id"] == 1
+    assert len(result["result"]) == 2
+
+    batch = [
+        {
+            "jsonrpc": "2.0",
+            "method": "get_crm_history",
+            "params": {"contact_name": "Jane Smith"},
+            "id": "a",
+        },
+        {"jsonrpc": "2.0", "method": "unknown_method", "params": {}, "id": "b"},
+    ]
+    response, body = await asyncio.to_thread(post, connection, batch)
+    replies = json.loads(body)
+    assert [r["id"] for r in replies] == ["a", "b"]
+    assert "result" in replies[0]
+    assert replies[1]["error"]["code"] == -32601
+
+    connection.close()
+    await server.close()
+
+
+@pytest.mark.asyncio
+async def test_parse_error_and_unknown_path():
+    """Malformed JSON yields -32700, a bad Content-Length 400, other paths 404."""
+    server = SupervisorServer.from_card_paths(DEFAULT_CARD_PATHS)
+    await server.start(port=0)
+
+    def requests():
+        connection = http.client.HTTPConnection("127.0.0.1", server.port)
+        connection.request("POST", "/", "{not json", {"Content-Length": "9"})
+        parse_error = json.loads(connection.getresponse().read())
+        connection.request("GET", "/missing")
+        missing = connection.getresponse()
+        missing.read()
+        connection.close()
+        return parse_error, missing.status
+
+    parse_error, status = await asyncio.to_thread(requests)
+    assert parse_error["error"]["code"] == -32700
+    assert status == 404
+
+    for length in (b"abc", b"-5"):
+        reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+        writer.write(b"POST / HTTP/1.1\r\nContent-Length: " + length + b"\r\n\r\n")
+        assert (await reader.readline()).startswith(b"HTTP/1.1 400")
+        writer.close()
+    await server.close()
+
+
+@pytest.mark.asyncio
+async def test_event_stream_delivers_each_response():
+    """With Accept: text/event-stream, agent responses arrive as separate events."""
+    server = SupervisorServer.from_card_paths(DEFAULT_CARD_PATHS)
+    await server.start(port=0)
+    connection = http.client.HTTPConnection("127.0.0.1", server.port)
+
+    query = {
+        "jsonrpc": "2.0",
+        "method": "handle_query",
+        "params": {"query": "news about Acme Inc and crm history for John Doe"},
+        "id": 1,
+    }
+    headers = {"Accept": "text/event-stream"}
+    response, body = await asyncio.to_thread(post, connection, query, headers)
+    assert response.getheader("Content-Type") == "text/event-stream"
+    events = [
+        json.loads(line[len("data: ") :])
+        for line in body.decode().splitlines()
+        if line.startswith("data: ")
+    ]
+    final = [e for e in events if e.get("final", True)]
+    assert len(final) == 2
+    assert len(events) > len(final)  # news articles were streamed as partials
+
+    connection.close()
+    await server.close()
+
+
+@pytest.mark.asyncio
+async def test_ndjson_stream_delivers_one_response_per_line():
+    """With Accept: application/x-ndjson, batch responses arrive one per line."""
+    server = SupervisorServer.from_card_paths(DEFAULT_CARD_PATHS)
+    await server.start(port=0)
+    connection = http.client.HTTPConnection("127.0.0.1", server.port)
+
+    batch = [
+        {
+            "jsonrpc": "2.0",
+            "method": "get_crm_history",
+            "params": {"contact_name": name},
+            "id": name,
+        }
+        for name in ("Jane Smith", "John Doe")
+    ]
+    headers = {"Accept": "application/x-ndjson"}
+    response, body = await asyncio.to_thread(post, connection, batch, headers)
+    assert response.getheader("Content-Type") == "application/x-ndjson"
+    lines = [json.loads(line) for line in body.splitlines()]
+    assert sorted(r["id"] for r in lines) == ["Jane Smith", "John Doe"]
+    assert all(r["result"]["contact"] == r["id"] for r in lines)
+
+    connection.close()
+    await server.close()
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint_serves_prometheus_text():
+    server = SupervisorServer.from_card_paths(DEFAULT_CARD_PATHS)
+    await server.start(port=0)
+    connection = http.client.HTTPConnection("127.0.0.1", server.port)
+
+    query = {
+        "jsonrpc": "2.0",
+        "method": "handle_query",
+        "params": {"query": "crm history for John Doe"},
+        "id": 1,
+    }
+    await asyncio.to_thread(post, connection, query)
+
+    def get_metrics():
+        connection.request("GET", "/metrics")
+        response = connection.getresponse()
+        return response, response.read().decode()
+
+    response, text = await asyncio.to_thread(get_metrics)
+    assert response.status == 200
+    assert response.getheader("Content-Type").startswith("text/plain")
+    assert "a2a_stage_seconds_count" in text
+
+    connection.close()
+    await server.close()
+
+
+@pytest.mark.asyncio
+async def test_positional_query_params_are_invalid_params():
+    """A handle_query with positional params gets -32602 on both dispatch paths."""
+    server = SupervisorServer.from_card_paths(DEFAULT_CARD_PATHS)
+    request = {"jsonrpc": "2.0", "method": "handle_query", "params": ["news"], "id": 1}
+    response = await server.dispatch(request)
+    assert response["error"]["code"] == -32602
+    streamed = [message async for message in server.dispatch_stream(request)]
+    assert [m["error"]["code"] for m in streamed] == [-32602]
+
+
+@pytest.mark.asyncio
+async def test_positional_skill_params_are_invalid_params():
+    """Skill requests with array params get -32602, alone and inside a batch."""
+    server = SupervisorServer.from_card_paths(DEFAULT_CARD_PATHS)
+    request = {
+        "jsonrpc": "2.0",
+        "method": "get_crm_history",
+        "params": ["Jane Smith"],
+        "id": 1,
+    }
+    assert (await server.dispatch(request))["error"]["code"] == -32602
+    named = {**request, "params": {"contact_name": "Jane Smith"}, "id": 2}
+    replies = await server.dispatch([request, named])
+    assert [r["id"] for r in replies] == [1, 2]
+    assert replies[0]["error"]["code"] == -32602
+    assert "result" in replies[1]
+    streamed = [message async for message in server.dispatch_stream(request)]
+    assert [m["error"]["code"] for m in streamed] == [-32602]
+
+
+@pytest.mark.asyncio
+async def test_single_skill_requests_respect_scheduler_limits():
+    """Skill requests sent one per HTTP request still go through the scheduler."""
+    registry = AgentRegistry.from_card_paths(DEFAULT_CARD_PATHS)
+    supervisor = SupervisorAgent(registry, scheduler=TaskScheduler(max_concurrency=1))
+    server = SupervisorServer(supervisor)
+    agent = registry.find_agent_for_method("get_crm_history")
+    tool_layer, running, peak = agent.tool_layer, [0], [0]
+
+    async def counted(*args, **kwargs):
+        running[0] += 1
+        peak[0] = max(peak[0], running[0])
+        await asyncio.sleep(0.02)
+        try:
+            async for item in tool_layer(*args, **kwargs):
+                yield item
+        finally:
+            running[0] -= 1
+
+    agent.tool_layer = counted
+    requests = [
+        {
+            "jsonrpc": "2.0",
+            "method": "get_crm_history",
+            "params": {"contact_name": f"Contact {i}"},
+            "id": i,
+        }
+        for i in range(3)
+    ]
+    responses = await asyncio.gather(*(server.dispatch(r) for r in requests))
+    assert all("result" in r for r in responses)
+    assert peak[0] == 1
+    streamed = [m async for m in server.dispatch_stream(requests)]
+    assert len(streamed) == 3 and peak[0] == 1
+
+
+@pytest.mark.asyncio
+async def test_notifications_in_a_batch_run_without_replies():
+    """Several notifications for one agent are delivered alongside the requests."""
+    server = SupervisorServer.from_card_paths(DEFAULT_CARD_PATHS)
+    agent = server.supervisor.registry.find_agent_for_method("get_crm_history")
+    tool_layer, executed = agent.tool_layer, []
+
+    def recorded(contact_name, *args, **kwargs):
+        executed.append(contact_name)
+        return tool_layer(contact_name, *args, **kwargs)
+
+    agent.tool_layer = recorded
+    batch = [
+        {"jsonrpc": "2.0", "method": "get_crm_history", "params": {"contact_name": name}}
+        for name in ("Ann Lee", "Bo Chen")
+    ]
+    batch.append({**batch[0], "params": {"contact_name": "Jane Smith"}, "id": 1})
+
+    replies = await server.dispatch(batch)
+
+    assert [r["id"] for r in replies] == [1]
+    assert "result" in replies[0]
+    assert sorted(executed) == ["Ann Lee", "Bo Chen", "Jane Smith"]
@@ -0,0 +1,111 @@
+import asyncio
+import time
+
+import pytest
+from agent_registry import AgentRegistry
+from agents.supervisor_agent import SupervisorAgent
+from agents.task_graph import TaskGraph
+from protocol.messages import Response
+from supervisor_server import DEFAULT_CARD_PATHS
+
+LATENCY = {"lookup": 0.05, "news": 0.05, "history": 0.08}
+
+
+class Backend:
+    """Answers every task after its method's latency and records the calls."""
+
+    def __init__(self, fail=()):
+        self.calls = []
+        self.fail = set(fail)
+
+    async def dispatch(self, tasks):
+        self.calls.append([(task["method"], dict(task["params"])) for task in tasks])
+        return await asyncio.gather(*(self.answer(task) for task in tasks))
+
+    async def answer(self, task):
+        await asyncio.sleep(LATENCY[task["method"]])
+        if task["method"] in self.fail:
+            return Response.failure(task["id"], -32000, "backend down")
+        return Response(task["id"], {"company": "Acme Inc", **task["params"]})
+
+
+def chained_graph():
+    graph = TaskGraph()
+    lookup = graph.add("lookup", {"contact": "Jane"}, requested=False)
+    graph.add("news", {"company": lookup.ref("company")})
+    graph.add("history", {"contact": "Jane"})
+    return graph
+
+
+def test_identical_steps_share_one_node():
+    """Steps with the same method and params are added once, internal or requested."""
+    graph = chained_graph()
+    graph.add("news", {"company": graph.nodes[0].ref("company")})
+    graph.add("lookup", {"contact": "Jane"})
+    assert [node.method for node in graph] == ["lookup", "news", "history"]
+    assert [node.method for node in graph.requested] == ["news", "history", "lookup"]
+    tasks = graph.tasks("t")
+    assert tasks[1]["params"] == {"company": {"$ref": "t:0", "field": "company"}}
+
+
+@pytest.mark.asyncio
+async def test_dependents_start_when_their_inputs_are_ready():
+    """A dependent step runs after its input; independent branches overlap."""
+    backend = Backend()
+    start = time.perf_counter()
+    run = await chained_graph().run(backend.dispatch, "t")
+    elapsed = time.perf_counter() - start
+
+    # lookup → news (0.1 s) overlaps history (0.08 s).
+    assert elapsed < 0.15
+    assert backend.calls[-1] == [("news", {"company": "Acme Inc"})]
+    assert [r["id"] for r in run.responses] == ["t:1", "t:2"]
+    assert [step["skill"] for step in run.critical_path] == ["lookup", "news"]
+    assert run.critical_path[1]["start"] >= run.critical_path[0]["duration"]
+
+
+@pytest.mark.asyncio
+async def test_failed_input_fails_its_dependents_without_sending_them():
+    """A dependent of a failed step answers with an error and is never dispatched."""
+    backend = Backend(fail={"lookup"})
+    run = await chained_graph().run(backend.dispatch, "t")
+    news, history = run.responses
+    assert news["error"]["message"] == "Dependency t:0 failed: backend down"
+    assert "result" in history
+    assert all(method != "news" for call in backend.calls for method, _ in call)
+
+    graph = TaskGraph()
+    lookup = graph.add("lookup", {"contact": "Jane"}, requested=False)
+    graph.add("news", {"company": lookup.ref("missing.field")})
+    (response,) = (await graph.run(Backend().dispatch, "t")).responses
+    assert response["error"]["code"] == -32602
+
+
+@pytest.mark.asyncio
+async def test_roots_with_one_batch_key_are_sent_together():
+    """Steps without inputs that share a batch key go out in one dispatch call."""
+    backend = Backend()
+    graph = TaskGraph()
+    graph.add("history", {"contact": "Jane"})
+    graph.add("history", {"contact": "John"})
+    await graph.run(backend.dispatch, "t", batch_key=lambda task: task["method"])
+    assert len(backend.calls) == 1 and len(backend.calls[0]) == 2
+
+
+@pytest.mark.asyncio
+async def test_supervisor_runs_chained_query():
+    """A chained query looks up the contact's company once and fetches its news."""
+    supervisor = SupervisorAgent(AgentRegistry.from_card_paths(DEFAULT_CARD_PATHS))
+    query = "news about the company of Jane Smith and the employer of Jane Smith"
+    run = await supervisor.handle_query_graph(query)
+    news, company = run.responses
+    assert company["result"] == {"contact": "Jane Smith", "company": "Acme Inc"}
+    assert news["result"]["articles"][0]["title"].startswith("Acme Inc")
+    assert [step["skill"] for step in run.critical_path] == [
+        "get_contact_company",
+        "get_company_news",
+    ]
+
+    streamed = [m async for m in supervisor.handle_query_stream(query)]
+    finals = [m for m in streamed if m.get("final") is not False]
+    assert len(finals) == 2 and all("result" in m for m in finals)
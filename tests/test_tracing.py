@@ -0,0 +1,143 @@
+import asyncio
+import json
+from unittest.mock import MagicMock
+
+import pytest
+
+from agent_registry import AgentRegistry
+from agents.supervisor_agent import SupervisorAgent
+from protocol.tracing import TRACER, Histogram, Tracer, trace_id_of
+
+CARD_PATHS = [
+    "agent_cards/web_research_agent_card.json",
+    "agent_cards/crm_research_agent_card.json",
+]
+
+
+@pytest.fixture
+def tracer():
+    TRACER.reset()
+    enabled = TRACER.enabled
+    TRACER.enabled = True
+    yield TRACER
+    TRACER.enabled = enabled
+    TRACER.reset()
+
+
+def test_histogram_percentiles():
+    histogram = Histogram()
+    for ms in range(1, 101):
+        histogram.observe(ms / 1000)
+    summary = histogram.summary()
+    assert summary["count"] == 100
+    assert summary["mean"] == pytest.approx(0.0505)
+    assert summary["p50"] == pytest.approx(0.050, rel=0.2)
+    assert summary["p99"] == pytest.approx(0.099, rel=0.2)
+    assert Histogram().quantile(0.5) is None
+
+
+def test_histograms_aggregate_by_label():
+    tracer = Tracer()
+    tracer.observe("tool", 0.01, skill="a", agent="A")
+    tracer.observe("tool", 0.03, skill="b", agent="A")
+    tracer.observe("tool", 0.02, skill="a", agent="B")
+
+    by_agent = tracer.histograms(by=("stage", "agent"))
+    assert [(h["agent"], h["count"]) for h in by_agent] == [("A", 2), ("B", 1)]
+    assert len(tracer.histograms()) == 3
+
+
+def test_export_merges_into_another_tracer():
+    """Histograms and counters exported by one process add up in another."""
+    worker = Tracer()
+    worker.observe("tool", 0.01, skill="a", agent="A")
+    worker.count("retries_total", "a", "A", 2)
+    merged = Tracer()
+    merged.observe("tool", 0.03, skill="a", agent="A")
+    merged.merge(json.loads(json.dumps(worker.export())))
+    merged.merge(worker.export())
+
+    [histogram] = merged.histograms()
+    assert histogram["count"] == 3
+    assert histogram["mean"] == pytest.approx(0.05 / 3)
+    assert merged.counters()[0]["value"] == 4
+
+
+def test_prometheus_dump():
+    tracer = Tracer()
+    tracer.observe("attempt", 0.002, skill="get_crm_history", agent='CRM "x"')
+    tracer.count("retries_total", "get_crm_history", "CRM")
+    text = tracer.prometheus()
+
+    assert "# TYPE a2a_stage_seconds histogram" in text
+    assert 'agent="CRM \\"x\\""' in text
+    assert 'le="+Inf"} 1' in text
+    assert 'a2a_retries_total{skill="get_crm_history",agent="CRM"} 1' in text
+
+
+def test_trace_id_of():
+    assert trace_id_of("abc:3") == "abc"
+    assert trace_id_of("plain") == "plain"
+    assert trace_id_of(None) is None
+
+
+@pytest.mark.asyncio
+async def test_query_is_traced_end_to_end(tracer):
+    registry = AgentRegistry.from_card_paths(CARD_PATHS)
+    sa = SupervisorAgent(agent_registry=registry)
+    responses = await sa.handle_query("news about Acme Inc and crm history for Jo Doe")
+
+    trace_id = trace_id_of(responses[0]["id"])
+    assert all(trace_id_of(r["id"]) == trace_id for r in responses)
+    stages = {span["stage"] for span in tracer.trace(trace_id)}
+    assert {"parse_query", "find_agent", "attempt", "handle_rpc", "query"} <= stages
+
+    tools = {
+        (h["skill"], h["agent"]) for h in tracer.histograms() if h["stage"] == "tool"
+    }
+    assert ("get_crm_history", "CRM Research Agent") in tools
+    assert ("get_company_news", "Web Research Agent") in tools
+
+
+@pytest.mark.asyncio
+async def test_unknown_methods_share_one_label(tracer):
+    """Made-up method names must not each create a histogram."""
+    registry = AgentRegistry.from_card_paths(CARD_PATHS)
+    sa = SupervisorAgent(agent_registry=registry)
+    agent = registry.find_agent_for_method("get_crm_history")
+    for i in range(5):
+        task = {"jsonrpc": "2.0", "method": f"made_up_{i}", "params": {}, "id": f"t:{i}"}
+        assert (await sa.delegate_task(task))["error"]["code"] == -32601
+        assert (await agent.handle_rpc(task))["error"]["code"] == -32601
+
+    skills = {(h["stage"], h["skill"]) for h in tracer.histograms()}
+    assert skills == {("find_agent", "unknown"), ("handle_rpc", "unknown")}
+
+
+@pytest.mark.asyncio
+async def test_retries_and_timeouts_are_counted(tracer):
+    class SlowAgent:
+        async def handle_rpc(self, task):
+            await asyncio.sleep(1)
+
+    registry = AgentRegistry.from_card_paths([])
+    registry.find_agent_for_method = MagicMock(return_value=SlowAgent())
+    sa = SupervisorAgent(agent_registry=registry)
+    task = {"jsonrpc": "2.0", "method": "slow", "params": {}, "id": "t:0"}
+
+    response = await sa.delegate_task(task, timeout=0.01)
+
+    assert response["error"]["code"] == -32001
+    counters = {c["name"]: c["value"] for c in tracer.counters()}
+    # Both attempts of the default policy time out.
+    assert counters == {"retries_total": 1, "timeouts_total": 2}
+
+
+@pytest.mark.asyncio
+async def test_disabled_tracer_records_nothing(tracer):
+    tracer.enabled = False
+    registry = AgentRegistry.from_card_paths(CARD_PATHS)
+    sa = SupervisorAgent(agent_registry=registry)
+    await sa.handle_query("crm history for Jo Doe")
+    assert tracer.histograms() == []
+    assert len(tracer.spans) == 0
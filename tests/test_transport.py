@@ -0,0 +1,61 @@
+import json
+
+import pytest
+from agent_registry import AgentRegistry
+from agent_server import AgentServer
+from agents.crm_research_agent.agent import CRMResearchAgent
+from protocol.transport import RemoteAgent
+
+
+def crm_request(contact_name, request_id):
+    return {
+        "jsonrpc": "2.0",
+        "method": "get_crm_history",
+        "params": {"contact_name": contact_name},
+        "id": request_id,
+    }
+
+
+@pytest.mark.asyncio
+async def test_remote_agent_reuses_pooled_connection():
+    """Sequential calls, single and batched, share one keep-alive connection."""
+    server = AgentServer(CRMResearchAgent())
+    await server.start(port=0)
+    remote = RemoteAgent(f"http://127.0.0.1:{server.port}/")
+
+    single = await remote.handle_rpc(crm_request("John Doe", "1"))
+    assert single["id"] == "1"
+    assert "result" in single
+
+    batch = await remote.handle_rpc(
+        [crm_request("Jane Smith", "2"), crm_request("John Doe", "3")]
+    )
+    assert [r["id"] for r in batch] == ["2", "3"]
+    assert remote.transport.connections_opened == 1
+
+    remote.shutdown()
+    await server.close()
+
+
+@pytest.mark.asyncio
+async def test_registry_routes_unix_url_cards_to_remote_agent(tmp_path):
+    """A card with a unix:// URL resolves to a RemoteAgent that reaches the server."""
+    socket_path = str(tmp_path / "crm.sock")
+    server = AgentServer(CRMResearchAgent())
+    await server.start_unix(socket_path)
+
+    with open("agent_cards/crm_research_agent_card.json") as f:
+        card = json.load(f)
+    card["url"] = f"unix://{socket_path}"
+    card_path = tmp_path / "crm_card.json"
+    card_path.write_text(json.dumps(card))
+
+    registry = AgentRegistry.from_card_paths([str(card_path)])
+    agent = registry.find_agent_for_method("get_crm_history")
+    assert isinstance(agent, RemoteAgent)
+    response = await agent.handle_rpc(crm_request("John Doe", "x"))
+    assert response["id"] == "x"
+    assert "result" in response
+
+    agent.shutdown()
+    await server.close()
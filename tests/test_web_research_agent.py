@@ -10,17 +10,56 @@ def test_get_supported_methods():
     assert callable(methods["get_company_news"])
 
 
-def test_get_company_news_valid_input():
+@pytest.mark.asyncio
+async def test_get_company_news_valid_input():
     """Valid input returns expected mock news articles."""
     agent = WebResearchAgent()
     params = {"company_name": "Acme Inc"}
-    result = agent.get_company_news(params)
+    result = await agent.get_company_news(params)
     assert isinstance(result["articles"], list)
     assert all("title" in a and "date" in a for a in result["articles"])
 
 
-def test_get_company_news_missing_param():
+@pytest.mark.asyncio
+async def test_get_company_news_missing_param():
     """Missing company_name param raises ValueError."""
     agent = WebResearchAgent()
     with pytest.raises(ValueError, match="Missing 'company_name' parameter."):
-        agent.get_company_news({})
+        await agent.get_company_news({})
+
+
+@pytest.mark.asyncio
+async def test_streamed_page_ends_with_next_cursor():
+    """A streamed page yields its articles, then a chunk with the next page's cursor."""
+    agent = WebResearchAgent()
+    agent.streaming = True
+    request = {
+        "jsonrpc": "2.0",
+        "method": "get_company_news",
+        "params": {"company_name": "Acme Inc", "limit": 1},
+        "id": "1",
+    }
+    responses = [r async for r in agent.handle_rpc_stream(request)]
+    assert [len(r["result"]["articles"]) for r in responses] == [1, 0, 1]
+    cursor = responses[-1]["result"]["next_cursor"]
+    assert cursor is not None
+
+    params = {"company_name": "Acme Inc", "cursor": cursor}
+    rest = await agent.get_company_news(params)
+    assert rest["next_cursor"] is None
+    assert rest["articles"][0]["title"] != responses[0]["result"]["articles"][0]["title"]
+
+
+@pytest.mark.asyncio
+async def test_streamed_result_has_the_unstreamed_shape():
+    """Merging a stream gives exactly what get_company_news returns."""
+    agent = WebResearchAgent()
+    for limit in (1, None):
+        params = {"company_name": "Acme Inc", "limit": limit}
+        expected = await agent.get_company_news(params)
+        chunks = [c async for c in agent.stream_company_news(params)]
+        assert agent.merge_stream_chunks("get_company_news", chunks) == expected
+    assert agent.merge_stream_chunks("get_company_news", []) == {
+        "articles": [],
+        "next_cursor": None,
+    }